@@ -1 +1,4 @@
+from issue_watcher.cache_backends import CacheBackend, FileCacheBackend, RedisCacheBackend, SharedDirectoryCacheBackend
+from issue_watcher.deferred import DeferredAssertionError, DeferredAssertions
 from issue_watcher.github import AssertGitHubIssue, GitHubIssueState
+from issue_watcher.mapped_cache_backend import MappedFileCacheBackend
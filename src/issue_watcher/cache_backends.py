@@ -0,0 +1,443 @@
+import hashlib
+import os
+import os.path
+import socket
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import IO, Any, DefaultDict, Dict, Iterable, Iterator, List, Mapping, Optional, Set, Tuple, Union
+from urllib.parse import quote, unquote, urlparse
+
+from ujson import dump, dumps, load, loads
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover; not available on Windows
+    fcntl = None  # type: ignore[assignment]
+
+CacheEntry = Tuple[Any, ...]
+"""Cached value followed by a UNIX timestamp of when it was stored."""
+
+
+class CacheBackend(ABC):
+    """Storage for cache entries, grouped into namespaces (one per watched repository)."""
+
+    @abstractmethod
+    def get_many(self, namespace: str, keys: Iterable[str]) -> Dict[str, CacheEntry]:
+        """Returns entries for given keys. Missing keys are left out of the result."""
+
+    @abstractmethod
+    def get_all(self, namespace: str) -> Dict[str, CacheEntry]:
+        """Returns all entries of given namespace."""
+
+    @abstractmethod
+    def set_many(self, namespace: str, entries: Mapping[str, CacheEntry]) -> None:
+        """Stores all given entries, replacing existing entries with the same key."""
+
+    @abstractmethod
+    def delete(self, namespace: str, key: str) -> None:
+        """Removes an entry. Does nothing if the entry does not exist."""
+
+    @abstractmethod
+    def expire(self, namespace: str, older_than: int) -> None:
+        """Removes all entries stored before the ``older_than`` UNIX timestamp."""
+
+    @abstractmethod
+    def namespaces(self) -> List[str]:
+        """Returns all namespaces with stored entries."""
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Removes all entries in all namespaces."""
+
+    def get(self, namespace: str, key: str) -> Optional[CacheEntry]:
+        return self.get_many(namespace, [key]).get(key)
+
+    def set(self, namespace: str, key: str, entry: CacheEntry) -> None:
+        self.set_many(namespace, {key: entry})
+
+    @contextmanager
+    def lock(self, namespace: str, key: str) -> Iterator[None]:  # pylint: disable=unused-argument
+        """Holds a lock for given key, shared by all users of the backend.
+
+        Used to fetch a missing value only once. The default implementation does not lock.
+        """
+        yield
+
+
+def _is_older(entry: Any, older_than: int) -> bool:
+    try:
+        return int(entry[1]) < older_than
+    except (TypeError, ValueError, IndexError):
+        return True
+
+
+@contextmanager
+def _file_lock(path: str, exclusive: bool) -> Iterator[None]:
+    if fcntl is None:
+        yield
+        return
+
+    lock_file: IO[str] = open(path, "a", encoding="utf-8")  # pylint: disable=consider-using-with
+    try:
+        fcntl.flock(lock_file, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        yield
+    finally:
+        lock_file.close()  # also releases the lock
+
+
+@contextmanager
+def _json_file_session(path: str, save: bool) -> Iterator[DefaultDict[str, Any]]:
+    """Loads a JSON object from given file and writes it back if ``save`` is set.
+
+    The file is locked between processes for the duration of the session. Missing or
+    corrupted files are treated as empty.
+    """
+    with _file_lock(f"{path}.lock", exclusive=save):
+        try:
+            with open(path, "r", encoding="utf-8") as json_file:
+                content = load(json_file)
+            if not isinstance(content, dict):
+                raise ValueError("Cache must be a dict.")
+            content = defaultdict(dict, content)
+        except (FileNotFoundError, ValueError):
+            content = defaultdict(dict)
+
+        try:
+            yield content
+        finally:
+            if save:
+                with open(path, "w", encoding="utf-8") as json_file:
+                    dump(content, json_file)
+
+
+class _KeyLockFile:
+    """Locks one byte of a single file per key, between processes and between threads.
+
+    The file is kept open for the life of the process, because closing any descriptor of a
+    file releases all byte range locks the process holds on it. Byte range locks are held by
+    the process, so threads wait for each other separately.
+    """
+
+    _RANGES = 1 << 31
+
+    def __init__(self, path: str):
+        self._path = path
+        self._file: Optional[IO[bytes]] = None
+        self._condition = threading.Condition()
+        self._held: Set[int] = set()
+
+    def offset_of(self, key: str) -> int:
+        return int(hashlib.sha1(key.encode("utf-8")).hexdigest()[:8], 16) % self._RANGES
+
+    @contextmanager
+    def hold(self, key: str) -> Iterator[None]:
+        offset = self.offset_of(key)
+
+        with self._condition:
+            while offset in self._held:
+                self._condition.wait()
+            self._held.add(offset)
+            if self._file is None:
+                os.makedirs(os.path.dirname(self._path) or ".", exist_ok=True)
+                self._file = open(self._path, "ab")  # pylint: disable=consider-using-with
+            lock_file = self._file
+
+        try:
+            if fcntl is not None:
+                fcntl.lockf(lock_file, fcntl.LOCK_EX, 1, offset)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.lockf(lock_file, fcntl.LOCK_UN, 1, offset)
+        finally:
+            with self._condition:
+                self._held.discard(offset)
+                self._condition.notify_all()
+
+
+_KEY_LOCK_FILES: Dict[str, _KeyLockFile] = {}
+_KEY_LOCK_FILES_LOCK = threading.Lock()
+
+
+def _key_lock_file(path: str) -> _KeyLockFile:
+    with _KEY_LOCK_FILES_LOCK:
+        if path not in _KEY_LOCK_FILES:
+            _KEY_LOCK_FILES[path] = _KeyLockFile(path)
+        return _KEY_LOCK_FILES[path]
+
+
+class FileCacheBackend(CacheBackend):
+    """All namespaces stored in a single JSON file."""
+
+    def __init__(self, path: str):
+        self._path = path
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    @contextmanager
+    def _namespace_session(self, namespace: str, save: bool) -> Iterator[Dict[str, CacheEntry]]:
+        with _json_file_session(self._path, save) as cache:
+            yield cache[namespace]
+
+    def get_many(self, namespace: str, keys: Iterable[str]) -> Dict[str, CacheEntry]:
+        with self._namespace_session(namespace, save=False) as entries:
+            return {key: entries[key] for key in keys if key in entries}
+
+    def get_all(self, namespace: str) -> Dict[str, CacheEntry]:
+        with self._namespace_session(namespace, save=False) as entries:
+            return dict(entries)
+
+    def set_many(self, namespace: str, entries: Mapping[str, CacheEntry]) -> None:
+        with self._namespace_session(namespace, save=True) as stored_entries:
+            stored_entries.update(entries)
+
+    def delete(self, namespace: str, key: str) -> None:
+        with self._namespace_session(namespace, save=True) as entries:
+            entries.pop(key, None)
+
+    def expire(self, namespace: str, older_than: int) -> None:
+        with self._namespace_session(namespace, save=True) as entries:
+            for key in [key for key, entry in entries.items() if _is_older(entry, older_than)]:
+                del entries[key]
+
+    def namespaces(self) -> List[str]:
+        with _json_file_session(self._path, save=False) as cache:
+            return [namespace for namespace, entries in cache.items() if entries]
+
+    def clear(self) -> None:
+        with _json_file_session(self._path, save=True) as cache:
+            cache.clear()
+
+    @property
+    def _key_lock_file_name(self) -> str:
+        return f"{self._path}.key-locks"
+
+    @contextmanager
+    def lock(self, namespace: str, key: str) -> Iterator[None]:
+        """Locks a byte of a single lock file, so that no file is left behind per key."""
+        with _key_lock_file(self._key_lock_file_name).hold(f"{namespace}/{key}"):
+            yield
+
+
+class SharedDirectoryCacheBackend(FileCacheBackend):
+    """Each namespace stored in its own JSON file in given directory.
+
+    Meant for a directory shared by many runners (for example a network mount), where
+    a single file would become a point of contention.
+    """
+
+    _SUFFIX = ".json"
+
+    def __init__(self, directory: str):
+        super().__init__(os.path.join(directory, "issue-watcher-cache.json"))
+        self._directory = directory
+
+    @property
+    def _key_lock_file_name(self) -> str:
+        return os.path.join(self._directory, ".key-locks")
+
+    def _namespace_file_name(self, namespace: str) -> str:
+        return os.path.join(self._directory, quote(namespace, safe="") + self._SUFFIX)
+
+    @contextmanager
+    def _namespace_session(self, namespace: str, save: bool) -> Iterator[Dict[str, CacheEntry]]:
+        os.makedirs(self._directory, exist_ok=True)
+        with _json_file_session(self._namespace_file_name(namespace), save) as entries:
+            yield entries
+
+    def namespaces(self) -> List[str]:
+        try:
+            file_names = os.listdir(self._directory)
+        except FileNotFoundError:
+            return []
+
+        return [
+            unquote(file_name[: -len(self._SUFFIX)]) for file_name in file_names if file_name.endswith(self._SUFFIX)
+        ]
+
+    def clear(self) -> None:
+        for namespace in self.namespaces():
+            with self._namespace_session(namespace, save=True) as entries:
+                entries.clear()
+
+
+class RedisError(Exception):
+    """Error reply received from a Redis server."""
+
+
+_RedisReply = Union[None, int, bytes, List[Any]]
+
+
+class _RedisConnection:
+    """Minimal client of the Redis serialization protocol (RESP)."""
+
+    def __init__(self, host: str, port: int, timeout: float):
+        self._socket = socket.create_connection((host, port), timeout=timeout)
+        self._reader = self._socket.makefile("rb")
+
+    def close(self) -> None:
+        self._reader.close()
+        self._socket.close()
+
+    def execute(self, *args: Union[str, bytes, int]) -> _RedisReply:
+        encoded = [arg if isinstance(arg, bytes) else str(arg).encode("utf-8") for arg in args]
+        command = b"".join([b"*%d\r\n" % len(encoded)] + [b"$%d\r\n%s\r\n" % (len(arg), arg) for arg in encoded])
+        self._socket.sendall(command)
+        return self._read_reply()
+
+    def _read_reply(self) -> _RedisReply:
+        line = self._reader.readline()
+        if not line.endswith(b"\r\n"):
+            raise ConnectionError("Connection to Redis closed unexpectedly.")
+
+        kind, payload = line[:1], line[1:-2]
+
+        if kind == b"+":
+            return payload
+        if kind == b"-":
+            raise RedisError(payload.decode("utf-8", "replace"))
+        if kind == b":":
+            return int(payload)
+        if kind == b"$":
+            length = int(payload)
+            if length < 0:
+                return None
+            data = self._reader.read(length + 2)
+            return data[:-2]
+        if kind == b"*":
+            length = int(payload)
+            if length < 0:
+                return None
+            return [self._read_reply() for _ in range(length)]
+
+        raise RedisError(f"Unknown reply type {kind!r}.")
+
+
+class RedisCacheBackend(CacheBackend):
+    """Entries stored in a server speaking the Redis protocol.
+
+    Each namespace is stored as one hash, so bulk lookups are a single ``HMGET`` command.
+
+    :param url: Formatted as ``redis://[:password@]host[:port][/database]``.
+    """
+
+    _KEY_PREFIX = "issue-watcher:"
+    _LOCK_TIMEOUT_IN_MILLISECONDS = 60000
+    _LOCK_POLL_INTERVAL_IN_SECONDS = 0.05
+
+    def __init__(self, url: str, timeout: float = 5.0):
+        parsed_url = urlparse(url)
+        if parsed_url.scheme != "redis":
+            raise ValueError(f"Redis URL must start with 'redis://' but '{url}' given.")
+
+        self._host = parsed_url.hostname or "localhost"
+        self._port = parsed_url.port or 6379
+        self._password = parsed_url.password
+        self._database = int(parsed_url.path.strip("/") or 0)
+        self._timeout = timeout
+        self._connection: Optional[_RedisConnection] = None
+        self._connection_lock = threading.Lock()
+
+    def _execute(self, *args: Union[str, bytes, int]) -> _RedisReply:
+        with self._connection_lock:
+            if self._connection is None:
+                connection = _RedisConnection(self._host, self._port, self._timeout)
+                if self._password:
+                    connection.execute("AUTH", self._password)
+                if self._database:
+                    connection.execute("SELECT", self._database)
+                self._connection = connection
+
+            try:
+                return self._connection.execute(*args)
+            except (OSError, ConnectionError):
+                self._connection.close()
+                self._connection = None
+                raise
+
+    def close(self) -> None:
+        with self._connection_lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    def _key(self, namespace: str) -> str:
+        return self._KEY_PREFIX + namespace
+
+    def get_many(self, namespace: str, keys: Iterable[str]) -> Dict[str, CacheEntry]:
+        keys = list(keys)
+        if not keys:
+            return {}
+
+        values = self._execute("HMGET", self._key(namespace), *keys)
+        assert isinstance(values, list)
+        return {key: tuple(loads(value)) for key, value in zip(keys, values) if value is not None}
+
+    def get_all(self, namespace: str) -> Dict[str, CacheEntry]:
+        fields_and_values = self._execute("HGETALL", self._key(namespace))
+        assert isinstance(fields_and_values, list)
+        return {
+            key.decode("utf-8"): tuple(loads(value))
+            for key, value in zip(fields_and_values[::2], fields_and_values[1::2])
+        }
+
+    def set_many(self, namespace: str, entries: Mapping[str, CacheEntry]) -> None:
+        if not entries:
+            return
+
+        fields_and_values: List[Union[str, bytes, int]] = []
+        for key, entry in entries.items():
+            fields_and_values.extend((key, dumps(list(entry))))
+        self._execute("HSET", self._key(namespace), *fields_and_values)
+
+    def delete(self, namespace: str, key: str) -> None:
+        self._execute("HDEL", self._key(namespace), key)
+
+    def expire(self, namespace: str, older_than: int) -> None:
+        expired = [key for key, entry in self.get_all(namespace).items() if _is_older(entry, older_than)]
+        if expired:
+            self._execute("HDEL", self._key(namespace), *expired)
+
+    def _scan(self) -> Iterator[bytes]:
+        cursor: Union[bytes, int] = 0
+        while True:
+            reply = self._execute("SCAN", cursor, "MATCH", self._KEY_PREFIX + "*")
+            assert isinstance(reply, list)
+            cursor, keys = reply
+            yield from keys
+            if cursor == b"0":
+                break
+
+    def namespaces(self) -> List[str]:
+        lock_prefix = f"{self._KEY_PREFIX}lock:"
+        return [
+            key.decode("utf-8")[len(self._KEY_PREFIX) :]
+            for key in self._scan()
+            if not key.decode("utf-8").startswith(lock_prefix)
+        ]
+
+    def clear(self) -> None:
+        keys = list(self._scan())
+        if keys:
+            self._execute("DEL", *keys)
+
+    @contextmanager
+    def lock(self, namespace: str, key: str) -> Iterator[None]:
+        lock_key = f"{self._KEY_PREFIX}lock:{namespace}/{key}"
+        token = uuid.uuid4().hex
+
+        while self._execute("SET", lock_key, token, "NX", "PX", self._LOCK_TIMEOUT_IN_MILLISECONDS) is None:
+            time.sleep(self._LOCK_POLL_INTERVAL_IN_SECONDS)
+
+        try:
+            yield
+        finally:
+            if self._execute("GET", lock_key) == token.encode("utf-8"):
+                self._execute("DEL", lock_key)
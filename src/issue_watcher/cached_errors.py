@@ -0,0 +1,58 @@
+"""Errors remembered in the cache so that failing requests are not repeated on every run."""
+
+from typing import Optional
+
+from requests import HTTPError
+from ujson import dumps, loads
+
+ERRORS_KIND = "errors"
+RATE_LIMIT_ERRORS_KIND = "rate_limit_errors"
+_MISSING_RESOURCE_STATUS_CODES = (404, 410)
+
+
+class ArgumentDependentError(AssertionError):
+    """Assertion failing because of arguments of the call, such as a version pattern matching no tag.
+
+    Not remembered in the cache, because the same call with other arguments may pass.
+    """
+
+
+def error_kind(error: Exception) -> Optional[str]:
+    """Returns the kind of cache keys to remember given error under, if it is worth remembering.
+
+    Remembered are missing resources (deleted or transferred issues), missing data (for
+    example no tags) and exceeded rate limit, which has a kind of its own so that it can be
+    remembered for a shorter time.
+    """
+    if isinstance(error, ArgumentDependentError):
+        return None
+    if isinstance(error, AssertionError):
+        return ERRORS_KIND
+    response = error.response if isinstance(error, HTTPError) else None
+    if response is None:
+        return None
+    if not int(response.headers.get("X-RateLimit-Remaining", 1)):
+        return RATE_LIMIT_ERRORS_KIND
+    if response.status_code in _MISSING_RESOURCE_STATUS_CODES:
+        return ERRORS_KIND
+    return None
+
+
+def encode_error(error: Exception) -> str:
+    return dumps({"type": type(error).__name__, "message": str(error)})
+
+
+def decode_error(value: str) -> Exception:
+    """Recreates an error stored by :py:func:`encode_error`.
+
+    :raises ValueError: When the value is not an encoded error.
+    """
+    try:
+        error = loads(value)
+        error_type, message = error["type"], str(error["message"])
+    except (KeyError, TypeError) as exc:
+        raise ValueError(f"'{value}' is not an encoded error.") from exc
+
+    if error_type == AssertionError.__name__:
+        return AssertionError(message)
+    return HTTPError(message)
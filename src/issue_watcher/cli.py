@@ -0,0 +1,160 @@
+import argparse
+import logging
+import os
+import sys
+from typing import List, Optional
+
+from issue_watcher import scan, watch
+from issue_watcher.temporary_cache import TemporaryCache
+from issue_watcher.webhook import WebhookServer
+
+_ENV_VAR_WEBHOOK_SECRET = "GITHUB_WEBHOOK_SECRET"
+
+
+def _webhook(args: argparse.Namespace) -> int:
+    server = WebhookServer((args.host, args.port), args.secret)
+    logging.getLogger(__name__).info("Listening for GitHub webhooks on %s:%d", *server.server_address[:2])
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+    return 0
+
+
+def _scan(args: argparse.Namespace) -> int:
+    calls = scan.discover(args.paths, args.processes)
+    results = scan.check(calls, args.threads)
+    report = scan.to_junit(results) if args.format == "junit" else scan.to_json(results)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output_file:
+            output_file.write(report)
+    else:
+        sys.stdout.write(report + "\n")
+
+    return int(any(result.outcome != "passed" for result in results))
+
+
+def _cache_export(args: argparse.Namespace) -> int:
+    count = TemporaryCache.export_snapshot(args.path, compress=args.compress)
+    logging.getLogger(__name__).info("Exported %d cache entries into '%s'", count, args.path)
+    return 0
+
+
+def _cache_import(args: argparse.Namespace) -> int:
+    for path in args.paths:
+        count = TemporaryCache.import_snapshot(path)
+        logging.getLogger(__name__).info("Imported %d newer cache entries from '%s'", count, path)
+    return 0
+
+
+def _watch(args: argparse.Namespace) -> int:
+    items = watch.load_watchlist(args.watchlist, args.interval)
+    notifiers = [watch.print_transition] + ([watch.post_transition(args.webhook_url)] if args.webhook_url else [])
+
+    def _notify(transition: watch.Transition) -> None:
+        for notifier in notifiers:
+            notifier(transition)
+
+    watcher = watch.Watcher(items, _notify, args.workers, args.rate)
+    logging.getLogger(__name__).info("Watching %d assertions", len(items))
+
+    try:
+        watcher.run()
+    except KeyboardInterrupt:
+        watcher.stop()
+
+    return 0
+
+
+def _parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="issue-watcher", description="Tools around the issue_watcher cache.")
+    subparsers = parser.add_subparsers(dest="command")
+    subparsers.required = True
+
+    webhook = subparsers.add_parser(
+        "webhook",
+        help="Receive GitHub webhooks and keep the cache up to date.",
+        description="Receives 'issues', 'create', 'delete' and 'release' webhooks and updates the cache right away.",
+    )
+    webhook.add_argument("--host", default="127.0.0.1", help="Address to listen on. Default: %(default)s")
+    webhook.add_argument("--port", type=int, default=8000, help="Port to listen on. Default: %(default)s")
+    webhook.add_argument(
+        "--secret",
+        default=os.environ.get(_ENV_VAR_WEBHOOK_SECRET, ""),
+        help=f"Secret configured for the webhook. Defaults to the '{_ENV_VAR_WEBHOOK_SECRET}' environment variable.",
+    )
+    webhook.set_defaults(func=_webhook)
+
+    scan_parser = subparsers.add_parser(
+        "scan",
+        help="Find and check assertions in source code without running tests.",
+        description="Finds 'AssertGitHubIssue(...).is_open/is_closed/current_release/fixed_in' calls with literal "
+        "arguments, checks each unique call once and reports the results. Exits with 1 if any check fails.",
+    )
+    scan_parser.add_argument("paths", nargs="+", help="Python files or directories to search recursively.")
+    scan_parser.add_argument("--format", choices=["json", "junit"], default="json", help="Default: %(default)s")
+    scan_parser.add_argument("--output", help="Write the report into a file instead of the standard output.")
+    scan_parser.add_argument("--processes", type=int, help="Processes parsing files. Default: number of CPUs")
+    scan_parser.add_argument(
+        "--threads", type=int, default=16, help="Concurrent requests to GitHub. Default: %(default)s"
+    )
+    scan_parser.set_defaults(func=_scan)
+
+    watch_parser = subparsers.add_parser(
+        "watch",
+        help="Check watched issues and releases continuously and report changes.",
+        description="Checks assertions from a watchlist repeatedly and prints every change of their outcome as a "
+        "JSON line, for example when a watched issue is closed or a fixed version is released.",
+    )
+    watch_parser.add_argument("watchlist", help="JSON file with the watched assertions.")
+    watch_parser.add_argument(
+        "--interval",
+        type=float,
+        default=3600,
+        help="Default seconds between checks of an assertion. Default: %(default)s",
+    )
+    watch_parser.add_argument("--workers", type=int, default=16, help="Concurrent checks. Default: %(default)s")
+    watch_parser.add_argument("--rate", type=float, default=5, help="Checks started per second. Default: %(default)s")
+    watch_parser.add_argument("--webhook-url", help="Also send each change as JSON in a POST request to this URL.")
+    watch_parser.set_defaults(func=_watch)
+
+    cache = subparsers.add_parser("cache", help="Export and import cache snapshots.")
+    cache_subparsers = cache.add_subparsers(dest="cache_command")
+    cache_subparsers.required = True
+
+    cache_export = cache_subparsers.add_parser(
+        "export",
+        help="Write all cached entries into a snapshot file.",
+        description="Writes all cached entries into a snapshot file, for example to be saved as a CI artifact.",
+    )
+    cache_export.add_argument("path", help="Snapshot file. Compressed when it ends with '.gz'.")
+    cache_export.add_argument(
+        "--compress", action="store_true", default=None, help="Compress the snapshot regardless of the file name."
+    )
+    cache_export.set_defaults(func=_cache_export)
+
+    cache_import = cache_subparsers.add_parser(
+        "import",
+        help="Merge snapshot files into the cache.",
+        description="Merges snapshot files into the cache. Only entries newer than the cached ones are imported.",
+    )
+    cache_import.add_argument("paths", nargs="+", help="Snapshot files.")
+    cache_import.set_defaults(func=_cache_import)
+
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    args = _parser().parse_args(argv)
+
+    try:
+        return int(args.func(args))
+    except (ValueError, OSError) as exc:
+        logging.getLogger(__name__).error(str(exc))
+        return 2
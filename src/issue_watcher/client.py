@@ -0,0 +1,103 @@
+from datetime import timedelta
+from time import time
+from typing import Any, Dict, Optional, Tuple
+
+import requests
+from requests import HTTPError, Response
+
+from issue_watcher.repository_state import RepositoryState
+from issue_watcher.single_flight import SingleFlight
+
+
+class GitHubClient:  # pylint: disable=too-few-public-methods
+    """Sends requests to GitHub on behalf of a watched repository.
+
+    Spreads requests over the configured credentials, shares responses between concurrent
+    requests for the same URL and turns failed responses into :py:class:`requests.HTTPError`.
+    """
+
+    _URL_API: str = "https://api.github.com"
+    _URL_WEB: str = "https://github.com"
+    _REQUESTS_IN_FLIGHT: SingleFlight[Response] = SingleFlight()
+
+    def __init__(self, repository_id: str, state: RepositoryState):
+        """Constructor.
+
+        :param repository_id: GitHub repository ID formatted as "owner/repository name".
+        :param state: Configuration of the repository.
+        """
+        self._repository_id = repository_id
+        self._rate_limit_exceeded_extra_msg = state.rate_limit_exceeded_extra_msg
+        self._credentials = state.credentials
+        self._auth = state.auth
+        self._http2_transport = state.http2_transport
+        self._latency = state.latency
+
+    def _handle_rate_limit_error(self, response: Response) -> None:
+        headers = response.headers
+        if not int(headers.get("X-RateLimit-Remaining", 1)):
+            message = response.json()["message"]
+            limit = headers.get("X-RateLimit-Limit")
+            now = int(time())
+            reset_delay = timedelta(seconds=int(headers.get("X-RateLimit-Reset", now)) - now)
+
+            raise HTTPError(
+                f"{message} Current quota: {limit}. Limit will reset in {reset_delay}."
+                f"{self._rate_limit_exceeded_extra_msg}",
+                response=response,
+            )
+
+    def _handle_connection_error(self, response: Response, allowed_status_codes: Tuple[int, ...] = (200,)) -> None:
+        self._handle_rate_limit_error(response)
+
+        if response.status_code not in allowed_status_codes:
+            raise HTTPError(
+                f"Request to GitHub Failed.\n{response.status_code} {response.reason}\n"
+                f"HEADERS:\n{response.headers}\nCONTENT:\n{response.content!r}",
+                response=response,
+            )
+
+    def _get(
+        self,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        allowed_status_codes: Tuple[int, ...] = (200,),
+        stream: bool = False,
+    ) -> Response:
+        """Sends a GET request, sharing the response with concurrent requests for the same URL.
+
+        :param stream: Do not read the body right away. Streamed responses are not shared, the
+            body can be read only once.
+        """
+        response = self._send(url, headers, stream)
+
+        if self._credentials is not None:
+            # another credential from the pool may still have requests left
+            for _ in range(len(self._credentials) - 1):
+                if int(response.headers.get("X-RateLimit-Remaining", 1)) or not self._credentials.has_available():
+                    break
+                response.close()
+                response = self._send(url, headers, stream)
+
+        self._handle_connection_error(response, allowed_status_codes)
+        return response
+
+    def _send(self, url: str, headers: Optional[Dict[str, str]], stream: bool = False) -> Response:
+        extra_kwargs: Dict[str, Any] = {"headers": headers} if headers else {}
+        if stream:
+            extra_kwargs["stream"] = True
+
+        def _request(timeout: float) -> Response:
+            # the credential is picked by the caller actually sending the request, so that
+            # concurrent callers coalesce regardless of which credential they would have used
+            auth = self._credentials.acquire() if self._credentials else self._auth
+            response = (self._http2_transport or requests).get(url, auth=auth, timeout=timeout, **extra_kwargs)
+            if self._credentials and auth:
+                self._credentials.update(auth, response.headers)
+            return response
+
+        if stream:
+            return self._latency.call(_request)
+        return self._REQUESTS_IN_FLIGHT.do(
+            (url, tuple(sorted((headers or {}).items()))), lambda: self._latency.call(_request)
+        )
@@ -0,0 +1,128 @@
+import itertools
+import threading
+import time
+from typing import Dict, List, Mapping, NamedTuple, Optional, Tuple
+
+Credential = Tuple[str, str]
+
+
+class _Budget(NamedTuple):
+    remaining: float
+    reset_at: float
+    last_used: int
+
+
+class CredentialPool:
+    """Spreads requests over several GitHub credentials to multiply the API rate limit.
+
+    Each request is sent with the credential with the most remaining requests, as reported
+    by the ``X-RateLimit-*`` headers of its previous response. Credentials not used yet are
+    preferred and ties are broken by using the least recently used credential first.
+    Exhausted credentials are parked until their rate limit resets.
+    """
+
+    def __init__(self, credentials: List[Credential]):
+        """Constructor.
+
+        :param credentials: User names with their personal access tokens.
+        :raises ValueError: When no credentials are given.
+        """
+        if not credentials:
+            raise ValueError("At least one credential is required.")
+
+        self._lock = threading.Lock()
+        self._uses = itertools.count(1)
+        self._budgets: Dict[Credential, _Budget] = {
+            credential: _Budget(float("inf"), 0.0, 0) for credential in dict.fromkeys(credentials)
+        }
+
+    @classmethod
+    def from_file(cls, path: str) -> "CredentialPool":
+        """Reads credentials from a file with one ``user name:token`` pair per line.
+
+        Empty lines and lines starting with ``#`` are ignored.
+
+        :raises ValueError: When a line is not a ``user name:token`` pair or there are no credentials.
+        """
+        credentials: List[Credential] = []
+
+        with open(path, "r", encoding="utf-8") as credentials_file:
+            for line_number, line in enumerate(credentials_file, start=1):
+                line = line.strip()
+                if not line or line.startswith("#"):
+                    continue
+                user_name, _, token = line.partition(":")
+                if not user_name or not token:
+                    raise ValueError(f"Line {line_number} of '{path}' is not formatted as 'user name:token'.")
+                credentials.append((user_name, token))
+
+        return cls(credentials)
+
+    def __len__(self) -> int:
+        return len(self._budgets)
+
+    def acquire(self) -> Credential:
+        """Returns the credential with the most remaining requests.
+
+        When all credentials are exhausted, the one resetting first is returned.
+        """
+        now = time.time()
+
+        with self._lock:
+            available = [
+                credential
+                for credential, budget in self._budgets.items()
+                if budget.remaining > 0 or budget.reset_at <= now
+            ]
+
+            if not available:
+                credential = min(self._budgets, key=lambda item: self._budgets[item].reset_at)
+            else:
+                credential = max(
+                    available,
+                    key=lambda item: (
+                        self._budgets[item].remaining if self._budgets[item].reset_at > now else float("inf"),
+                        -self._budgets[item].last_used,
+                    ),
+                )
+
+            self._budgets[credential] = self._budgets[credential]._replace(last_used=next(self._uses))
+            return credential
+
+    def has_available(self) -> bool:
+        """Tells if any credential has not been exhausted."""
+        now = time.time()
+        with self._lock:
+            return any(budget.remaining > 0 or budget.reset_at <= now for budget in self._budgets.values())
+
+    def update(self, credential: Credential, headers: Mapping[str, str]) -> None:
+        """Records the remaining requests of a credential from rate limit headers of a response."""
+        try:
+            remaining = int(headers["X-RateLimit-Remaining"])
+            reset_at = float(headers["X-RateLimit-Reset"])
+        except (KeyError, TypeError, ValueError):
+            return
+
+        with self._lock:
+            if credential in self._budgets:
+                self._budgets[credential] = self._budgets[credential]._replace(remaining=remaining, reset_at=reset_at)
+
+
+_SHARED_POOLS: Dict[str, CredentialPool] = {}
+_SHARED_POOLS_LOCK = threading.Lock()
+
+
+def shared_credential_pool(path: str) -> Optional[CredentialPool]:
+    """Returns credentials from given file, shared within the process to track their rate limits together.
+
+    :param path: Credentials file as read by :py:meth:`CredentialPool.from_file`. No pool is
+        returned when empty.
+    :raises ValueError: When the file is not properly formatted.
+    """
+    if not path:
+        return None
+
+    with _SHARED_POOLS_LOCK:
+        if path not in _SHARED_POOLS:
+            _SHARED_POOLS[path] = CredentialPool.from_file(path)
+        return _SHARED_POOLS[path]
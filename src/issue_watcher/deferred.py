@@ -0,0 +1,108 @@
+import os
+import threading
+import traceback
+from typing import Any, Dict, List, Optional, Tuple
+
+from issue_watcher import scan
+from issue_watcher.github import AssertGitHubIssue, DeferredRecorder
+from issue_watcher.scan import ScanResult, WatcherCall
+
+_ENV_VAR_PYTEST_TEST = "PYTEST_CURRENT_TEST"
+
+
+def _origin() -> str:
+    """Returns ID of the running pytest test or the location of the first caller outside of this package."""
+    current_test = os.environ.get(_ENV_VAR_PYTEST_TEST)
+    if current_test:
+        return current_test.rsplit(" (", 1)[0]
+
+    package_directory = os.path.dirname(__file__)
+    for frame in reversed(traceback.extract_stack()):
+        if not frame.filename.startswith(package_directory):
+            return f"{frame.filename}:{frame.lineno}"
+    return "unknown"
+
+
+def describe_failure(result: ScanResult) -> str:
+    """Formats a failed assertion with all tests or places that called it."""
+    return "\n".join([f"{result.call}: {result.message}"] + [f"    called by {origin}" for origin in result.locations])
+
+
+class DeferredAssertionError(AssertionError):
+    """Some of the deferred assertions failed."""
+
+    def __init__(self, failures: List[ScanResult]):
+        self.failures = failures
+        super().__init__(
+            f"{len(failures)} deferred issue-watcher assertion(s) failed:\n"
+            + "\n".join(describe_failure(failure) for failure in failures)
+        )
+
+
+class DeferredAssertions:
+    """Collects assertions instead of checking them right away and checks all of them at once later.
+
+    While started, ``is_open``, ``is_closed``, ``current_release`` and ``fixed_in`` of all
+    :py:class:`~issue_watcher.AssertGitHubIssue` instances only register the assertion and
+    return immediately. Each unique assertion is then checked once, concurrently, by
+    :py:meth:`resolve` or :py:meth:`verify`.
+
+    Example::
+
+        with DeferredAssertions() as deferred:
+            AssertGitHubIssue("pyupio/safety").is_open(119)
+        deferred.verify()
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: Dict[WatcherCall, List[str]] = {}
+        self._previous: Optional[DeferredRecorder] = None
+
+    def start(self) -> None:
+        self._previous = AssertGitHubIssue.defer_to(self.record)
+
+    def stop(self) -> None:
+        previous = AssertGitHubIssue.defer_to(self._previous)
+        if previous != self.record:  # pylint: disable=comparison-with-callable; stopped already
+            AssertGitHubIssue.defer_to(previous)
+
+    def __enter__(self) -> "DeferredAssertions":
+        self.start()
+        return self
+
+    def __exit__(self, *_: Any) -> None:
+        self.stop()
+
+    def record(self, repository_id: str, method: str, args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> None:
+        """Registers an assertion, attributed to the running test or the calling code."""
+        call = WatcherCall(repository_id, method, args, tuple(sorted(kwargs.items())))
+        origin = _origin()
+
+        with self._lock:
+            origins = self._calls.setdefault(call, [])
+            if origin not in origins:
+                origins.append(origin)
+
+    def resolve(self, workers: int = 16) -> List[ScanResult]:
+        """Stops collecting and checks all registered assertions concurrently.
+
+        :param workers: Number of threads sending requests to GitHub.
+        :return: Outcome of each unique assertion, with tests or places that called it as locations.
+        """
+        self.stop()
+
+        with self._lock:
+            calls, self._calls = self._calls, {}
+
+        return scan.check(calls, workers)
+
+    def verify(self, workers: int = 16) -> None:
+        """Same as :py:meth:`resolve` but raises one error for all failures.
+
+        :param workers: Number of threads sending requests to GitHub.
+        :raises DeferredAssertionError: When any of the assertions failed or could not be checked.
+        """
+        failures = [result for result in self.resolve(workers) if result.outcome != "passed"]
+        if failures:
+            raise DeferredAssertionError(failures)
@@ -0,0 +1,56 @@
+"""Configuration read from environment variables, warning about improper values."""
+
+import math
+import os
+import warnings
+from typing import Optional
+
+_TRUTHY_VALUES = {"1", "true", "yes"}
+
+
+def flag_from_environment(env_var: str) -> bool:
+    """Tells if given environment variable is set to ``1``, ``true`` or ``yes``."""
+    return os.environ.get(env_var, "").lower() in _TRUTHY_VALUES
+
+
+def expiry_from_environment(env_var: str, default: int) -> int:
+    """Returns a number of seconds from given environment variable, or ``default`` when not set or invalid."""
+    try:
+        expire_in_seconds = int(os.environ.get(env_var, default))
+        if expire_in_seconds < 0:
+            raise ValueError("Cache invalidation must be 0 or positive integer.")
+        return expire_in_seconds
+    except ValueError:
+        value = os.environ[env_var]
+        warnings.warn(
+            "issue_watcher seems to be improperly configured. Expected "
+            f"'{env_var}' environment variable to be 0 or "
+            f"positive integer. However, value of '{value}' was used "
+            f"instead and will be ignored. Using default value of "
+            f"'{default}'.",
+            RuntimeWarning,
+        )
+        return default
+
+
+def float_from_environment(env_var: str, maximum: Optional[float] = None) -> float:
+    """Returns a non-negative number from given environment variable, or ``0`` when not set or invalid.
+
+    :param env_var: Name of the environment variable.
+    :param maximum: Exclusive upper bound of valid values.
+    """
+    try:
+        value = float(os.environ.get(env_var, 0))
+        if value < 0 or (maximum is not None and value >= maximum) or math.isnan(value):
+            raise ValueError()
+        return value
+    except ValueError:
+        allowed_range = f"between 0 and {maximum} (exclusive)" if maximum is not None else "0 or positive number"
+        warnings.warn(
+            "issue_watcher seems to be improperly configured. Expected "
+            f"'{env_var}' environment variable to be {allowed_range}. "
+            f"However, value of '{os.environ[env_var]}' was used instead and "
+            "will be ignored. Using default value of '0'.",
+            RuntimeWarning,
+        )
+        return 0.0
@@ -0,0 +1,62 @@
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional
+
+_TAG_KEYS = ("release_count", "latest_version")
+
+
+class EventsDigest(NamedTuple):
+    """Cache keys touched by new events of a repository."""
+
+    touched_keys: Dict[str, float]
+    """UNIX timestamps of the latest event touching each cache key."""
+    newest_event_id: Optional[str]
+    has_gap: bool
+    """Not all events since the last seen event were listed, so some changes may be missing."""
+
+
+def _created_at(event: Dict[str, Any]) -> float:
+    try:
+        return datetime.strptime(event["created_at"], "%Y-%m-%dT%H:%M:%SZ").replace(tzinfo=timezone.utc).timestamp()
+    except (KeyError, TypeError, ValueError):
+        # unknown time of change, assume it just happened
+        return datetime.now(timezone.utc).timestamp()
+
+
+def _touched_keys(event: Dict[str, Any]) -> List[str]:
+    payload = event.get("payload") or {}
+    event_type = event.get("type")
+
+    if event_type == "IssuesEvent" and "issue" in payload:
+        return [f"issues/{payload['issue']['number']}"]
+    if event_type in {"CreateEvent", "DeleteEvent"} and payload.get("ref_type") == "tag":
+        return list(_TAG_KEYS)
+    if event_type == "ReleaseEvent":
+        return list(_TAG_KEYS)
+    return []
+
+
+def digest_events(events: Iterable[Dict[str, Any]], last_seen_event_id: Optional[str]) -> EventsDigest:
+    """Finds cache keys touched by events newer than the last seen event.
+
+    :param events: Events of a repository, newest first, as listed by
+        https://docs.github.com/en/rest/activity/events#list-repository-events
+    :param last_seen_event_id: ID of the newest event seen by the previous poll. All listed
+        events are considered new if not given.
+    """
+    touched_keys: Dict[str, float] = {}
+    newest_event_id: Optional[str] = None
+    reached_last_seen_event = last_seen_event_id is None
+
+    for event in events:
+        event_id = str(event.get("id"))
+        if newest_event_id is None:
+            newest_event_id = event_id
+        if event_id == last_seen_event_id:
+            reached_last_seen_event = True
+            break
+
+        created_at = _created_at(event)
+        for key in _touched_keys(event):
+            touched_keys[key] = max(touched_keys.get(key, created_at), created_at)
+
+    return EventsDigest(touched_keys, newest_event_id or last_seen_event_id, not reached_last_seen_event)
@@ -1,17 +1,33 @@
-import os
-import re
 import warnings
-from datetime import timedelta
+from contextlib import suppress
+from datetime import datetime, timezone
 from enum import Enum
-from time import time
-from typing import Any, Dict, List, Optional, Pattern, Tuple
-
-import requests
-from packaging.version import InvalidVersion, Version
-from requests import HTTPError, Response
-
-from issue_watcher.constants import DEFAULT_REQUESTS_TIMEOUT_SEC
-from issue_watcher.temporary_cache import TemporaryCache
+from time import monotonic, time
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, TypeVar
+from urllib.parse import urlencode
+
+from packaging.version import Version
+from requests import HTTPError, RequestException, Timeout
+from ujson import dumps, loads
+
+from issue_watcher.cache_backends import CacheBackend
+from issue_watcher.cached_errors import (
+    ERRORS_KIND,
+    RATE_LIMIT_ERRORS_KIND,
+    ArgumentDependentError,
+    decode_error,
+    encode_error,
+    error_kind,
+)
+from issue_watcher.client import GitHubClient
+from issue_watcher.events import digest_events
+from issue_watcher.refs import iter_advertised_tags, iter_refs
+from issue_watcher.repository_state import shared_repository_state
+from issue_watcher.single_flight import SingleFlight
+from issue_watcher.versions import ordered_version_numbers
+
+_T = TypeVar("_T")
+DeferredRecorder = Callable[[str, str, Tuple[Any, ...], Dict[str, Any]], None]
 
 
 class GitHubIssueState(Enum):
@@ -19,72 +35,306 @@ class GitHubIssueState(Enum):
     CLOSED = "closed"
 
 
-class AssertGitHubIssue:
-    _URL_API: str = "https://api.github.com"
-    _URL_WEB: str = "https://github.com"
-    _ENV_VAR_USERNAME = "GITHUB_USER_NAME"
-    _ENV_VAR_TOKEN = "GITHUB_PERSONAL_ACCESS_TOKEN"
+class AssertGitHubIssue(GitHubClient):  # pylint: disable=too-many-instance-attributes
     _NO_VERSION_AVAILABLE = ""
-
-    def __init__(self, repository_id: str):
+    _BULK_REFRESH_MIN_ISSUES = 2
+    _BULK_REFRESH_MAX_PAGES = 10
+    _EVENTS_KEY = "events"
+    _DEFAULT_EVENTS_POLL_INTERVAL = 60
+    _STREAM_CHUNK_SIZE = 64 * 1024
+    _REFS_IN_FLIGHT: SingleFlight[List[str]] = SingleFlight()
+    _DEFERRED: Optional[DeferredRecorder] = None
+
+    def __init__(
+        self, repository_id: str, cache_backend: Optional[CacheBackend] = None, max_age: Optional[float] = None
+    ):
         """Constructor.
 
         :param repository_id: GitHub repository ID formatted as "owner/repository name".
-        :raises ValueError: When the repository ID is not two slash separated strings.
+        :param cache_backend: Storage for cached responses. Configured from environment
+            variables when not given.
+        :param max_age: Number of seconds after which cached values are fetched again, even
+            when the cache invalidation configured for the repository is longer.
+        :raises ValueError: When the repository ID is not two slash separated strings or
+            the credentials file is not properly formatted.
         """
-        self._rate_limit_exceeded_extra_msg: str = ""
-        self._auth: Optional[Tuple[str, str]] = (
-            os.environ.get(self._ENV_VAR_USERNAME, ""),
-            os.environ.get(self._ENV_VAR_TOKEN, ""),
-        )
-        if not all(self._auth):
-            if any(self._auth):
-                warnings.warn(
-                    "issue_watcher seems to be improperly configured. Expected both "
-                    f"'{self._ENV_VAR_USERNAME}' and '{self._ENV_VAR_TOKEN}' environment "
-                    "variable to be set or both unset. However, only one is set, GitHub "
-                    "authentication remains disabled and API rate limiting will be "
-                    "limited.",
-                    RuntimeWarning,
-                )
-            self._auth = None
-            self._rate_limit_exceeded_extra_msg = (
-                f"Consider setting '{self._ENV_VAR_USERNAME}' and "
-                f"'{self._ENV_VAR_TOKEN}' environment variables to turn on GitHub "
-                f"authentication and raise the API rate limit. "
-                f"See https://github.com/radeklat/issue-watcher#environment-variables"
-            )
-
-        self._repository_id = repository_id
         if len(repository_id.split("/")) != 2:
             raise ValueError(
                 f"repository_id must be two slash separated strings "
                 f"('owner/repository name') but '{repository_id}' given."
             )
 
-        self._cache = TemporaryCache(self._repository_id)
+        state = shared_repository_state(repository_id, cache_backend)
+        super().__init__(repository_id, state)
+        self._cache = state.cache
+        self._invalidate_by_events = state.invalidate_by_events
+        self._tags_from_git = state.tags_from_git
+        self._max_age = max_age
 
-    def _handle_rate_limit_error(self, response: Response) -> None:
-        headers = response.headers
-        if not int(headers.get("X-RateLimit-Remaining", 1)):
-            message = response.json()["message"]
-            limit = headers.get("X-RateLimit-Limit")
-            now = int(time())
-            reset_delay = timedelta(seconds=int(headers.get("X-RateLimit-Reset", now)) - now)
+    def poll_events(self) -> None:
+        """Invalidates cached values changed according to the events feed of the repository.
 
-            raise HTTPError(
-                f"{message} Current quota: {limit}. Limit will reset in {reset_delay}."
-                f"{self._rate_limit_exceeded_extra_msg}"
-            )
+        Uses a conditional request, which does not count against the API rate limit when there
+        are no new events. The feed is polled at most once per poll interval requested by GitHub
+        (a minute by default). All cached values of the repository are invalidated when some
+        events since the last poll might have been missed.
 
-    def _handle_connection_error(self, response: Response) -> None:
-        self._handle_rate_limit_error(response)
+        :raises requests.HTTPError: When response status code from GitHub is not 200 or 304.
+        """
+        if not self._cache.enabled:
+            return
+
+        now = int(time())
+        state = self._cache.peek(self._EVENTS_KEY)
+        etag, last_event_id, poll_interval = None, None, self._DEFAULT_EVENTS_POLL_INTERVAL
+
+        if state is not None:
+            value, polled_at = state
+            try:
+                stored_state = loads(value)
+                etag, last_event_id = stored_state["etag"], stored_state["last_event_id"]
+                poll_interval = int(stored_state["poll_interval"])
+            except (TypeError, ValueError, KeyError):
+                pass
+            else:
+                if polled_at > now - poll_interval:
+                    return
+
+        # Response documented at https://docs.github.com/en/rest/activity/events#list-repository-events
+        response = self._get(
+            f"{self._URL_API}/repos/{self._repository_id}/events?per_page=100",
+            headers={"If-None-Match": etag} if etag else None,
+            allowed_status_codes=(200, 304),
+        )
+        poll_interval = int(response.headers.get("X-Poll-Interval", poll_interval))
+
+        if response.status_code == 200:
+            digest = digest_events(response.json(), last_event_id)
+            if digest.has_gap and last_event_id is not None:
+                self._cache.invalidate()
+            else:
+                for key, (_, stored_at) in self._cache.peek_many(digest.touched_keys).items():
+                    if stored_at <= digest.touched_keys[key]:
+                        del self._cache[key]
+            etag, last_event_id = response.headers.get("ETag"), digest.newest_event_id
+
+        self._cache[self._EVENTS_KEY] = dumps(
+            {"etag": etag, "last_event_id": last_event_id, "poll_interval": poll_interval}
+        )
 
-        if response.status_code != 200:
-            raise HTTPError(
-                f"Request to GitHub Failed.\n{response.status_code} {response.reason}\n"
-                f"HEADERS:\n{response.headers}\nCONTENT:\n{response.content!r}"
+    def _poll_events_or_warn(self) -> None:
+        """Polls the events feed, keeping cached values with a warning when it cannot be read.
+
+        A failed poll is not repeated before the poll interval passes, so that an unavailable
+        feed does not add a failing request to every check.
+        """
+        try:
+            self.poll_events()
+        except RequestException as exc:
+            warnings.warn(
+                f"issue_watcher could not poll events of '{self._repository_id}', cached values may be "
+                f"out of date. {exc}",
+                RuntimeWarning,
             )
+            state = self._cache.peek(self._EVENTS_KEY)
+            self._cache[self._EVENTS_KEY] = (
+                state[0]
+                if state is not None
+                else dumps({"etag": None, "last_event_id": None, "poll_interval": self._DEFAULT_EVENTS_POLL_INTERVAL})
+            )
+
+    def _raise_cached_error(self, key: str) -> None:
+        """Raises an error remembered for given key again, without sending a request."""
+        for kind in (ERRORS_KIND, RATE_LIMIT_ERRORS_KIND):
+            try:
+                error = decode_error(self._cache[f"{kind}/{key}"])
+            except (KeyError, ValueError):
+                continue
+            raise error
+
+    def _expired(self, key: str, parse: Callable[[str], _T], reason: str) -> _T:
+        """Returns expired cached value with a warning instead of fetching it.
+
+        :raises KeyError: When there is no cached value.
+        :raises ValueError: When the cached value cannot be parsed.
+        """
+        entry = self._cache.peek(key)
+        if entry is None:
+            raise KeyError(key)
+        value = parse(entry[0])
+        warnings.warn(
+            f"issue_watcher used expired cached '{key}' of '{self._repository_id}', {reason}.", RuntimeWarning
+        )
+        return value
+
+    def _cached(self, key: str, fetch: Callable[[], Tuple[str, Optional[float]]], parse: Callable[[str], _T]) -> _T:
+        """Returns parsed value from cache or fetches and caches it on a cache miss.
+
+        Errors caused by missing resources, missing data and exceeded rate limit are cached too,
+        for a shorter time, and raised again without sending a request. Values older than the
+        maximum age are fetched again. When sampling is turned on and there is no maximum age,
+        expired values not sampled for refreshing yet are used as if valid. Expired
+        values are also used, with a warning, when the latency budget ran out or GitHub timed out.
+
+        :param fetch: Returns the value and a UNIX timestamp of the last change of the resource,
+            if known, which is used for adaptive cache invalidation.
+        :param parse: Converts the value. Values that cannot be parsed are considered a cache miss.
+        """
+        if self._invalidate_by_events and not self._latency.exhausted:
+            self._poll_events_or_warn()
+
+        try:
+            return parse(self._fresh(key))
+        except (KeyError, ValueError):
+            pass
+
+        stale_entry = self._cache.peek(key) if self._cache.sampling and self._max_age is None else None
+        if stale_entry is not None and not self._cache.sampled(key):
+            with suppress(ValueError):
+                return parse(stale_entry[0])
+
+        if self._latency.exhausted:
+            with suppress(KeyError, ValueError):
+                return self._expired(key, parse, "because the network time budget of the session ran out")
+
+        with self._cache.lock(key):
+            # another process sharing the cache may have fetched the value while we waited for the lock
+            try:
+                return parse(self._fresh(key))
+            except (KeyError, ValueError):
+                pass
+
+            self._raise_cached_error(key)
+
+            started_at = monotonic()
+            try:
+                value, last_activity = fetch()
+            except (HTTPError, AssertionError) as exc:
+                kind = error_kind(exc)
+                if kind is not None:
+                    self._cache[f"{kind}/{key}"] = encode_error(exc)
+                raise
+            except Timeout:
+                with suppress(KeyError, ValueError):
+                    return self._expired(key, parse, "because GitHub did not respond in time")
+                raise
+
+            self._cache.set(key, value, last_activity, monotonic() - started_at)
+            return parse(value)
+
+    def _fresh(self, key: str) -> str:
+        """Returns valid cached value, not older than the maximum age if set.
+
+        :raises KeyError: When there is no such value.
+        """
+        value = self._cache[key]
+        if self._max_age is not None:
+            entry = self._cache.peek(key)
+            if entry is None or entry[1] < time() - self._max_age:
+                raise KeyError(key)
+        return value
+
+    @staticmethod
+    def _last_activity(issue: Dict[str, Any]) -> Optional[float]:
+        timestamps = [
+            datetime.strptime(issue[field], "%Y-%m-%dT%H:%M:%SZ").replace(tzinfo=timezone.utc).timestamp()
+            for field in ("updated_at", "closed_at")
+            if isinstance(issue.get(field), str)
+        ]
+        return max(timestamps) if timestamps else None
+
+    def refresh_issues(self) -> Dict[int, str]:
+        """Refreshes states of all expired cached issues of the repository at once.
+
+        Instead of fetching each issue separately, issues of the repository updated since the
+        oldest expired entry was stored are listed. States of listed issues are updated and
+        all other expired issues are marked as fresh, because they have not changed. This
+        takes a single request (or one per 100 changed issues) regardless of the number of
+        watched issues.
+
+        Does nothing if the cache is disabled or fewer than two cached issues expired. Gives up
+        (leaving the issues to be fetched one by one) when too many issues changed.
+
+        :raises requests.HTTPError: When response status code from GitHub is not 200.
+        :return: Current states of the refreshed issues by their IDs.
+        """
+        stale_issues = self._cache.stale("issues")
+        if len(stale_issues) < self._BULK_REFRESH_MIN_ISSUES:
+            return {}
+
+        refreshed_at = int(time())
+        since = min(timestamp for _, timestamp in stale_issues.values())
+        query = urlencode(
+            {
+                "state": "all",
+                "since": datetime.fromtimestamp(since, timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+                "per_page": 100,
+            }
+        )
+        # Response documented at https://docs.github.com/en/rest/issues/issues#list-repository-issues
+        url: Optional[str] = f"{self._URL_API}/repos/{self._repository_id}/issues?{query}"
+        changed_states: Dict[str, str] = {}
+
+        pages = 0
+
+        while url is not None:
+            if pages == self._BULK_REFRESH_MAX_PAGES:
+                return {}
+            response = self._get(url)
+            changed_states.update({f"issues/{issue['number']}": str(issue["state"]) for issue in response.json()})
+            url = response.links.get("next", {}).get("url")
+            pages += 1
+
+        states = {key: changed_states.get(key, current_state) for key, (current_state, _) in stale_issues.items()}
+        self._cache.set_many(states, refreshed_at)
+        return {int(key.split("/", 1)[1]): state for key, state in states.items()}
+
+    def _tag_refs(self) -> List[str]:
+        """Returns refs of all git tags of the repository, sharing them with concurrent calls.
+
+        The response is streamed and only the refs are parsed out of it, keeping memory use
+        low for repositories with many tags. Tags are read from the git ref advertisement,
+        which does not count against the API rate limit, when configured.
+        """
+        parse: Callable[[Iterable[bytes]], Iterator[str]] = iter_refs
+        # Response documented at https://docs.github.com/en/rest/git/refs#list-matching-references
+        url = f"{self._URL_API}/repos/{self._repository_id}/git/refs/tags"
+        if self._tags_from_git:
+            parse = iter_advertised_tags
+            url = f"{self._URL_WEB}/{self._repository_id}.git/info/refs?service=git-upload-pack"
+
+        def _fetch() -> List[str]:
+            response = self._get(url, stream=True)
+            try:
+                return list(parse(response.iter_content(self._STREAM_CHUNK_SIZE)))
+            finally:
+                response.close()
+
+        return self._REFS_IN_FLIGHT.do((url, self._auth[0] if self._auth else ""), _fetch)
+
+    @classmethod
+    def defer_to(cls, recorder: Optional[DeferredRecorder]) -> Optional[DeferredRecorder]:
+        """Makes all instances hand assertions over to given recorder instead of checking them.
+
+        Used by :py:class:`issue_watcher.deferred.DeferredAssertions`.
+
+        :param recorder: Called with repository ID, method name, positional and keyword
+            arguments of each assertion. ``None`` turns checking assertions right away back on.
+        :return: The previous recorder.
+        """
+        previous, cls._DEFERRED = cls._DEFERRED, recorder
+        return previous
+
+    def _defer(self, method: str, *args: Any, **kwargs: Any) -> bool:
+        """Registers the assertion instead of checking it, if deferred assertions are being collected.
+
+        :return: Whether the assertion was deferred.
+        """
+        recorder = self._DEFERRED
+        if recorder is None:
+            return False
+        recorder(self._repository_id, method, args, kwargs)  # pylint: disable=not-callable
+        return True
 
     def is_state(self, issue_id: int, expected_state: GitHubIssueState, msg: str = "") -> None:
         """Checks state of given issue.
@@ -94,20 +344,16 @@ class AssertGitHubIssue:
         """
         issue_identifier = f"issues/{issue_id}"
 
-        try:
-            current_state = self._cache[issue_identifier]
-            pass  # pylint: disable=unnecessary-pass; this line should be covered
-        except KeyError:
+        def _fetch_state() -> Tuple[str, Optional[float]]:
+            refreshed_states = self.refresh_issues()
+            if issue_id in refreshed_states:
+                return refreshed_states[issue_id], None
+
             # Response documented at https://developer.github.com/v3/issues/
-            response: Response = requests.get(
-                f"{self._URL_API}/repos/{self._repository_id}/{issue_identifier}",
-                auth=self._auth,
-                timeout=DEFAULT_REQUESTS_TIMEOUT_SEC,
-            )
-            self._handle_connection_error(response)
+            issue = self._get(f"{self._URL_API}/repos/{self._repository_id}/{issue_identifier}").json()
+            return str(issue["state"]), self._last_activity(issue)
 
-            current_state = response.json()["state"]
-            self._cache[issue_identifier] = current_state
+        current_state = self._cached(issue_identifier, _fetch_state, str)
 
         if msg:
             msg = f" {msg}"
@@ -124,7 +370,8 @@ class AssertGitHubIssue:
         :raises requests.HTTPError: When response status code from GitHub is not 200.
         :raises AssertionError: When test fails.
         """
-        self.is_state(issue_id, GitHubIssueState.OPEN, msg)
+        if not self._defer("is_open", issue_id, msg):
+            self.is_state(issue_id, GitHubIssueState.OPEN, msg)
 
     def is_closed(self, issue_id: int, msg: str = "") -> None:
         """Check if given issue is closed.
@@ -132,7 +379,8 @@ class AssertGitHubIssue:
         :raises requests.HTTPError: When response status code from GitHub is not 200.
         :raises AssertionError: When test fails.
         """
-        self.is_state(issue_id, GitHubIssueState.CLOSED, msg)
+        if not self._defer("is_closed", issue_id, msg):
+            self.is_state(issue_id, GitHubIssueState.CLOSED, msg)
 
     def current_release(self, current_release_number: Optional[int] = None) -> None:
         """Checks number of releases of watched repository.
@@ -147,17 +395,13 @@ class AssertGitHubIssue:
         :raises requests.HTTPError: When response status code from GitHub is not 200.
         :raises AssertionError: When test fails.
         """
-        releases_url = f"{self._URL_API}/repos/{self._repository_id}/git/refs/tags"
+        if self._defer("current_release", current_release_number):
+            return
 
-        try:
-            actual_release_count = int(self._cache["release_count"])
-            pass  # pylint: disable=unnecessary-pass; this line should be covered
-        except (KeyError, ValueError):
-            response: Response = requests.get(releases_url, auth=self._auth, timeout=DEFAULT_REQUESTS_TIMEOUT_SEC)
-            self._handle_connection_error(response)
+        def _fetch_release_count() -> Tuple[str, Optional[float]]:
+            return str(len(self._tag_refs())), None
 
-            actual_release_count = len(response.json())
-            self._cache["release_count"] = str(actual_release_count)
+        actual_release_count = self._cached("release_count", _fetch_release_count, int)
 
         assert current_release_number is not None, (
             f"This test does not have any number of releases set. Current number "
@@ -178,27 +422,6 @@ class AssertGitHubIssue:
             f"available. Visit {self._URL_WEB}/{self._repository_id}/releases."
         )
 
-    @staticmethod
-    def _parse_version_number(string: str, pattern: Pattern[str]) -> Optional[Version]:
-        match = pattern.match(string.replace("refs/tags/", ""))
-        if not match:
-            return None
-        try:
-            return Version(match.group("version"))
-        except InvalidVersion:
-            return None
-
-    def _ordered_version_numbers(self, tags: List[Dict[str, Any]], pattern: str) -> List[Version]:
-        version_pattern = re.compile(pattern)
-        return sorted(
-            (
-                version
-                for version in (self._parse_version_number(item["ref"], version_pattern) for item in tags)
-                if version is not None
-            ),
-            reverse=True,
-        )
-
     def fixed_in(self, version: Optional[str] = None, pattern: str = "(?P<version>.*)") -> None:
         """Checks if there is a release with higher or equal version number in the watched repository.
 
@@ -228,23 +451,22 @@ class AssertGitHubIssue:
         :raises AssertionError: When test fails.
         :raises ValueError: When ``pattern`` does not contain correct group.
         """
-        releases_url = f"{self._URL_API}/repos/{self._repository_id}/git/refs/tags"
-
         if "(?P<version>" not in pattern:
             raise ValueError("The 'pattern' parameter must contain a group '(?P<version>…)'.")
 
-        try:
-            latest_version = Version(self._cache["latest_version"])
-            pass  # pylint: disable=unnecessary-pass; this line should be covered
-        except (KeyError, ValueError):
-            response: Response = requests.get(releases_url, auth=self._auth, timeout=DEFAULT_REQUESTS_TIMEOUT_SEC)
-            self._handle_connection_error(response)
+        if self._defer("fixed_in", version, pattern=pattern):
+            return
 
-            versions = self._ordered_version_numbers(response.json(), pattern)
-            assert versions, "No tags with a valid semantic versions were found in the repository."
-            latest_version = versions[0]
+        def _fetch_latest_version() -> Tuple[str, Optional[float]]:
+            tag_refs = self._tag_refs()
+            versions = ordered_version_numbers(tag_refs, pattern)
+            if not versions:
+                message = "No tags with a valid semantic versions were found in the repository."
+                # only missing tags are remembered, existing tags may match another pattern
+                raise ArgumentDependentError(message) if tag_refs else AssertionError(message)
+            return str(versions[0]), None
 
-            self._cache["latest_version"] = str(latest_version)
+        latest_version = self._cached("latest_version", _fetch_latest_version, Version)
 
         assert (
             version is not None
@@ -0,0 +1,129 @@
+import threading
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from time import monotonic
+from typing import Callable, Deque, Dict, Optional, Tuple, TypeVar
+
+from issue_watcher.constants import DEFAULT_REQUESTS_TIMEOUT_SEC
+
+_T = TypeVar("_T")
+
+
+def _close(future: "Future[_T]") -> None:
+    """Releases the connection of a response nobody waits for anymore."""
+    if not future.cancelled() and future.exception() is None:
+        close = getattr(future.result(), "close", None)
+        if close is not None:
+            close()
+
+
+class LatencyTracker:
+    """Spends the network time budget of a session and adapts requests to observed latencies.
+
+    With a budget, once enough requests were observed, each request times out after a multiple
+    of the 99th percentile of recent latencies instead of the fixed default, and never later
+    than the remaining budget. With hedging turned on, a duplicate request is sent when the
+    first one takes longer than the 95th percentile and whichever answers first is used.
+    """
+
+    _MIN_SAMPLES = 20
+    _WINDOW = 200
+    _TIMEOUT_FACTOR = 4.0
+    _MIN_TIMEOUT = 2.0
+    _HEDGING_THREADS = 16
+
+    def __init__(self, budget: float = 0.0, hedge: bool = False):
+        """Constructor.
+
+        :param budget: Total number of seconds spent waiting for responses, ``0`` for unlimited.
+        :param hedge: Send a duplicate of slow requests.
+        """
+        self._budget = budget
+        self._hedge = hedge
+        self._lock = threading.Lock()
+        self._latencies: Deque[float] = deque(maxlen=self._WINDOW)
+        self._spent = 0.0
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    @property
+    def spent(self) -> float:
+        """Seconds spent waiting for responses so far."""
+        return self._spent
+
+    @property
+    def exhausted(self) -> bool:
+        """Tells if the budget ran out."""
+        return bool(self._budget) and self._spent >= self._budget
+
+    def percentile(self, fraction: float) -> Optional[float]:
+        """Returns given percentile of recent latencies, or ``None`` until enough requests were observed."""
+        with self._lock:
+            if len(self._latencies) < self._MIN_SAMPLES:
+                return None
+            ordered = sorted(self._latencies)
+        return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)]
+
+    def timeout(self) -> float:
+        """Returns timeout of the next request, adapted to recent latencies and the remaining budget."""
+        if not self._budget:
+            return DEFAULT_REQUESTS_TIMEOUT_SEC
+
+        p99 = self.percentile(0.99)
+        timeout = DEFAULT_REQUESTS_TIMEOUT_SEC if p99 is None else p99 * self._TIMEOUT_FACTOR
+        return max(min(timeout, self._budget - self._spent, DEFAULT_REQUESTS_TIMEOUT_SEC), self._MIN_TIMEOUT)
+
+    def record(self, latency: float) -> None:
+        with self._lock:
+            self._latencies.append(latency)
+            self._spent += latency
+
+    def call(self, request: Callable[[float], _T]) -> _T:
+        """Sends a request, hedging it if turned on, and records how long it took.
+
+        :param request: Sends the request with given timeout in seconds.
+        """
+        timeout = self.timeout()
+        hedge_after = self.percentile(0.95) if self._hedge else None
+        started_at = monotonic()
+
+        try:
+            if hedge_after is None:
+                return request(timeout)
+            return self._hedged(request, timeout, hedge_after)
+        finally:
+            self.record(monotonic() - started_at)
+
+    def _hedged(self, request: Callable[[float], _T], timeout: float, hedge_after: float) -> _T:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(self._HEDGING_THREADS, thread_name_prefix="issue-watcher-hedge")
+            executor = self._executor
+
+        futures = [executor.submit(request, timeout)]
+        done, _ = wait(futures, timeout=hedge_after)
+        if not done:
+            futures.append(executor.submit(request, timeout))
+
+        pending = set(futures)
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    for other in futures:
+                        if other is not future:
+                            other.add_done_callback(_close)
+                    return future.result()
+
+        raise futures[0].exception()  # type: ignore[misc]  # all requests failed
+
+
+_SHARED_TRACKERS: Dict[Tuple[float, bool], LatencyTracker] = {}
+_SHARED_TRACKERS_LOCK = threading.Lock()
+
+
+def shared_latency_tracker(budget: float, hedge: bool) -> LatencyTracker:
+    """Returns latency tracker shared within the process, so that the budget is spent by the whole session."""
+    with _SHARED_TRACKERS_LOCK:
+        if (budget, hedge) not in _SHARED_TRACKERS:
+            _SHARED_TRACKERS[(budget, hedge)] = LatencyTracker(budget, hedge)
+        return _SHARED_TRACKERS[(budget, hedge)]
@@ -0,0 +1,380 @@
+"""Cache backend storing entries in a binary file read through ``mmap``.
+
+The file consists of a fixed size header, an index and packed records::
+
+    header      magic, number of slots, occupied slots, end of records, bytes of replaced records,
+                offset and length of the namespaces
+    index       open addressing hash table of slots: key hash and record offset
+    records     namespace number, key and JSON encoded entry, appended one after another
+    namespaces  JSON encoded list of namespace names, stored once after the records
+
+A lookup hashes the namespace and key, probes the index and decodes a single record, instead
+of deserializing the whole file. Writes append records and update slots in place. The file is
+rewritten only when the index fills up or most of the records were replaced. Offsets are
+stored in 32 bits, so the file is limited to 4 GiB.
+"""
+
+import math
+import mmap
+import os
+import struct
+import sys
+import zlib
+from array import array
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, List, Mapping, NamedTuple, Optional, Tuple
+
+from ujson import dumps, loads
+
+from issue_watcher.cache_backends import CacheEntry, FileCacheBackend, _file_lock
+
+_MAGIC = b"IWC\x02"
+_HEADER = struct.Struct("<4sIIIIII")
+_SLOT = struct.Struct("<II")
+_RECORD = struct.Struct("<HHI")
+_EMPTY, _DELETED = 0, 1  # record offsets of free slots, records are stored after the index
+_MIN_SLOTS = 64
+_MAX_LOAD = 0.7
+_REWRITE_LOAD = 0.5  # leaves room for new entries after the file is rewritten
+_UNKNOWN_TIMESTAMP = -(2**63)  # entries without a valid timestamp expire first
+
+_Packed = Dict[Tuple[int, bytes], Tuple[int, bytes]]
+"""Packed records with their key hashes by namespace number and key."""
+
+
+class _Header(NamedTuple):
+    slots: int
+    occupied: int
+    data_end: int
+    garbage: int
+    namespaces_offset: int
+    namespaces_length: int
+
+
+class _Record(NamedTuple):
+    key_hash: int
+    namespace: int
+    key: bytes
+    payload: bytes
+
+    @property
+    def length(self) -> int:
+        return _RECORD.size + len(self.key) + len(self.payload)
+
+
+def _namespace_hash(namespace: str) -> int:
+    return zlib.crc32(namespace.encode("utf-8") + b"\0")
+
+
+def _timestamp(payload: bytes) -> int:
+    try:
+        return int(loads(payload)[1])
+    except (TypeError, ValueError, IndexError, OverflowError):
+        return _UNKNOWN_TIMESTAMP
+
+
+def _pack(namespace: str, number: int, entries: Mapping[str, CacheEntry]) -> _Packed:
+    """Encodes entries of a namespace stored under given number."""
+    namespace_hash, pack, crc32 = _namespace_hash(namespace), _RECORD.pack, zlib.crc32
+    keys = [key.encode("utf-8") for key in entries]
+    payloads = [dumps(entry).encode("utf-8") for entry in entries.values()]
+    return {
+        (number, key): (crc32(key, namespace_hash), pack(number, len(key), len(payload)) + key + payload)
+        for key, payload in zip(keys, payloads)
+    }
+
+
+class _Table:
+    """Index and records of a cache file mapped into memory."""
+
+    def __init__(self, buffer: mmap.mmap):
+        self._buffer = buffer
+        magic, *fields = _HEADER.unpack_from(buffer, 0)
+        header = _Header(*fields)
+        if (
+            magic != _MAGIC
+            or not header.slots
+            or header.data_end > len(buffer)
+            or self.data_start(header.slots) > header.data_end
+            or header.namespaces_offset + header.namespaces_length > header.data_end
+        ):
+            raise ValueError("Not a cache file.")
+        self.header = header
+
+        namespaces = loads(buffer[header.namespaces_offset : header.namespaces_offset + header.namespaces_length])
+        if not isinstance(namespaces, list) or not all(isinstance(namespace, str) for namespace in namespaces):
+            raise ValueError("Not a cache file.")
+        self.namespaces: List[str] = namespaces
+
+    @classmethod
+    def of(cls, buffer: Optional[mmap.mmap]) -> Optional["_Table"]:
+        """Returns the table in given buffer, or ``None`` when there is none or it is not valid."""
+        if buffer is None:
+            return None
+        try:
+            return cls(buffer)
+        except (ValueError, struct.error):
+            return None
+
+    @staticmethod
+    def data_start(slots: int) -> int:
+        return _HEADER.size + slots * _SLOT.size
+
+    def number_of(self, namespace: str) -> Optional[int]:
+        try:
+            return self.namespaces.index(namespace)
+        except ValueError:
+            return None
+
+    def _slot(self, index: int) -> Tuple[int, int]:
+        return _SLOT.unpack_from(self._buffer, _HEADER.size + index * _SLOT.size)
+
+    def _read(self, key_hash: int, offset: int) -> Optional[_Record]:
+        if offset < self.data_start(self.header.slots) or offset + _RECORD.size > self.header.data_end:
+            return None  # torn write
+        number, key_length, payload_length = _RECORD.unpack_from(self._buffer, offset)
+        key_start = offset + _RECORD.size
+        payload_start = key_start + key_length
+        if payload_start + payload_length > self.header.data_end:
+            return None
+        return _Record(
+            key_hash,
+            number,
+            self._buffer[key_start:payload_start],
+            self._buffer[payload_start : payload_start + payload_length],
+        )
+
+    def find(self, key_hash: int, number: int, key: bytes) -> Tuple[Optional[int], Optional[_Record]]:
+        """Returns the slot holding the key, or the first slot available for it, and the stored record."""
+        available = None
+        slots = self.header.slots
+        index = key_hash % slots
+        for _ in range(slots):
+            stored_hash, offset = self._slot(index)
+            if offset == _EMPTY:
+                return index if available is None else available, None
+            if offset == _DELETED:
+                available = index if available is None else available
+            elif stored_hash == key_hash:
+                found = self._read(stored_hash, offset)
+                if found and found.namespace == number and found.key == key:
+                    return index, found
+            index = index + 1 if index + 1 < slots else 0
+        return available, None
+
+    def live(self, number: Optional[int] = None) -> Iterator[Tuple[int, _Record]]:
+        """Yields stored records with their slots, only of given namespace number if set."""
+        slots = self._buffer[_HEADER.size : self.data_start(self.header.slots)]
+        for index, (key_hash, offset) in enumerate(_SLOT.iter_unpack(slots)):
+            if offset not in (_EMPTY, _DELETED):
+                found = self._read(key_hash, offset)
+                if found and (number is None or found.namespace == number):
+                    yield index, found
+
+    def packed(self) -> _Packed:
+        """Returns all stored records as they are packed in the file."""
+        return {
+            (record.namespace, record.key): (
+                record.key_hash,
+                _RECORD.pack(record.namespace, len(record.key), len(record.payload)) + record.key + record.payload,
+            )
+            for _, record in self.live()
+        }
+
+    def write_slot(self, index: int, key_hash: int, offset: int) -> None:
+        _SLOT.pack_into(self._buffer, _HEADER.size + index * _SLOT.size, key_hash, offset)
+
+    def write_header(self, header: _Header) -> None:
+        self.header = header
+        _HEADER.pack_into(self._buffer, 0, _MAGIC, *header)
+
+
+def _write_file(path: str, namespaces: List[str], packed: _Packed) -> None:
+    """Writes a new file with given records in one go, replacing the existing one.
+
+    The index is sized to the number of records and filled while the records are copied.
+    """
+    slots = max(_MIN_SLOTS, math.ceil(len(packed) / _REWRITE_LOAD))
+    data_start = _Table.data_start(slots)
+    index = array("I", bytes(slots * _SLOT.size))
+    data = bytearray()
+
+    for key_hash, record in packed.values():
+        slot = key_hash % slots
+        while index[2 * slot + 1] != _EMPTY:
+            slot = slot + 1 if slot + 1 < slots else 0
+        index[2 * slot] = key_hash
+        index[2 * slot + 1] = data_start + len(data)
+        data += record
+    if sys.byteorder == "big":
+        index.byteswap()
+
+    namespaces_data = dumps(namespaces).encode("utf-8")
+    namespaces_offset = data_start + len(data)
+    data += namespaces_data
+    header = _Header(slots, len(packed), data_start + len(data), 0, namespaces_offset, len(namespaces_data))
+
+    temporary_path = f"{path}.{os.getpid()}.tmp"
+    with open(temporary_path, "wb") as cache_file:
+        cache_file.write(_HEADER.pack(_MAGIC, *header))
+        cache_file.write(index.tobytes())
+        cache_file.write(data)
+    os.replace(temporary_path, path)
+
+
+class MappedFileCacheBackend(FileCacheBackend):
+    """All namespaces stored in a single binary file, read through ``mmap``.
+
+    Looking up a key reads only its record, so lookups stay fast regardless of the size of
+    the cache. Missing or corrupted files are treated as empty.
+    """
+
+    @contextmanager
+    def _table(self, writable: bool) -> Iterator[Optional[_Table]]:
+        """Maps the cache file into memory. Yields ``None`` when it is missing or not valid.
+
+        Changes are visible to other processes without flushing, durability is not needed.
+        """
+        cache_file, buffer = None, None
+        try:
+            try:
+                cache_file = open(self._path, "r+b" if writable else "rb")  # pylint: disable=consider-using-with
+            except FileNotFoundError:
+                pass
+            else:
+                if os.fstat(cache_file.fileno()).st_size >= _HEADER.size:
+                    access = mmap.ACCESS_WRITE if writable else mmap.ACCESS_READ
+                    buffer = mmap.mmap(cache_file.fileno(), 0, access=access)
+            yield _Table.of(buffer)
+        finally:
+            if buffer is not None:
+                buffer.close()
+            if cache_file is not None:
+                cache_file.close()
+
+    @contextmanager
+    def _session(self, save: bool) -> Iterator[Optional[_Table]]:
+        with _file_lock(f"{self._path}.lock", exclusive=save):
+            with self._table(writable=save) as table:
+                yield table
+
+    def get_many(self, namespace: str, keys: Iterable[str]) -> Dict[str, CacheEntry]:
+        with self._session(save=False) as table:
+            number = None if table is None else table.number_of(namespace)
+            if table is None or number is None:
+                return {}
+            namespace_hash = _namespace_hash(namespace)
+            entries = {}
+            for key in keys:
+                key_bytes = key.encode("utf-8")
+                _, found = table.find(zlib.crc32(key_bytes, namespace_hash), number, key_bytes)
+                if found is not None:
+                    entries[key] = tuple(loads(found.payload))
+        return entries
+
+    def get_all(self, namespace: str) -> Dict[str, CacheEntry]:
+        with self._session(save=False) as table:
+            number = None if table is None else table.number_of(namespace)
+            if table is None or number is None:
+                return {}
+            return {record.key.decode("utf-8"): tuple(loads(record.payload)) for _, record in table.live(number)}
+
+    def set_many(self, namespace: str, entries: Mapping[str, CacheEntry]) -> None:
+        if not entries:
+            return
+
+        with self._session(save=True) as table:
+            namespaces = [] if table is None else list(table.namespaces)
+            if namespace not in namespaces:
+                namespaces.append(namespace)
+            packed = _pack(namespace, namespaces.index(namespace), entries)
+
+            if table is not None and self._fits(table.header, len(packed)):
+                self._append(table, namespaces, packed)
+            else:
+                existing = {} if table is None else table.packed()
+                existing.update(packed)
+                _write_file(self._path, namespaces, existing)
+
+    @staticmethod
+    def _fits(header: _Header, new_records: int) -> bool:
+        live_data = header.data_end - _Table.data_start(header.slots) - header.garbage
+        return header.occupied + new_records <= header.slots * _MAX_LOAD and header.garbage <= max(live_data, 1 << 16)
+
+    def _append(self, table: _Table, namespaces: List[str], packed: _Packed) -> None:
+        """Appends all records with a single write and points their slots at them."""
+        header, offsets = self._append_records(table, namespaces, packed)
+        garbage, occupied = header.garbage, header.occupied
+
+        # the mapping does not grow with the file, so slots are updated through a new one
+        with self._table(writable=True) as grown_table:
+            assert grown_table is not None
+            for ((number, key), (key_hash, _)), offset in zip(packed.items(), offsets):
+                index, found = grown_table.find(key_hash, number, key)
+                assert index is not None  # the index is never full
+                if found is not None:
+                    garbage += found.length
+                else:
+                    occupied += 1
+                grown_table.write_slot(index, key_hash, offset)
+            grown_table.write_header(header._replace(garbage=garbage, occupied=occupied))
+
+    def _append_records(self, table: _Table, namespaces: List[str], packed: _Packed) -> Tuple[_Header, List[int]]:
+        """Writes records after the existing ones, followed by the namespaces if there is a new one.
+
+        :return: Header describing the appended data and offsets of the records.
+        """
+        header = table.header
+        data = bytearray()
+        offsets = []
+        for _, record in packed.values():
+            offsets.append(header.data_end + len(data))
+            data += record
+
+        if len(namespaces) > len(table.namespaces):
+            namespaces_data = dumps(namespaces).encode("utf-8")
+            header = header._replace(
+                garbage=header.garbage + header.namespaces_length,
+                namespaces_offset=header.data_end + len(data),
+                namespaces_length=len(namespaces_data),
+            )
+            data += namespaces_data
+
+        with open(self._path, "r+b") as cache_file:
+            cache_file.seek(header.data_end)
+            cache_file.write(data)
+        return header._replace(data_end=header.data_end + len(data)), offsets
+
+    def delete(self, namespace: str, key: str) -> None:
+        with self._session(save=True) as table:
+            number = None if table is None else table.number_of(namespace)
+            if table is None or number is None:
+                return
+            key_bytes = key.encode("utf-8")
+            index, found = table.find(zlib.crc32(key_bytes, _namespace_hash(namespace)), number, key_bytes)
+            if index is not None and found is not None:
+                table.write_slot(index, 0, _DELETED)
+                table.write_header(table.header._replace(garbage=table.header.garbage + found.length))
+
+    def expire(self, namespace: str, older_than: int) -> None:
+        with self._session(save=True) as table:
+            number = None if table is None else table.number_of(namespace)
+            if table is None or number is None:
+                return
+            garbage = table.header.garbage
+            for index, record in list(table.live(number)):
+                if _timestamp(record.payload) < older_than:
+                    garbage += record.length
+                    table.write_slot(index, 0, _DELETED)
+            table.write_header(table.header._replace(garbage=garbage))
+
+    def namespaces(self) -> List[str]:
+        with self._session(save=False) as table:
+            if table is None:
+                return []
+            numbers = dict.fromkeys(record.namespace for _, record in table.live())
+            return [table.namespaces[number] for number in numbers if number < len(table.namespaces)]
+
+    def clear(self) -> None:
+        with _file_lock(f"{self._path}.lock", exclusive=True):
+            _write_file(self._path, [], {})
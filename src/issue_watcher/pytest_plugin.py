@@ -0,0 +1,122 @@
+"""pytest plugin fetching watched issues once for the whole test session.
+
+With pytest-xdist, the controller fetches every unique assertion found in the collected paths
+before workers start and sends the cached results to each worker. Workers then find their
+assertions in the cache instead of racing each other for the same GitHub resources.
+
+In deferred mode, assertions called by tests are only registered and all of them are checked
+together at the end of the session.
+"""
+
+from typing import Any, Dict, List, Optional
+
+import pytest
+
+from issue_watcher import scan
+from issue_watcher.cache_backends import CacheEntry
+from issue_watcher.deferred import DeferredAssertions, describe_failure
+from issue_watcher.temporary_cache import TemporaryCache
+
+_OPTION = "issue_watcher_prefetch"
+_OPTION_DEFERRED = "issue_watcher_deferred"
+_WORKER_INPUT_KEY = "issue_watcher_entries"
+_WORKER_OUTPUT_KEY = "issue_watcher_deferred_failures"
+
+
+def prefetch(paths: List[str], threads: int = 16) -> Dict[str, Dict[str, CacheEntry]]:
+    """Checks all assertions found in given paths once, filling the cache.
+
+    Failing assertions are not reported, tests calling them will fail on their own.
+
+    :param paths: Python files or directories searched as by :py:func:`issue_watcher.scan.discover`.
+    :param threads: Number of threads sending requests to GitHub.
+    :return: Cache entries of all repositories found in given paths.
+    """
+    calls = scan.discover(paths)
+    scan.check(calls, threads)
+    return TemporaryCache.entries({call.repository_id for call in calls})
+
+
+def _is_worker(config: Any) -> bool:
+    return hasattr(config, "workerinput")
+
+
+def _enabled(config: Any, option: str = _OPTION) -> bool:
+    return bool(config.getoption(option) or config.getini(option))
+
+
+class _Prefetch:
+    def __init__(self) -> None:
+        self._entries: Optional[Dict[str, Dict[str, CacheEntry]]] = None
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_sessionstart(self, session: Any) -> None:
+        paths = [arg.split("::", 1)[0] for arg in session.config.args]
+        self._entries = prefetch(paths)
+
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_configure_node(self, node: Any) -> None:
+        """Sends the prefetched cache entries to a pytest-xdist worker."""
+        node.workerinput[_WORKER_INPUT_KEY] = self._entries or {}
+
+
+class _Deferred:
+    def __init__(self) -> None:
+        self._assertions = DeferredAssertions()
+        self._failures: List[str] = []
+
+    def pytest_sessionstart(self) -> None:
+        self._assertions.start()
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_sessionfinish(self, session: Any) -> None:
+        failures = [describe_failure(result) for result in self._assertions.resolve() if result.outcome != "passed"]
+        if _is_worker(session.config):
+            session.config.workeroutput[_WORKER_OUTPUT_KEY] = failures
+        self._failures.extend(failures)
+
+        if self._failures and session.exitstatus == pytest.ExitCode.OK:
+            session.exitstatus = pytest.ExitCode.TESTS_FAILED
+
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_testnodedown(self, node: Any, error: Any) -> None:  # pylint: disable=unused-argument
+        """Collects failed deferred assertions of a pytest-xdist worker."""
+        self._failures.extend(getattr(node, "workeroutput", {}).get(_WORKER_OUTPUT_KEY, []))
+
+    def pytest_terminal_summary(self, terminalreporter: Any) -> None:
+        if self._failures:
+            terminalreporter.section("issue-watcher deferred assertions", red=True)
+            terminalreporter.line(f"{len(self._failures)} deferred assertion(s) failed:")
+            for failure in self._failures:
+                terminalreporter.line(failure)
+
+
+def pytest_addoption(parser: Any) -> None:
+    group = parser.getgroup("issue-watcher")
+    group.addoption(
+        "--issue-watcher-prefetch",
+        action="store_true",
+        dest=_OPTION,
+        default=False,
+        help="Check all assertions found in the collected paths once before running tests.",
+    )
+    parser.addini(_OPTION, type="bool", default=False, help="Check all assertions found in the collected paths once.")
+    group.addoption(
+        "--issue-watcher-deferred",
+        action="store_true",
+        dest=_OPTION_DEFERRED,
+        default=False,
+        help="Only register assertions in tests and check all of them together at the end of the session.",
+    )
+    parser.addini(_OPTION_DEFERRED, type="bool", default=False, help="Check all assertions at the end of the session.")
+
+
+def pytest_configure(config: Any) -> None:
+    if _is_worker(config):
+        if _WORKER_INPUT_KEY in config.workerinput:
+            TemporaryCache.merge(config.workerinput[_WORKER_INPUT_KEY])
+    elif _enabled(config):
+        config.pluginmanager.register(_Prefetch(), "issue-watcher-prefetch")
+
+    if _enabled(config, _OPTION_DEFERRED):
+        config.pluginmanager.register(_Deferred(), "issue-watcher-deferred")
@@ -0,0 +1,88 @@
+import re
+from typing import Iterable, Iterator
+
+from ujson import loads
+
+# value of a "ref" field, which contains no unescaped quotes; keys cannot appear inside string values unescaped
+_REF_FIELD = re.compile(rb'"ref"\s*:\s*"((?:[^"\\]|\\.)*)"')
+_REF_KEY = b'"ref"'
+
+
+def _decode(raw_value: bytes) -> str:
+    if b"\\" in raw_value:
+        return str(loads(b'"' + raw_value + b'"'))
+    return raw_value.decode("utf-8")
+
+
+def iter_refs(chunks: Iterable[bytes]) -> Iterator[str]:
+    """Yields ``ref`` fields of a JSON array of git references, such as ``refs/tags/1.0.0``.
+
+    The body is read chunk by chunk and only the ``ref`` strings are decoded. The rest of each
+    reference (object, URL, node ID) is skipped without being parsed, so memory use does not
+    grow with the number of references.
+
+    :param chunks: Body of the response, for example from :py:meth:`requests.Response.iter_content`.
+    """
+    pending = b""
+
+    for chunk in chunks:
+        pending += chunk
+        parsed_until = 0
+
+        for match in _REF_FIELD.finditer(pending):
+            parsed_until = match.end()
+            yield _decode(match.group(1))
+
+        # keep only a field possibly cut by the end of the chunk
+        incomplete_field_at = pending.rfind(_REF_KEY, parsed_until)
+        if incomplete_field_at >= 0:
+            pending = pending[incomplete_field_at:]
+        else:
+            pending = pending[max(parsed_until, len(pending) - len(_REF_KEY) + 1) :]
+
+
+_PKT_LENGTH_SIZE = 4
+_PEELED_SUFFIX = b"^{}"
+
+
+def iter_advertised_tags(chunks: Iterable[bytes]) -> Iterator[str]:
+    """Yields tag refs of a git smart HTTP ref advertisement, such as ``refs/tags/1.0.0``.
+
+    The advertisement is a stream of pkt-lines, each prefixed with its length as four
+    hexadecimal digits, see https://git-scm.com/docs/http-protocol. Each ref line holds an
+    object ID and a ref name, the first one followed by capabilities. Peeled tags
+    (``refs/tags/1.0.0^{}``) repeat annotated tags and are skipped, as are all refs other
+    than tags.
+
+    :param chunks: Body of the response to ``info/refs?service=git-upload-pack``.
+    :raises ValueError: When the server reports an error or the stream is not made of pkt-lines.
+    """
+    pending = b""
+
+    for chunk in chunks:
+        pending += chunk
+        position = 0
+
+        while len(pending) - position >= _PKT_LENGTH_SIZE:
+            raw_length = pending[position : position + _PKT_LENGTH_SIZE]
+            try:
+                length = int(raw_length, 16)
+            except ValueError:
+                raise ValueError(f"Invalid pkt-line length {raw_length!r}.") from None
+
+            if length < _PKT_LENGTH_SIZE:  # flush and other special packets carry no data
+                position += _PKT_LENGTH_SIZE
+                continue
+            if len(pending) - position < length:
+                break
+
+            line = pending[position + _PKT_LENGTH_SIZE : position + length].rstrip(b"\n")
+            position += length
+
+            if line.startswith(b"ERR "):
+                raise ValueError(f"Git server error: {line[4:].decode('utf-8', 'replace')}")
+            _, _, name = line.partition(b"\0")[0].partition(b" ")
+            if name.startswith(b"refs/tags/") and not name.endswith(_PEELED_SUFFIX):
+                yield name.decode("utf-8")
+
+        pending = pending[position:]
@@ -0,0 +1,121 @@
+import os
+import threading
+import warnings
+from typing import Dict, Optional, Tuple
+
+from issue_watcher.cache_backends import CacheBackend
+from issue_watcher.credentials import CredentialPool, shared_credential_pool
+from issue_watcher.environment import flag_from_environment, float_from_environment
+from issue_watcher.latency import LatencyTracker, shared_latency_tracker
+from issue_watcher.temporary_cache import TemporaryCache
+from issue_watcher.transport import Http2Transport, shared_http2_transport
+
+
+class RepositoryState:  # pylint: disable=too-few-public-methods,too-many-instance-attributes
+    """Configuration and cache of a watched repository, read from environment variables.
+
+    Shared by all :py:class:`~issue_watcher.AssertGitHubIssue` instances of the repository with
+    the same configuration, see :py:func:`shared_repository_state`.
+    """
+
+    _ENV_VAR_USERNAME = "GITHUB_USER_NAME"
+    _ENV_VAR_TOKEN = "GITHUB_PERSONAL_ACCESS_TOKEN"
+    _ENV_VAR_CREDENTIALS_FILE = "GITHUB_CREDENTIALS_FILE"
+    _ENV_VAR_EVENTS = "CACHE_INVALIDATION_BY_EVENTS"
+    _ENV_VAR_HTTP2 = "GITHUB_HTTP2"
+    _ENV_VAR_LATENCY_BUDGET = "GITHUB_LATENCY_BUDGET_IN_SECONDS"
+    _ENV_VAR_HEDGE = "GITHUB_HEDGE_REQUESTS"
+    _ENV_VAR_TAGS_FROM_GIT = "GITHUB_TAGS_FROM_GIT"
+
+    def __init__(self, repository_id: str, cache_backend: Optional[CacheBackend] = None):
+        """Constructor.
+
+        :param repository_id: GitHub repository ID formatted as "owner/repository name".
+        :param cache_backend: Storage for cached responses. Configured from environment
+            variables when not given.
+        :raises ValueError: When the credentials file is not properly formatted.
+        """
+        self.rate_limit_exceeded_extra_msg: str = ""
+        self.credentials: Optional[CredentialPool] = shared_credential_pool(
+            os.environ.get(self._ENV_VAR_CREDENTIALS_FILE, "")
+        )
+        self.auth: Optional[Tuple[str, str]] = (
+            os.environ.get(self._ENV_VAR_USERNAME, ""),
+            os.environ.get(self._ENV_VAR_TOKEN, ""),
+        )
+        if self.credentials is not None:
+            self.auth = None
+        elif not all(self.auth):
+            if any(self.auth):
+                warnings.warn(
+                    "issue_watcher seems to be improperly configured. Expected both "
+                    f"'{self._ENV_VAR_USERNAME}' and '{self._ENV_VAR_TOKEN}' environment "
+                    "variable to be set or both unset. However, only one is set, GitHub "
+                    "authentication remains disabled and API rate limiting will be "
+                    "limited.",
+                    RuntimeWarning,
+                )
+            self.auth = None
+            self.rate_limit_exceeded_extra_msg = (
+                f"Consider setting '{self._ENV_VAR_USERNAME}' and "
+                f"'{self._ENV_VAR_TOKEN}' environment variables to turn on GitHub "
+                f"authentication and raise the API rate limit. "
+                f"See https://github.com/radeklat/issue-watcher#environment-variables"
+            )
+
+        self.cache = TemporaryCache(repository_id, cache_backend)
+        self.invalidate_by_events = flag_from_environment(self._ENV_VAR_EVENTS)
+        self.http2_transport: Optional[Http2Transport] = (
+            shared_http2_transport() if flag_from_environment(self._ENV_VAR_HTTP2) else None
+        )
+        self.latency: LatencyTracker = shared_latency_tracker(
+            float_from_environment(self._ENV_VAR_LATENCY_BUDGET),
+            flag_from_environment(self._ENV_VAR_HEDGE),
+        )
+        self.tags_from_git = flag_from_environment(self._ENV_VAR_TAGS_FROM_GIT)
+
+
+_STATES: Dict[Tuple[str, Optional[CacheBackend]], RepositoryState] = {}
+_STATES_LOCK = threading.Lock()
+_CONFIGURATION: Dict[str, str] = {}
+_ENV_VAR_PREFIXES = ("GITHUB_", "CACHE_")
+
+
+def _configuration() -> Dict[str, str]:
+    """Returns all environment variables the state is configured by, the rest of the environment does not matter."""
+    return {name: value for name, value in os.environ.items() if name.startswith(_ENV_VAR_PREFIXES)}
+
+
+def shared_repository_state(repository_id: str, cache_backend: Optional[CacheBackend] = None) -> RepositoryState:
+    """Returns state of given repository, shared within the process.
+
+    The state is created once per repository and cache backend. All states are created again
+    when the configuration in environment variables changes, so that it is never out of date.
+
+    :param repository_id: GitHub repository ID formatted as "owner/repository name".
+    :param cache_backend: Storage for cached responses. Configured from environment
+        variables when not given.
+    :raises ValueError: When the credentials file is not properly formatted.
+    """
+    global _CONFIGURATION  # pylint: disable=global-statement
+
+    key = (repository_id, cache_backend)
+    configuration = _configuration()
+
+    with _STATES_LOCK:
+        if configuration != _CONFIGURATION:
+            _STATES.clear()
+            _CONFIGURATION = configuration
+        if key not in _STATES:
+            _STATES[key] = RepositoryState(repository_id, cache_backend)
+        return _STATES[key]
+
+
+def reset_repository_states() -> None:
+    """Forgets all shared states, so that the next instances read their configuration again.
+
+    Intended for tests, which change the configuration in ways not visible in environment
+    variables, such as by mocking.
+    """
+    with _STATES_LOCK:
+        _STATES.clear()
@@ -0,0 +1,195 @@
+import ast
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+from xml.etree import ElementTree
+
+from ujson import dumps
+
+from issue_watcher.github import AssertGitHubIssue
+
+_CLASS_NAME = "AssertGitHubIssue"
+_METHODS = frozenset({"is_open", "is_closed", "current_release", "fixed_in"})
+_SKIPPED_DIRECTORIES = frozenset({"node_modules", "site-packages", "__pycache__", "venv"})
+
+
+class WatcherCall(NamedTuple):
+    """Assertion of a watched repository called with literal arguments."""
+
+    repository_id: str
+    method: str
+    args: Tuple[Any, ...]
+    kwargs: Tuple[Tuple[str, Any], ...]
+
+    def __str__(self) -> str:
+        arguments = [repr(arg) for arg in self.args] + [f"{name}={value!r}" for name, value in self.kwargs]
+        return f"{_CLASS_NAME}({self.repository_id!r}).{self.method}({', '.join(arguments)})"
+
+
+class ScanResult(NamedTuple):
+    call: WatcherCall
+    locations: List[str]
+    """``path:line`` of each place the call was found at."""
+    outcome: str
+    """One of ``passed``, ``failed`` or ``error``."""
+    message: str = ""
+
+
+def _literal_call(node: ast.Call) -> Optional[WatcherCall]:
+    func = node.func
+    if not isinstance(func, ast.Attribute) or func.attr not in _METHODS or not isinstance(func.value, ast.Call):
+        return None
+
+    constructor = func.value
+    constructor_name = getattr(constructor.func, "id", None) or getattr(constructor.func, "attr", None)
+    if constructor_name != _CLASS_NAME or len(constructor.args) != 1 or constructor.keywords:
+        return None
+
+    try:
+        repository_id = ast.literal_eval(constructor.args[0])
+        args = tuple(ast.literal_eval(arg) for arg in node.args)
+        kwargs = tuple((keyword.arg, ast.literal_eval(keyword.value)) for keyword in node.keywords if keyword.arg)
+    except (ValueError, TypeError):
+        return None
+
+    if not isinstance(repository_id, str) or len(kwargs) != len(node.keywords):
+        return None
+
+    call = WatcherCall(repository_id, func.attr, args, kwargs)
+    try:
+        hash(call)
+    except TypeError:  # mutable literals, such as lists, cannot be deduplicated
+        return None
+    return call
+
+
+def discover_file(path: str) -> List[Tuple[WatcherCall, str]]:
+    """Finds assertions called with literal arguments in a Python source file.
+
+    Only calls chained directly to the constructor (``AssertGitHubIssue("owner/repo").is_open(1)``)
+    are recognised. Files that cannot be read or parsed are skipped.
+
+    :return: Found calls with their ``path:line`` location.
+    """
+    try:
+        with open(path, "r", encoding="utf-8") as source_file:
+            source = source_file.read()
+        # parsing is much slower than reading, most files can be skipped without it
+        if _CLASS_NAME not in source:
+            return []
+        tree = ast.parse(source, filename=path)
+    except (OSError, UnicodeDecodeError, SyntaxError, ValueError):
+        return []
+
+    return [
+        (call, f"{path}:{node.lineno}")
+        for node in ast.walk(tree)
+        if isinstance(node, ast.Call)
+        for call in [_literal_call(node)]
+        if call is not None
+    ]
+
+
+def _python_files(paths: Iterable[str]) -> Iterator[str]:
+    for path in paths:
+        if os.path.isfile(path):
+            yield path
+            continue
+
+        for directory, subdirectories, file_names in os.walk(path):
+            subdirectories[:] = [
+                name for name in subdirectories if not name.startswith(".") and name not in _SKIPPED_DIRECTORIES
+            ]
+            yield from (os.path.join(directory, name) for name in file_names if name.endswith(".py"))
+
+
+def discover(paths: Iterable[str], workers: Optional[int] = None) -> Dict[WatcherCall, List[str]]:
+    """Finds unique assertions called with literal arguments in all Python files in given paths.
+
+    Files are parsed in parallel in a pool of processes.
+
+    :param paths: Python files or directories searched recursively. Hidden directories and
+        directories with installed packages are skipped.
+    :param workers: Number of processes. Defaults to the number of CPUs.
+    :return: Locations of each unique call.
+    """
+    calls: Dict[WatcherCall, List[str]] = {}
+    files = list(_python_files(paths))
+
+    with ProcessPoolExecutor(workers) as executor:
+        chunk_size = max(1, len(files) // ((workers or os.cpu_count() or 1) * 4))
+        for file_calls in executor.map(discover_file, files, chunksize=chunk_size):
+            for call, location in file_calls:
+                calls.setdefault(call, []).append(location)
+
+    return calls
+
+
+def check_call(call: WatcherCall, locations: Optional[List[str]] = None, max_age: Optional[float] = None) -> ScanResult:
+    """Runs a single assertion, reporting its outcome instead of raising.
+
+    :param call: Assertion to run.
+    :param locations: Places the assertion was found at, copied into the result.
+    :param max_age: Number of seconds after which cached values are fetched again, see
+        :py:class:`~issue_watcher.AssertGitHubIssue`.
+    """
+    locations = locations or []
+    try:
+        getattr(AssertGitHubIssue(call.repository_id, max_age=max_age), call.method)(*call.args, **dict(call.kwargs))
+    except AssertionError as exc:
+        return ScanResult(call, locations, "failed", str(exc))
+    except Exception as exc:  # pylint: disable=broad-except; reported as an error of the particular check
+        return ScanResult(call, locations, "error", f"{type(exc).__name__}: {exc}")
+
+    return ScanResult(call, locations, "passed")
+
+
+def check(calls: Dict[WatcherCall, List[str]], workers: int = 16) -> List[ScanResult]:
+    """Runs all given assertions concurrently, using the cache as tests would.
+
+    :param calls: Locations of each call as returned by :py:func:`discover`.
+    :param workers: Number of threads sending requests to GitHub.
+    """
+    with ThreadPoolExecutor(workers) as executor:
+        return list(executor.map(lambda item: check_call(*item), calls.items()))
+
+
+def to_json(results: Iterable[ScanResult]) -> str:
+    return dumps(
+        [
+            {
+                "call": str(result.call),
+                "repository_id": result.call.repository_id,
+                "method": result.call.method,
+                "args": list(result.call.args),
+                "kwargs": dict(result.call.kwargs),
+                "locations": result.locations,
+                "outcome": result.outcome,
+                "message": result.message,
+            }
+            for result in results
+        ],
+        indent=2,
+    )
+
+
+def to_junit(results: Iterable[ScanResult]) -> str:
+    results = list(results)
+    suite = ElementTree.Element(
+        "testsuite",
+        name="issue-watcher",
+        tests=str(len(results)),
+        failures=str(sum(result.outcome == "failed" for result in results)),
+        errors=str(sum(result.outcome == "error" for result in results)),
+    )
+
+    for result in results:
+        case = ElementTree.SubElement(
+            suite, "testcase", classname=result.call.repository_id, name=str(result.call), file=result.locations[0]
+        )
+        if result.outcome != "passed":
+            element = ElementTree.SubElement(case, "failure" if result.outcome == "failed" else "error")
+            element.set("message", result.message)
+            element.text = "\n".join([result.message, "Found at:"] + result.locations)
+
+    return ElementTree.tostring(suite, encoding="unicode")
@@ -0,0 +1,48 @@
+import threading
+from typing import Callable, Dict, Generic, Hashable, Optional, TypeVar
+
+_T = TypeVar("_T")
+
+
+class _Call(Generic[_T]):  # pylint: disable=too-few-public-methods
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Optional[_T] = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight(Generic[_T]):  # pylint: disable=too-few-public-methods
+    """Coalesces concurrent calls for the same key into a single call.
+
+    The first caller for a key runs the function, callers arriving while it is in flight
+    wait for it and share its result (or exception). Nothing is remembered once the call
+    finishes, subsequent calls run the function again.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call[_T]] = {}
+
+    def do(self, key: Hashable, func: Callable[[], _T]) -> _T:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if call is None:
+                call = self._calls[key] = _Call()
+
+        if leader:
+            try:
+                call.result = func()
+            except BaseException as exc:  # pylint: disable=broad-except; re-raised in all callers
+                call.error = exc
+            finally:
+                with self._lock:
+                    del self._calls[key]
+                call.done.set()
+        else:
+            call.done.wait()
+
+        if call.error is not None:
+            raise call.error
+
+        return call.result  # type: ignore[return-value]  # always set when no error was raised
@@ -1,76 +1,235 @@
+import gzip
+import math
 import os
 import os.path
+import random
+import re
 import time
-import warnings
-from collections import defaultdict
+import zlib
 from contextlib import contextmanager
 from tempfile import gettempdir
-from typing import DefaultDict, Dict, Iterator, Optional, Tuple, Union
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
-from ujson import dump, load
+from ujson import dumps, loads
 
+from issue_watcher.cache_backends import (
+    CacheBackend,
+    CacheEntry,
+    FileCacheBackend,
+    RedisCacheBackend,
+    SharedDirectoryCacheBackend,
+)
+from issue_watcher.cached_errors import ERRORS_KIND, RATE_LIMIT_ERRORS_KIND
+from issue_watcher.environment import expiry_from_environment, flag_from_environment, float_from_environment
+from issue_watcher.mapped_cache_backend import MappedFileCacheBackend
+
+
+def _timestamp(entry: CacheEntry) -> int:
+    try:
+        return int(entry[1])
+    except (TypeError, ValueError, IndexError):
+        return 0
+
+
+def _is_snapshot_entry(entry: Any) -> bool:
+    return isinstance(entry, list) and len(entry) >= 2 and isinstance(entry[1], int)
+
+
+class TemporaryCache:  # pylint: disable=too-many-instance-attributes
+    """Cache of values retrieved from GitHub, namespaced by project.
+
+    Each kind of key (the part before the first ``/``, for example ``issues`` in ``issues/123``)
+    can have its own expiry set by a ``CACHE_INVALIDATION_<KIND>_IN_SECONDS`` environment
+    variable, falling back to ``CACHE_INVALIDATION_IN_SECONDS`` or to a shorter default
+    for cached errors.
+
+    Entries are stored as ``(value, timestamp[, own expiry[, fetch duration]])``. The own
+    expiry overrides the configured one, for example when shortened by jitter. The fetch
+    duration is used for probabilistic early expiry (XFetch), spreading refreshes of values
+    which would otherwise expire at the same time.
+    """
 
-class TemporaryCache:
     _TEMP_FILE_NAME = os.path.join(gettempdir(), "issue-watcher-cache.json")
+    _TEMP_FILE_NAME_BINARY = os.path.join(gettempdir(), "issue-watcher-cache.bin")
     _ENV_VAR_EXPIRY = "CACHE_INVALIDATION_IN_SECONDS"
+    _ENV_VAR_EXPIRY_OF_KIND = "CACHE_INVALIDATION_{kind}_IN_SECONDS"
+    _ENV_VAR_EXPIRY_OF_KIND_PATTERN = re.compile(r"^CACHE_INVALIDATION_\w+_IN_SECONDS$")
+    _ENV_VAR_ADAPTIVE = "CACHE_ADAPTIVE_INVALIDATION"
+    _ENV_VAR_JITTER = "CACHE_INVALIDATION_JITTER"
+    _ENV_VAR_EARLY_REFRESH = "CACHE_EARLY_REFRESH"
+    _ENV_VAR_SAMPLING = "CACHE_SAMPLING_FRACTION"
+    _ENV_VAR_FILE = "CACHE_FILE_PATH"
+    _ENV_VAR_FILE_FORMAT = "CACHE_FILE_FORMAT"
+    _ENV_VAR_DIRECTORY = "CACHE_DIRECTORY"
+    _ENV_VAR_REDIS_URL = "CACHE_REDIS_URL"
     _DEFAULT_EXPIRY = 3600
+    _DEFAULT_EXPIRY_OF_KIND = {ERRORS_KIND: 300, RATE_LIMIT_ERRORS_KIND: 60}
+    _ADAPTIVE_EXPIRY_RATIO = 0.1
+    _ADAPTIVE_MAX_EXPIRY = 7 * 24 * 3600
+    _SNAPSHOT_FORMAT = "issue-watcher-cache-snapshot"
+    _SNAPSHOT_VERSION = 1
+    _GZIP_MAGIC = b"\x1f\x8b"
+    _SAMPLING_KEY = "sampling"
+    _SAMPLING_ROUND_SECONDS = 600
+    _ORPHANED_AFTER_SECONDS = 30 * 24 * 3600
 
-    def __init__(self, project_identifier: str):
-        self._project_identifier = project_identifier
+    def __init__(self, project_identifier: str, backend: Optional[CacheBackend] = None):
+        """Constructor.
 
-        try:
-            self._expire_in_seconds = int(os.environ.get(self._ENV_VAR_EXPIRY, self._DEFAULT_EXPIRY))
-            if self._expire_in_seconds < 0:
-                raise ValueError("Cache invalidation must be 0 or positive integer.")
-        except ValueError:
-            value = os.environ[self._ENV_VAR_EXPIRY]
-            warnings.warn(
-                "issue_watcher seems to be improperly configured. Expected "
-                f"'{self._ENV_VAR_EXPIRY}' environment variable to be 0 or "
-                f"positive integer. However, value of '{value}' was used "
-                f"instead and will be ignored. Using default value of "
-                f"'{self._DEFAULT_EXPIRY}'.",
-                RuntimeWarning,
-            )
+        :param project_identifier: Namespace of all keys in this cache. Case-insensitive, like
+            GitHub repository IDs.
+        :param backend: Storage of cached entries. Configured from environment variables
+            when not given, defaulting to a JSON file in the system temporary directory.
+        """
+        self._project_identifier = project_identifier.lower()
+        self._backend = backend or self._default_backend()
+        self._expire_in_seconds = expiry_from_environment(self._ENV_VAR_EXPIRY, self._DEFAULT_EXPIRY)
+        self._expire_in_seconds_of_kind: Dict[str, int] = {}
+        self._adaptive = flag_from_environment(self._ENV_VAR_ADAPTIVE)
+        self._jitter = float_from_environment(self._ENV_VAR_JITTER, maximum=1)
+        self._early_refresh = float_from_environment(self._ENV_VAR_EARLY_REFRESH)
+        self._sampling = float_from_environment(self._ENV_VAR_SAMPLING, maximum=1)
+        self._rounds: List[int] = []
+
+    @classmethod
+    def _default_backend(cls) -> CacheBackend:
+        if os.environ.get(cls._ENV_VAR_REDIS_URL):
+            return RedisCacheBackend(os.environ[cls._ENV_VAR_REDIS_URL])
+        if os.environ.get(cls._ENV_VAR_DIRECTORY):
+            return SharedDirectoryCacheBackend(os.environ[cls._ENV_VAR_DIRECTORY])
+        if os.environ.get(cls._ENV_VAR_FILE_FORMAT, "").lower() == "binary":
+            return MappedFileCacheBackend(os.environ.get(cls._ENV_VAR_FILE) or cls._TEMP_FILE_NAME_BINARY)
+        return FileCacheBackend(os.environ.get(cls._ENV_VAR_FILE) or cls._TEMP_FILE_NAME)
+
+    @property
+    def backend(self) -> CacheBackend:
+        return self._backend
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self._expire_in_seconds)
+
+    @property
+    def sampling(self) -> float:
+        """Fraction of cached entries refreshed in one run, or ``0`` when all expired entries are refreshed."""
+        return self._sampling
 
     @contextmanager
-    def _session(self, save: bool) -> Iterator[DefaultDict[str, Dict[Union[str, int], Tuple[str, int]]]]:
-        try:
-            with open(self._TEMP_FILE_NAME, "r", encoding="utf-8") as temp_file:
-                cache = load(temp_file)
-            if not isinstance(cache, dict):
-                raise ValueError("Cache must be a dict.")
-            cache = defaultdict(dict, cache)
-        except (FileNotFoundError, ValueError):
-            cache = defaultdict(dict)
+    def lock(self, key: Union[str, int]) -> Iterator[None]:
+        """Holds a lock for given key, shared by all processes using the same cache backend.
+
+        Processes sharing the cache (for example parallel CI jobs) can use it to make sure
+        only one of them fetches a missing value while the others wait for it to appear
+        in the cache. Does nothing when the cache is disabled.
+        """
+        if not self._expire_in_seconds:
+            yield
+            return
+
+        with self._backend.lock(self._project_identifier, str(key)):
+            yield
+
+    def expiry_of(self, key: Union[str, int]) -> int:
+        """Number of seconds values of given key stay valid, unless stored with own expiry."""
+        if not self._expire_in_seconds:
+            return 0
+
+        kind = str(key).split("/", 1)[0]
+        if kind not in self._expire_in_seconds_of_kind:
+            self._expire_in_seconds_of_kind[kind] = expiry_from_environment(
+                self._ENV_VAR_EXPIRY_OF_KIND.format(kind=kind.upper()),
+                min(self._DEFAULT_EXPIRY_OF_KIND.get(kind, self._expire_in_seconds), self._expire_in_seconds),
+            )
+        return self._expire_in_seconds_of_kind[kind]
+
+    def _longest_expiry(self) -> int:
+        expiries = [self._expire_in_seconds] + [
+            self.expiry_of(env_var[len("CACHE_INVALIDATION_") : -len("_IN_SECONDS")].lower())
+            for env_var in os.environ
+            if self._ENV_VAR_EXPIRY_OF_KIND_PATTERN.match(env_var)
+        ]
+        if self._adaptive:
+            expiries.append(self._ADAPTIVE_MAX_EXPIRY)
+        return max(expiries)
 
+    def _value_if_valid(self, key: str, entry: CacheEntry) -> str:
         try:
-            yield cache
-        finally:
-            if save:
-                with open(self._TEMP_FILE_NAME, "w", encoding="utf-8") as temp_file:
-                    dump(cache, temp_file)
+            value, timestamp, *extra = entry
+            timestamp = int(timestamp)
+            expire_in_seconds = int(extra[0]) if extra and extra[0] is not None else self.expiry_of(key)
+            fetch_duration = float(extra[1]) if len(extra) > 1 else 0.0
+        except (TypeError, ValueError) as exc:
+            raise KeyError() from exc
+
+        now = time.time()
+        if self._early_refresh and fetch_duration > 0:
+            # XFetch: the closer the expiry and the longer the fetch, the more likely an early refresh is
+            now -= fetch_duration * self._early_refresh * math.log(1 - random.random())
+
+        if timestamp < now - expire_in_seconds:
+            raise KeyError()
+
+        return value
+
+    def _entry(
+        self, key: str, value: str, timestamp: int, own_expiry: Optional[int] = None, fetch_duration: float = 0.0
+    ) -> CacheEntry:
+        if self._jitter:
+            # shortened only, so that values are never older than the configured expiry
+            own_expiry = int((own_expiry or self.expiry_of(key)) * (1 - random.uniform(0, self._jitter)))
+
+        if self._early_refresh and fetch_duration > 0:
+            return value, timestamp, own_expiry, round(fetch_duration, 3)
+        if own_expiry is not None:
+            return value, timestamp, own_expiry
+        return value, timestamp
+
+    def set(
+        self,
+        key: Union[str, int],
+        value: str,
+        last_activity: Optional[float] = None,
+        fetch_duration: Optional[float] = None,
+    ) -> None:
+        """Stores a value.
+
+        :param key: Key of the value. Its kind determines the expiry.
+        :param value: Value to store.
+        :param last_activity: UNIX timestamp of the last change of the cached resource. When
+            adaptive invalidation is turned on, values of resources inactive for a long time
+            stay valid longer than the configured expiry (up to a week).
+        :param fetch_duration: Number of seconds it took to fetch the value. When early refresh
+            is turned on, values which take longer to fetch are more likely to be refreshed
+            before they expire.
+        """
+        expire_in_seconds = self.expiry_of(key)
+        if not expire_in_seconds:
+            return
+
+        now = int(time.time())
+        own_expiry = None
+
+        if self._adaptive and last_activity is not None:
+            adaptive_expiry = min(int((now - last_activity) * self._ADAPTIVE_EXPIRY_RATIO), self._ADAPTIVE_MAX_EXPIRY)
+            if adaptive_expiry > expire_in_seconds:
+                own_expiry = adaptive_expiry
+
+        self._backend.set(
+            self._project_identifier, str(key), self._entry(str(key), value, now, own_expiry, fetch_duration or 0.0)
+        )
 
     def __setitem__(self, key: Union[str, int], value: str) -> None:
-        if self._expire_in_seconds:
-            with self._session(save=True) as cache:
-                cache[self._project_identifier][key] = (value, int(time.time()))
+        self.set(key, value)
 
     def __getitem__(self, key: Union[str, int]) -> str:
         if not self._expire_in_seconds:
             raise KeyError("Cache is disabled.")
 
-        with self._session(save=False) as cache:
-            try:
-                value, timestamp = cache[self._project_identifier][key]
-                timestamp = int(timestamp)
-            except ValueError as exc:
-                raise KeyError() from exc
-
-        if timestamp < time.time() - self._expire_in_seconds:
-            raise KeyError()
+        entry = self._backend.get(self._project_identifier, str(key))
+        if entry is None:
+            raise KeyError(key)
 
-        return value
+        return self._value_if_valid(str(key), entry)
 
     def get(self, key: Union[str, int], default: Optional[str] = None) -> Optional[str]:
         try:
@@ -78,6 +237,245 @@ class TemporaryCache:
         except KeyError:
             return default
 
+    def get_many(self, keys: Iterable[Union[str, int]]) -> Dict[str, str]:
+        """Returns valid values of given keys with a single backend lookup. Missing keys are left out."""
+        if not self._expire_in_seconds:
+            return {}
+
+        values = {}
+        for key, entry in self._backend.get_many(self._project_identifier, [str(key) for key in keys]).items():
+            try:
+                values[key] = self._value_if_valid(key, entry)
+            except KeyError:
+                pass
+        return values
+
+    def peek_many(self, keys: Iterable[Union[str, int]]) -> Dict[str, Tuple[str, int]]:
+        """Returns values of given keys with the timestamp they were stored at, including expired ones."""
+        if not self._expire_in_seconds:
+            return {}
+
+        entries = {}
+        for key, entry in self._backend.get_many(self._project_identifier, [str(key) for key in keys]).items():
+            try:
+                entries[key] = (entry[0], int(entry[1]))
+            except (TypeError, ValueError, IndexError):
+                pass
+        return entries
+
+    def peek(self, key: Union[str, int]) -> Optional[Tuple[str, int]]:
+        return self.peek_many([key]).get(str(key))
+
+    def stale(self, kind: str) -> Dict[str, Tuple[str, int]]:
+        """Returns expired entries of given kind of keys, with the timestamp they were stored at."""
+        if not self._expire_in_seconds:
+            return {}
+
+        stale_entries = {}
+        for key, entry in self._backend.get_all(self._project_identifier).items():
+            if key.split("/", 1)[0] != kind:
+                continue
+            try:
+                self._value_if_valid(key, entry)
+            except KeyError:
+                try:
+                    stale_entries[key] = (entry[0], int(entry[1]))
+                except (TypeError, ValueError, IndexError):
+                    pass
+        return stale_entries
+
+    def _expired_at(self, key: str, entry: CacheEntry) -> Optional[int]:
+        try:
+            _, timestamp, *extra = entry
+            return int(timestamp) + (int(extra[0]) if extra and extra[0] is not None else self.expiry_of(key))
+        except (TypeError, ValueError):
+            return None
+
+    def _sampling_rounds(self, count: int) -> List[int]:
+        """Returns start times of the last sampling rounds, starting a new round when the last one is over.
+
+        Rounds are stored in the cache, so that all processes sharing it agree on them. Orphaned
+        entries are removed at the start of each round.
+        """
+        now = int(time.time())
+        if self._rounds and self._rounds[-1] > now - self._SAMPLING_ROUND_SECONDS:
+            return self._rounds
+
+        with self._backend.lock(self._project_identifier, self._SAMPLING_KEY):
+            entry = self._backend.get(self._project_identifier, self._SAMPLING_KEY)
+            try:
+                rounds = [int(started_at) for started_at in loads(entry[0])] if entry else []
+            except (TypeError, ValueError, IndexError):
+                rounds = []
+
+            if not rounds or rounds[-1] <= now - self._SAMPLING_ROUND_SECONDS:
+                rounds = (rounds + [now])[-count:]
+                self._backend.set(self._project_identifier, self._SAMPLING_KEY, (dumps(rounds), now))
+                self._expire_orphaned()
+
+        self._rounds = rounds
+        return rounds
+
+    def sampled(self, key: Union[str, int]) -> bool:
+        """Tells if an expired entry should be refreshed now when sampling is turned on.
+
+        Keys are spread by their hash into ``1 / fraction`` buckets and an entry is refreshed
+        once it has been expired for as many whole sampling rounds as the number of its bucket.
+        A round lasts at least 10 minutes, so a test session is usually a single round. Other
+        expired entries are still used as if valid. Each round therefore refreshes about the
+        sampling fraction of the entries which expired, and every requested entry is refreshed
+        within ``1 / fraction`` rounds after it expires. Entries nobody requests anymore do not
+        hold back the others.
+
+        :param key: Key of an expired entry.
+        """
+        buckets = math.ceil(1 / self._sampling)
+        bucket = zlib.crc32(str(key).encode("utf-8")) % buckets
+        if not bucket:
+            return True
+
+        entry = self._backend.get(self._project_identifier, str(key))
+        expired_at = None if entry is None else self._expired_at(str(key), entry)
+        if expired_at is None:
+            return True
+
+        previous_rounds = self._sampling_rounds(buckets)[:-1]
+        return sum(started_at > expired_at for started_at in previous_rounds) >= bucket
+
+    def set_many(self, values: Dict[str, str], timestamp: Optional[int] = None) -> None:
+        """Stores many values at once.
+
+        :param values: Values by their keys.
+        :param timestamp: UNIX timestamp the values are considered fresh from. Defaults to now.
+        """
+        timestamp = int(time.time()) if timestamp is None else timestamp
+        self._backend.set_many(
+            self._project_identifier,
+            {key: self._entry(key, value, timestamp) for key, value in values.items() if self.expiry_of(key)},
+        )
+
+    def __delitem__(self, key: Union[str, int]) -> None:
+        self._backend.delete(self._project_identifier, str(key))
+
+    def invalidate(self) -> None:
+        """Removes all entries of this project."""
+        self._backend.expire(self._project_identifier, int(time.time()) + 1)
+
+    def expire(self) -> None:
+        """Removes entries of this project older than the longest configured expiry from the backend."""
+        self._backend.expire(self._project_identifier, int(time.time()) - self._longest_expiry())
+
+    def _expire_orphaned(self) -> None:
+        """Removes entries of this project not refreshed for a month after they expired.
+
+        Expired entries are otherwise kept, to be refreshed in bulk or used when GitHub cannot
+        be reached, but entries nobody requests anymore would stay forever.
+        """
+        self._backend.expire(
+            self._project_identifier, int(time.time()) - self._longest_expiry() - self._ORPHANED_AFTER_SECONDS
+        )
+
     def clear(self) -> None:
-        with self._session(save=True) as cache:
-            cache.clear()
+        self._backend.clear()
+
+    @classmethod
+    def entries(
+        cls, namespaces: Optional[Iterable[str]] = None, backend: Optional[CacheBackend] = None
+    ) -> Dict[str, Dict[str, CacheEntry]]:
+        """Returns raw cache entries, including expired ones, for :py:meth:`merge` into another cache.
+
+        :param namespaces: Projects to return entries of. Defaults to all cached projects.
+        :param backend: Cache to read. Configured from environment variables when not given.
+        """
+        backend = backend or cls._default_backend()
+        return {namespace: backend.get_all(namespace) for namespace in namespaces or backend.namespaces()}
+
+    @classmethod
+    def merge(cls, entries: Dict[str, Dict[str, CacheEntry]], backend: Optional[CacheBackend] = None) -> int:
+        """Merges raw cache entries into the cache, keeping whichever entry of a key is newer.
+
+        :param entries: Entries as returned by :py:meth:`entries`.
+        :param backend: Cache to merge into. Configured from environment variables when not given.
+        :return: Number of merged entries.
+        """
+        backend = backend or cls._default_backend()
+        merged = 0
+
+        for namespace, namespace_entries in entries.items():
+            current_entries = backend.get_many(namespace, namespace_entries)
+            newer_entries = {
+                key: tuple(entry)
+                for key, entry in namespace_entries.items()
+                if key not in current_entries or _timestamp(entry) > _timestamp(current_entries[key])
+            }
+            backend.set_many(namespace, newer_entries)
+            merged += len(newer_entries)
+
+        return merged
+
+    @classmethod
+    def export_snapshot(cls, path: str, compress: Optional[bool] = None, backend: Optional[CacheBackend] = None) -> int:
+        """Writes all cached entries of all projects into a snapshot file.
+
+        Meant for warm-starting ephemeral CI runners: save the snapshot as a build artifact
+        and import it at the start of the next job.
+
+        :param path: Snapshot file to write.
+        :param compress: Compress the snapshot with gzip. Defaults to compressing when the
+            path ends with ``.gz``.
+        :param backend: Cache to export. Configured from environment variables when not given.
+        :return: Number of exported entries.
+        """
+        entries = cls.entries(backend=backend)
+        content = dumps(
+            {
+                "format": cls._SNAPSHOT_FORMAT,
+                "version": cls._SNAPSHOT_VERSION,
+                "created_at": int(time.time()),
+                "entries": {
+                    namespace: {key: list(entry) for key, entry in items.items()}
+                    for namespace, items in entries.items()
+                },
+            }
+        ).encode("utf-8")
+
+        if path.endswith(".gz") if compress is None else compress:
+            content = gzip.compress(content)
+
+        with open(path, "wb") as snapshot_file:
+            snapshot_file.write(content)
+
+        return sum(len(items) for items in entries.values())
+
+    @classmethod
+    def import_snapshot(cls, path: str, backend: Optional[CacheBackend] = None) -> int:
+        """Merges entries from a snapshot file into the cache.
+
+        Entries are imported only if they are newer than entries already cached, so snapshots
+        of parallel jobs can be imported in any order. Compressed snapshots are recognised
+        automatically.
+
+        :param path: Snapshot file written by :py:meth:`export_snapshot`.
+        :param backend: Cache to import into. Configured from environment variables when not given.
+        :raises ValueError: When the file is not a snapshot of a supported version or its entries
+            are malformed.
+        :return: Number of imported entries.
+        """
+        with open(path, "rb") as snapshot_file:
+            content = snapshot_file.read()
+
+        if content.startswith(cls._GZIP_MAGIC):
+            content = gzip.decompress(content)
+
+        try:
+            snapshot = loads(content)
+            if snapshot["format"] != cls._SNAPSHOT_FORMAT or snapshot["version"] != cls._SNAPSHOT_VERSION:
+                raise ValueError()
+            snapshot_entries: Dict[str, Dict[str, CacheEntry]] = snapshot["entries"]
+            for namespace_entries in snapshot_entries.values():
+                if not all(_is_snapshot_entry(entry) for entry in namespace_entries.values()):
+                    raise ValueError()
+        except (ValueError, KeyError, TypeError, AttributeError) as exc:
+            raise ValueError(f"'{path}' is not a cache snapshot of version {cls._SNAPSHOT_VERSION}.") from exc
+
+        return cls.merge(snapshot_entries, backend)
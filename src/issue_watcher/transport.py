@@ -0,0 +1,98 @@
+import threading
+import warnings
+from typing import Any, Dict, Optional, Tuple
+
+from requests import ConnectionError as RequestsConnectionError
+from requests import Response, Timeout
+from requests.structures import CaseInsensitiveDict
+
+from issue_watcher.constants import DEFAULT_REQUESTS_TIMEOUT_SEC
+
+try:
+    import httpx
+except ImportError:  # optional dependency, installed with the 'http2' extra
+    httpx = None  # type: ignore[assignment]
+
+
+class Http2Transport:
+    """Sends GET requests multiplexed over a single HTTP/2 connection per host.
+
+    Concurrent requests from any number of threads share the connection instead of opening
+    one connection each. Responses are converted to :py:class:`requests.Response`, so that
+    they can be handled the same way as responses of the default HTTP/1.1 transport.
+
+    Requires ``httpx`` with HTTP/2 support, installed by the ``http2`` extra of this package
+    on Python 3.10 or newer.
+    """
+
+    def __init__(self, http1_fallback: bool = True):
+        """Constructor.
+
+        :param http1_fallback: Allow HTTP/1.1 when the server does not offer HTTP/2. Without
+            it, HTTP/2 is used with prior knowledge, also for unencrypted connections.
+        :raises ImportError: When ``httpx`` is not installed.
+        """
+        if httpx is None:
+            raise ImportError(
+                "HTTP/2 transport requires 'httpx[http2]'. Install 'issue-watcher[http2]' on Python 3.10 or newer."
+            )
+
+        self._client = httpx.Client(http1=http1_fallback, http2=True, timeout=DEFAULT_REQUESTS_TIMEOUT_SEC)
+
+    def get(
+        self,
+        url: str,
+        auth: Optional[Tuple[str, str]] = None,
+        timeout: float = DEFAULT_REQUESTS_TIMEOUT_SEC,
+        headers: Optional[Dict[str, str]] = None,
+        stream: bool = False,  # pylint: disable=unused-argument; the body is always read right away
+    ) -> Response:
+        """Same as :py:func:`requests.get` with the arguments used by this package.
+
+        :raises requests.Timeout: When the server does not respond in time.
+        :raises requests.ConnectionError: When the server cannot be reached.
+        """
+        extra_kwargs: Dict[str, Any] = {"auth": auth} if auth else {}
+        try:
+            http2_response = self._client.get(url, headers=headers, timeout=timeout, **extra_kwargs)
+        except httpx.TimeoutException as exc:
+            raise Timeout(str(exc)) from exc
+        except httpx.TransportError as exc:
+            raise RequestsConnectionError(str(exc)) from exc
+
+        response = Response()
+        response.status_code = http2_response.status_code
+        response.reason = http2_response.reason_phrase
+        response.headers = CaseInsensitiveDict(http2_response.headers.items())
+        response.url = str(http2_response.url)
+        response.encoding = http2_response.encoding
+        response._content = http2_response.content  # pylint: disable=protected-access; no public setter
+        # iter_content reads the content instead of the raw stream once it is consumed
+        response._content_consumed = True  # type: ignore[attr-defined]  # pylint: disable=protected-access
+        return response
+
+    def close(self) -> None:
+        self._client.close()
+
+
+_SHARED_HTTP2_TRANSPORT: Optional[Http2Transport] = None
+_SHARED_HTTP2_TRANSPORT_LOCK = threading.Lock()
+
+
+def shared_http2_transport() -> Optional[Http2Transport]:
+    """Returns HTTP/2 transport shared within the process, so that all requests use one connection.
+
+    Warns and returns ``None`` when ``httpx`` is not installed.
+    """
+    global _SHARED_HTTP2_TRANSPORT  # pylint: disable=global-statement
+
+    with _SHARED_HTTP2_TRANSPORT_LOCK:
+        if _SHARED_HTTP2_TRANSPORT is None:
+            try:
+                _SHARED_HTTP2_TRANSPORT = Http2Transport()
+            except ImportError as exc:
+                warnings.warn(
+                    f"issue_watcher seems to be improperly configured. {exc} Using HTTP/1.1 instead.",
+                    RuntimeWarning,
+                )
+        return _SHARED_HTTP2_TRANSPORT
@@ -0,0 +1,34 @@
+import re
+from functools import lru_cache
+from typing import Iterable, List, Optional, Pattern
+
+from packaging.version import InvalidVersion, Version
+
+
+def parse_version_number(string: str, pattern: Pattern[str]) -> Optional[Version]:
+    match = pattern.match(string.replace("refs/tags/", ""))
+    if not match:
+        return None
+    try:
+        return Version(match.group("version"))
+    except InvalidVersion:
+        return None
+
+
+@lru_cache(maxsize=128)
+def _compiled(pattern: str) -> Pattern[str]:
+    return re.compile(pattern)
+
+
+def ordered_version_numbers(refs: Iterable[str], pattern: str) -> List[Version]:
+    """Returns version numbers parsed out of git tag refs, the latest first.
+
+    :param refs: Git refs, such as ``refs/tags/1.0.0``.
+    :param pattern: Regular expression with a ``version`` group. Tags not matching it or not
+        containing a valid version number are ignored.
+    """
+    version_pattern = _compiled(pattern)
+    return sorted(
+        (version for version in (parse_version_number(ref, version_pattern) for ref in refs) if version is not None),
+        reverse=True,
+    )
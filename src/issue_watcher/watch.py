@@ -0,0 +1,199 @@
+"""Continuous watching of issues and releases, notifying about changes of assertion outcomes."""
+
+import heapq
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+import requests
+from ujson import dumps, loads
+
+from issue_watcher import scan
+from issue_watcher.constants import DEFAULT_REQUESTS_TIMEOUT_SEC
+from issue_watcher.scan import ScanResult, WatcherCall
+
+_METHODS = ("is_open", "is_closed", "fixed_in", "current_release")
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class WatchItem(NamedTuple):
+    call: WatcherCall
+    message: str
+    interval: float
+    """Number of seconds between checks."""
+
+
+class Transition(NamedTuple):
+    """Change of the outcome of a watched assertion."""
+
+    item: WatchItem
+    previous: Optional[str]
+    """Previous outcome, ``None`` for the first check."""
+    outcome: str
+    """One of ``passed``, ``failed`` or ``error``, as in :py:class:`~issue_watcher.scan.ScanResult`."""
+    detail: str
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "call": str(self.item.call),
+            "repository_id": self.item.call.repository_id,
+            "method": self.item.call.method,
+            "message": self.item.message,
+            "previous": self.previous,
+            "outcome": self.outcome,
+            "detail": self.detail,
+            "at": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+        }
+
+
+def _watch_item(entry: Any, default_interval: float) -> WatchItem:
+    methods = [method for method in _METHODS if method in entry]
+    if len(methods) != 1 or not isinstance(entry.get("repository"), str):
+        raise ValueError(f"Expected 'repository' and one of {', '.join(_METHODS)} but got {entry}.")
+
+    method = methods[0]
+    kwargs = (("pattern", entry["pattern"]),) if method == "fixed_in" and "pattern" in entry else ()
+    return WatchItem(
+        WatcherCall(entry["repository"], method, (entry[method],), kwargs),
+        str(entry.get("message", "")),
+        float(entry.get("interval", default_interval)),
+    )
+
+
+def load_watchlist(path: str, default_interval: float = 3600) -> List[WatchItem]:
+    """Reads watched assertions from a JSON file.
+
+    The file contains a list of objects with the ``repository`` ID and one of ``is_open``,
+    ``is_closed`` (issue number), ``fixed_in`` (version, with an optional ``pattern``) or
+    ``current_release`` (number of releases). Optional ``message`` is included in notifications
+    and ``interval`` overrides the number of seconds between checks.
+
+    :raises ValueError: When the file is not a list of valid watched assertions.
+    """
+    with open(path, "r", encoding="utf-8") as watchlist_file:
+        try:
+            entries = loads(watchlist_file.read())
+        except ValueError as exc:
+            raise ValueError(f"Watchlist '{path}' is not a valid JSON file.") from exc
+
+    if not isinstance(entries, list):
+        raise ValueError(f"Watchlist '{path}' must contain a list of watched assertions.")
+
+    try:
+        return [_watch_item(entry, default_interval) for entry in entries]
+    except (AttributeError, TypeError) as exc:
+        raise ValueError(f"Watchlist '{path}' must contain a list of objects.") from exc
+
+
+def print_transition(transition: Transition) -> None:
+    print(dumps(transition.to_dict()), flush=True)
+
+
+def post_transition(url: str) -> Callable[[Transition], None]:
+    """Returns a notifier sending transitions as JSON to given URL."""
+
+    def _post(transition: Transition) -> None:
+        try:
+            requests.post(url, json=transition.to_dict(), timeout=DEFAULT_REQUESTS_TIMEOUT_SEC).raise_for_status()
+        except requests.RequestException as exc:
+            _LOGGER.error("Notification of '%s' failed: %s", transition.item.call, exc)
+
+    return _post
+
+
+class Watcher:  # pylint: disable=too-many-instance-attributes
+    """Checks watched assertions repeatedly and notifies about changes of their outcomes.
+
+    Checks are kept in a heap ordered by the time they are due, run on a bounded pool of
+    threads and started at a steady pace, so any number of watched assertions costs the
+    same number of checks per second. Checks go through the cache as in tests, but cached
+    values older than the interval of the checked item are fetched again, so that a change
+    is noticed within the interval even when the cache invalidation is longer.
+    """
+
+    def __init__(
+        self,
+        items: List[WatchItem],
+        notify: Callable[[Transition], None],
+        workers: int = 16,
+        rate: float = 5.0,
+        check: Optional[Callable[[WatcherCall], ScanResult]] = None,
+    ):
+        """Constructor.
+
+        :param items: Watched assertions.
+        :param notify: Called with each change of an outcome, including failing first checks.
+        :param workers: Maximum number of concurrent checks.
+        :param rate: Maximum number of checks started per second.
+        :param check: Runs a single assertion. Defaults to :py:func:`~issue_watcher.scan.check_call`
+            with the interval of the item as the maximum age of cached values.
+        :raises ValueError: When there is nothing to watch or the rate is not positive.
+        """
+        if not items:
+            raise ValueError("There is nothing to watch.")
+        if rate <= 0:
+            raise ValueError("The rate of checks must be positive.")
+
+        self._items = items
+        self._notify = notify
+        self._workers = workers
+        self._spacing = 1 / rate
+        self._check = check
+        self._condition = threading.Condition()
+        self._due: List[Tuple[float, int]] = []
+        self._outcomes: Dict[int, str] = {}
+        self._stopped = False
+
+    def stop(self) -> None:
+        with self._condition:
+            self._stopped = True
+            self._condition.notify_all()
+
+    def _run_check(self, index: int) -> None:
+        item = self._items[index]
+        try:
+            result = self._check(item.call) if self._check else scan.check_call(item.call, max_age=item.interval)
+            previous = self._outcomes.get(index)
+            self._outcomes[index] = result.outcome
+            if result.outcome != previous and (previous is not None or result.outcome != "passed"):
+                self._notify(Transition(item, previous, result.outcome, result.message))
+        except Exception:  # pylint: disable=broad-except; the watcher must keep running
+            _LOGGER.exception("Check of '%s' failed", item.call)
+        finally:
+            with self._condition:
+                heapq.heappush(self._due, (time.monotonic() + item.interval, index))
+                self._condition.notify_all()
+
+    def _next_due(self, not_before: float) -> Optional[int]:
+        """Waits until the next check is due and returns its index, or ``None`` when stopped."""
+        with self._condition:
+            while not self._stopped:
+                now = time.monotonic()
+                start_at = max(self._due[0][0], not_before) if self._due else None
+                if start_at is not None and start_at <= now:
+                    return heapq.heappop(self._due)[1]
+                self._condition.wait(None if start_at is None else start_at - now)
+        return None
+
+    def run(self) -> None:
+        """Checks watched assertions until :py:meth:`stop` is called."""
+        started_at = time.monotonic()
+        with self._condition:
+            # spread first checks too, sorted list is a valid heap
+            self._due = [(started_at + index * self._spacing, index) for index in range(len(self._items))]
+
+        free_workers = threading.Semaphore(self._workers)
+        not_before = started_at
+
+        with ThreadPoolExecutor(self._workers) as executor:
+            while True:
+                index = self._next_due(not_before)
+                if index is None:
+                    return
+                free_workers.acquire()  # pylint: disable=consider-using-with; released by the finished check
+                not_before = time.monotonic() + self._spacing
+                executor.submit(self._run_check, index).add_done_callback(lambda _: free_workers.release())
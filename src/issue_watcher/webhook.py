@@ -0,0 +1,117 @@
+import hashlib
+import hmac
+import logging
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from ujson import loads
+
+from issue_watcher.cache_backends import CacheBackend
+from issue_watcher.temporary_cache import TemporaryCache
+
+_LOGGER = logging.getLogger(__name__)
+_TAG_KEYS = ("release_count", "latest_version")
+_REMOVED_ISSUE_ACTIONS = {"deleted", "transferred"}
+
+
+def verify_signature(secret: str, body: bytes, signature: Optional[str]) -> bool:
+    """Checks the ``X-Hub-Signature-256`` header of a webhook delivery.
+
+    See https://docs.github.com/en/webhooks/using-webhooks/validating-webhook-deliveries
+    """
+    if not signature or not signature.startswith("sha256="):
+        return False
+
+    expected = hmac.new(secret.encode("utf-8"), body, hashlib.sha256).hexdigest()
+    return hmac.compare_digest(expected, signature[len("sha256=") :])
+
+
+def apply_webhook(event: str, payload: Dict[str, Any], cache_backend: Optional[CacheBackend] = None) -> List[str]:
+    """Updates or invalidates cached values changed by a webhook event.
+
+    Issue states are updated from ``issues`` events, except for deleted and transferred issues,
+    which are removed from the cache. Cached releases are invalidated by ``release`` events and
+    by ``create`` and ``delete`` events of tags. Other events are ignored.
+
+    :param event: Name of the event from the ``X-GitHub-Event`` header.
+    :param payload: Parsed body of the webhook delivery.
+    :param cache_backend: Cache to update. Configured from environment variables when not given.
+    :raises ValueError: When the payload is not an object or an issue in it is malformed.
+    :return: Cache keys that were changed.
+    """
+    if not isinstance(payload, dict):
+        raise ValueError("Webhook payload must be an object.")
+
+    try:
+        repository_id = payload["repository"]["full_name"]
+    except (KeyError, TypeError):
+        return []
+
+    cache = TemporaryCache(repository_id, cache_backend)
+
+    if event == "issues":
+        issue = payload.get("issue")
+        if not isinstance(issue, dict) or not isinstance(issue.get("number"), int):
+            raise ValueError("Webhook payload of an 'issues' event must contain an issue with a number.")
+
+        key = f"issues/{issue['number']}"
+        if payload.get("action") in _REMOVED_ISSUE_ACTIONS:
+            del cache[key]
+        elif isinstance(issue.get("state"), str):
+            cache[key] = issue["state"]
+        else:
+            raise ValueError(f"Webhook payload of issue #{issue['number']} must contain its state.")
+        return [key]
+
+    if event == "release" or (event in {"create", "delete"} and payload.get("ref_type") == "tag"):
+        for key in _TAG_KEYS:
+            del cache[key]
+        return list(_TAG_KEYS)
+
+    return []
+
+
+class _WebhookHandler(BaseHTTPRequestHandler):
+    server: "WebhookServer"
+
+    def _respond(self, status: HTTPStatus) -> None:
+        self.send_response(status)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def do_POST(self) -> None:  # pylint: disable=invalid-name; name required by BaseHTTPRequestHandler
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+
+        if not verify_signature(self.server.secret, body, self.headers.get("X-Hub-Signature-256")):
+            self._respond(HTTPStatus.UNAUTHORIZED)
+            return
+
+        try:
+            changed_keys = self.server.apply(self.headers.get("X-GitHub-Event", ""), loads(body))
+        except ValueError as exc:
+            _LOGGER.warning("Refused malformed %s event: %s", self.headers.get("X-GitHub-Event"), exc)
+            self._respond(HTTPStatus.BAD_REQUEST)
+            return
+
+        _LOGGER.info("%s event changed %s", self.headers.get("X-GitHub-Event"), changed_keys or "nothing")
+        self._respond(HTTPStatus.NO_CONTENT)
+
+    def log_message(self, format: str, *args: Any) -> None:  # pylint: disable=redefined-builtin
+        _LOGGER.debug(format, *args)
+
+
+class WebhookServer(ThreadingHTTPServer):
+    """HTTP server receiving GitHub webhooks and keeping the cache up to date."""
+
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], secret: str, cache_backend: Optional[CacheBackend] = None):
+        if not secret:
+            raise ValueError("Webhook secret must not be empty.")
+
+        super().__init__(address, _WebhookHandler)
+        self.secret = secret
+        self.apply: Callable[[str, Dict[str, Any]], List[str]] = lambda event, payload: apply_webhook(
+            event, payload, cache_backend
+        )
@@ -0,0 +1,58 @@
+"""Compares the JSON cache file with the memory-mapped binary cache file at growing sizes.
+
+Run with ``pytest tests/benchmarks -s`` to see the timings.
+"""
+
+import os
+import random
+import time
+from typing import Callable
+
+import pytest
+
+from issue_watcher.cache_backends import CacheBackend, FileCacheBackend
+from issue_watcher.mapped_cache_backend import MappedFileCacheBackend
+
+_NAMESPACE = "owner/repo"
+_LOOKUPS = 20
+
+
+def _duration(action: Callable[[], object]) -> float:
+    started_at = time.perf_counter()
+    action()
+    return time.perf_counter() - started_at
+
+
+def _measure(backend: CacheBackend, path: str, entries: int):
+    values = {f"issues/{number}": ("open", 1_600_000_000 + number) for number in range(entries)}
+    keys = random.Random(entries).sample(sorted(values), _LOOKUPS)
+
+    def _update() -> None:
+        for key in keys:
+            backend.set(_NAMESPACE, key, ("closed", 1_700_000_000))
+
+    write_duration = _duration(lambda: backend.set_many(_NAMESPACE, values))
+    lookup_duration = _duration(lambda: [backend.get(_NAMESPACE, key) for key in keys]) / _LOOKUPS
+    update_duration = _duration(_update) / _LOOKUPS
+    return write_duration, lookup_duration, update_duration, os.path.getsize(path)
+
+
+@pytest.mark.parametrize("entries", [1_000, 10_000, 100_000])
+def test_mapped_file_looks_up_single_keys_faster_than_json_file(tmp_path, entries: int):
+    json_path, mapped_path = str(tmp_path / "cache.json"), str(tmp_path / "cache.bin")
+    json_results = _measure(FileCacheBackend(json_path), json_path, entries)
+    mapped_results = _measure(MappedFileCacheBackend(mapped_path), mapped_path, entries)
+
+    print(f"\n{entries} entries      bulk write   lookup     update     file size")
+    for name, (write_duration, lookup_duration, update_duration, size) in (
+        ("JSON file:   ", json_results),
+        ("mapped file: ", mapped_results),
+    ):
+        print(
+            f"  {name}  {write_duration * 1000:7.1f} ms  {lookup_duration * 1000:7.3f} ms"
+            f"  {update_duration * 1000:7.2f} ms  {size / 1e6:6.2f} MB"
+        )
+
+    assert mapped_results[1] < json_results[1]
+    assert mapped_results[2] < json_results[2]
+    assert mapped_results[3] < 2 * json_results[3]
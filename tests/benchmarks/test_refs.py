@@ -0,0 +1,85 @@
+"""Compares peak memory of parsing tag refs out of the whole response and of streaming it, and
+the REST API listing of tags with the git ref advertisement.
+
+Run with ``pytest tests/benchmarks -s`` to see the results.
+"""
+
+import json
+import tracemalloc
+from time import perf_counter
+from typing import Callable, Iterator, List
+
+from issue_watcher.refs import iter_advertised_tags, iter_refs
+from tests.helpers.git_stand_in import ref_advertisement
+
+_TAGS = 50_000
+_CHUNK_SIZE = 64 * 1024
+
+
+def _body() -> bytes:
+    return json.dumps(
+        [
+            {
+                "ref": f"refs/tags/{number}.0.0",
+                "node_id": "MDM6UmVmcmVmcy90YWdzLzEuMC4w",
+                "url": f"https://api.github.com/repos/owner/repo/git/refs/tags/{number}.0.0",
+                "object": {
+                    "sha": f"{number:040d}",
+                    "type": "commit",
+                    "url": f"https://api.github.com/repos/owner/repo/git/commits/{number:040d}",
+                },
+            }
+            for number in range(_TAGS)
+        ]
+    ).encode("utf-8")
+
+
+def _chunks(body: bytes) -> Iterator[bytes]:
+    return (body[start : start + _CHUNK_SIZE] for start in range(0, len(body), _CHUNK_SIZE))
+
+
+def _peak_memory(parse: Callable[[], List[str]]) -> int:
+    tracemalloc.start()
+    try:
+        assert len(parse()) == _TAGS
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def test_streaming_refs_takes_less_memory_than_parsing_whole_response():
+    body = _body()
+
+    # the body itself is not counted, it is allocated before tracing starts
+    whole_peak = _peak_memory(lambda: [item["ref"] for item in json.loads(body)])
+    streamed_peak = _peak_memory(lambda: list(iter_refs(_chunks(body))))
+    refs_only_peak = _peak_memory(lambda: [f"refs/tags/{number}.0.0" for number in range(_TAGS)])
+
+    print(
+        f"\nPeak memory parsing {_TAGS} tag refs ({len(body) / 1e6:.1f} MB):"
+        f"\n  whole response:  {whole_peak / 1e6:.1f} MB"
+        f"\n  streamed:        {streamed_peak / 1e6:.1f} MB"
+        f"\n  refs themselves: {refs_only_peak / 1e6:.1f} MB"
+    )
+    assert streamed_peak * 3 < whole_peak
+
+
+def _parse_time(parse: Callable[[], List[str]]) -> float:
+    started_at = perf_counter()
+    assert len(parse()) == _TAGS
+    return perf_counter() - started_at
+
+
+def test_ref_advertisement_is_smaller_than_rest_api_listing():
+    body = _body()
+    advertisement = ref_advertisement([f"{number}.0.0" for number in range(_TAGS)], annotated=True)
+
+    rest_time = _parse_time(lambda: list(iter_refs(_chunks(body))))
+    git_time = _parse_time(lambda: list(iter_advertised_tags(_chunks(advertisement))))
+
+    print(
+        f"\nResponse with {_TAGS} annotated tags:"
+        f"\n  REST API:           {len(body) / 1e6:.1f} MB, parsed in {rest_time * 1e3:.0f} ms"
+        f"\n  ref advertisement:  {len(advertisement) / 1e6:.1f} MB, parsed in {git_time * 1e3:.0f} ms"
+    )
+    assert len(advertisement) * 2 < len(body)
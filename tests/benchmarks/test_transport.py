@@ -0,0 +1,52 @@
+"""Compares the default HTTP/1.1 transport with the HTTP/2 transport at many concurrent checks.
+
+Run with ``pytest tests/benchmarks -s`` to see the timings.
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+import pytest
+
+from issue_watcher import AssertGitHubIssue
+from issue_watcher.transport import Http2Transport
+from tests.helpers.h2_stand_in import H2StandIn, Http1StandIn, running
+
+pytest.importorskip("httpx")
+pytest.importorskip("h2")
+
+_CHECKS = 128
+_LATENCY = 0.05
+_BODY = b'{"state": "open"}'
+
+
+def _check_concurrently() -> float:
+    started_at = time.perf_counter()
+    with ThreadPoolExecutor(_CHECKS) as executor:
+        for future in [
+            executor.submit(AssertGitHubIssue("owner/repo").is_open, number) for number in range(1, _CHECKS + 1)
+        ]:
+            future.result()
+    return time.perf_counter() - started_at
+
+
+def test_http2_uses_one_connection_for_concurrent_checks():
+    http1_server, http2_server = Http1StandIn(_BODY, _LATENCY), H2StandIn(_BODY, _LATENCY)
+
+    with patch.dict("os.environ", {"CACHE_INVALIDATION_IN_SECONDS": "0"}):
+        with running(http1_server), patch.object(AssertGitHubIssue, "_URL_API", http1_server.url):
+            http1_duration = _check_concurrently()
+
+        with running(http2_server), patch.object(AssertGitHubIssue, "_URL_API", http2_server.url), patch.dict(
+            "os.environ", {"GITHUB_HTTP2": "1"}
+        ), patch("issue_watcher.transport._SHARED_HTTP2_TRANSPORT", Http2Transport(http1_fallback=False)):
+            http2_duration = _check_concurrently()
+
+    print(
+        f"\n{_CHECKS} concurrent checks, {_LATENCY * 1000:.0f} ms latency:"
+        f"\n  HTTP/1.1: {http1_duration:.3f} s, {http1_server.connections} connections"
+        f"\n  HTTP/2:   {http2_duration:.3f} s, {http2_server.connections} connection(s)"
+    )
+    assert http2_server.connections == 1
+    assert http1_server.connections == _CHECKS
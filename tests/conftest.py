@@ -5,6 +5,8 @@ import toml
 from delfino.constants import PYPROJECT_TOML_FILENAME
 from delfino.models.pyproject_toml import Poetry, PyprojectToml
 
+from issue_watcher.repository_state import reset_repository_states
+
 
 @pytest.fixture(scope="session")
 def project_root() -> Path:
@@ -20,3 +22,11 @@ def pyproject_toml(project_root) -> PyprojectToml:
 def poetry(pyproject_toml) -> Poetry:
     assert pyproject_toml.tool.poetry
     return pyproject_toml.tool.poetry
+
+
+@pytest.fixture(autouse=True)
+def fresh_repository_states():
+    """Makes each test read the configuration again, as it may have been mocked by previous tests."""
+    reset_repository_states()
+    yield
+    reset_repository_states()
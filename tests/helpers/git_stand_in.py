@@ -0,0 +1,69 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List
+
+_ZERO_ID = b"0" * 40
+
+
+def pkt_line(data: bytes) -> bytes:
+    return b"%04x" % (len(data) + 4) + data
+
+
+def ref_advertisement(tags: List[str], annotated: bool = False) -> bytes:
+    """Builds a git smart HTTP ref advertisement of a repository with given tags and a single branch."""
+    lines = [
+        pkt_line(b"# service=git-upload-pack\n"),
+        b"0000",
+        pkt_line(b"%s HEAD\0multi_ack side-band-64k ofs-delta symref=HEAD:refs/heads/main\n" % (b"1" * 40)),
+        pkt_line(b"%s refs/heads/main\n" % (b"1" * 40)),
+        pkt_line(b"%s refs/pull/1/head\n" % (b"2" * 40)),
+    ]
+    for number, tag in enumerate(tags):
+        object_id = b"%040x" % number
+        lines.append(pkt_line(b"%s refs/tags/%s\n" % (object_id, tag.encode("utf-8"))))
+        if annotated:
+            lines.append(pkt_line(b"%s refs/tags/%s^{}\n" % (object_id[::-1], tag.encode("utf-8"))))
+    lines.append(b"0000")
+    return b"".join(lines)
+
+
+class GitStandIn(ThreadingHTTPServer):
+    """Serves a git smart HTTP ref advertisement in place of ``https://github.com``.
+
+    Answers ``/<owner>/<repository>.git/info/refs?service=git-upload-pack`` of any
+    repository with the advertisement, and anything else with ``404``.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, advertisement: bytes):
+        super().__init__(("127.0.0.1", 0), _GitStandInHandler)
+        self.advertisement = advertisement
+        self.paths: List[str] = []
+        self.lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+class _GitStandInHandler(BaseHTTPRequestHandler):
+    server: GitStandIn
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self) -> None:  # pylint: disable=invalid-name
+        with self.server.lock:
+            self.server.paths.append(self.path)
+
+        if not self.path.endswith(".git/info/refs?service=git-upload-pack"):
+            self.send_error(404)
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-git-upload-pack-advertisement")
+        self.send_header("Content-Length", str(len(self.server.advertisement)))
+        self.end_headers()
+        self.wfile.write(self.server.advertisement)
+
+    def log_message(self, *_args) -> None:
+        pass
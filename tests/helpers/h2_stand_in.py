@@ -0,0 +1,151 @@
+import socketserver
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Iterator, List
+
+
+class H2StandIn(socketserver.ThreadingTCPServer):
+    """Serves the same JSON body on every path over cleartext HTTP/2 with prior knowledge.
+
+    Each response is delayed by ``latency`` seconds to simulate a remote server. Counts
+    accepted connections and the highest number of concurrently open streams.
+    """
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, body: bytes, latency: float = 0.0):
+        super().__init__(("127.0.0.1", 0), _H2StandInHandler)
+        self.body = body
+        self.latency = latency
+        self.connections = 0
+        self.max_open_streams = 0
+        self.lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+class _H2StandInHandler(socketserver.BaseRequestHandler):
+    server: H2StandIn
+
+    def handle(self) -> None:
+        # imported here so that the module can be imported without the optional dependency
+        from h2.config import H2Configuration  # pylint: disable=import-outside-toplevel
+        from h2.connection import H2Connection  # pylint: disable=import-outside-toplevel
+        from h2.events import ConnectionTerminated, StreamEnded  # pylint: disable=import-outside-toplevel
+
+        with self.server.lock:
+            self.server.connections += 1
+
+        connection = H2Connection(H2Configuration(client_side=False, header_encoding="utf-8"))
+        connection_lock = threading.Lock()
+        open_streams = [0]
+        responders: List[threading.Thread] = []
+
+        def _flush() -> None:
+            data = connection.data_to_send()
+            if data:
+                try:
+                    self.request.sendall(data)
+                except OSError:
+                    pass  # the client went away, nothing left to respond to
+
+        def _respond(stream_id: int) -> None:
+            time.sleep(self.server.latency)
+            with connection_lock:
+                connection.send_headers(
+                    stream_id,
+                    [
+                        (":status", "200"),
+                        ("content-type", "application/json"),
+                        ("content-length", str(len(self.server.body))),
+                    ],
+                )
+                connection.send_data(stream_id, self.server.body, end_stream=True)
+                open_streams[0] -= 1
+                _flush()
+
+        with connection_lock:
+            connection.initiate_connection()
+            _flush()
+
+        try:
+            while True:
+                data = self.request.recv(65535)
+                if not data:
+                    return
+
+                with connection_lock:
+                    events = connection.receive_data(data)
+                    _flush()
+
+                for event in events:
+                    if isinstance(event, ConnectionTerminated):
+                        return
+                    if isinstance(event, StreamEnded):
+                        with connection_lock:
+                            open_streams[0] += 1
+                        with self.server.lock:
+                            self.server.max_open_streams = max(self.server.max_open_streams, open_streams[0])
+                        responder = threading.Thread(target=_respond, args=(event.stream_id,), daemon=True)
+                        responders.append(responder)
+                        responder.start()
+
+        finally:
+            # responders must not write to the socket once it is closed after returning
+            for responder in responders:
+                responder.join()
+
+
+class Http1StandIn(ThreadingHTTPServer):
+    """Same as :py:class:`H2StandIn` over HTTP/1.1."""
+
+    daemon_threads = True
+
+    def __init__(self, body: bytes, latency: float = 0.0):
+        super().__init__(("127.0.0.1", 0), _Http1StandInHandler)
+        self.body = body
+        self.latency = latency
+        self.connections = 0
+        self.lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+class _Http1StandInHandler(BaseHTTPRequestHandler):
+    server: Http1StandIn
+    protocol_version = "HTTP/1.1"
+
+    def setup(self) -> None:
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def do_GET(self) -> None:  # pylint: disable=invalid-name
+        time.sleep(self.server.latency)
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(self.server.body)))
+        self.end_headers()
+        self.wfile.write(self.server.body)
+
+    def log_message(self, *_args) -> None:
+        pass
+
+
+@contextmanager
+def running(server: socketserver.BaseServer) -> Iterator[None]:
+    thread = threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.01}, daemon=True)
+    thread.start()
+    try:
+        yield
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join()
@@ -0,0 +1,102 @@
+import fnmatch
+import socketserver
+import threading
+from typing import Dict, Iterator, List, Optional, Union
+
+_Reply = Union[None, int, bytes, List, Exception]
+
+
+class _RedisStandInHandler(socketserver.StreamRequestHandler):
+    server: "RedisStandIn"
+
+    def _read_command(self) -> Optional[List[bytes]]:
+        line = self.rfile.readline()
+        if not line:
+            return None
+        assert line.startswith(b"*"), f"Unexpected command {line!r}"
+        args = []
+        for _ in range(int(line[1:])):
+            length = int(self.rfile.readline()[1:])
+            args.append(self.rfile.read(length + 2)[:-2])
+        return args
+
+    def _encode(self, reply: _Reply) -> bytes:
+        if reply is None:
+            return b"$-1\r\n"
+        if isinstance(reply, Exception):
+            return b"-ERR %s\r\n" % str(reply).encode()
+        if isinstance(reply, int):
+            return b":%d\r\n" % reply
+        if isinstance(reply, bytes):
+            return b"$%d\r\n%s\r\n" % (len(reply), reply)
+        return b"*%d\r\n" % len(reply) + b"".join(self._encode(item) for item in reply)
+
+    def handle(self):
+        while True:
+            command = self._read_command()
+            if command is None:
+                return
+            with self.server.lock:
+                reply = self.server.execute(command[0].upper().decode(), command[1:])
+            self.wfile.write(self._encode(reply))
+
+
+class RedisStandIn(socketserver.ThreadingTCPServer):
+    """In-memory server understanding the subset of Redis commands used by the cache backend."""
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self) -> None:
+        super().__init__(("127.0.0.1", 0), _RedisStandInHandler)
+        self.lock = threading.Lock()
+        self.hashes: Dict[bytes, Dict[bytes, bytes]] = {}
+        self.strings: Dict[bytes, bytes] = {}
+        self.commands: List[str] = []
+
+    @property
+    def url(self) -> str:
+        return f"redis://127.0.0.1:{self.server_address[1]}/0"
+
+    def execute(self, name: str, args: List[bytes]) -> _Reply:  # pylint: disable=too-many-return-statements
+        self.commands.append(name)
+
+        if name == "HMGET":
+            hash_ = self.hashes.get(args[0], {})
+            return [hash_.get(field) for field in args[1:]]
+        if name == "HSET":
+            hash_ = self.hashes.setdefault(args[0], {})
+            hash_.update(zip(args[1::2], args[2::2]))
+            return len(args[1:]) // 2
+        if name == "HDEL":
+            hash_ = self.hashes.get(args[0], {})
+            return sum(hash_.pop(field, None) is not None for field in args[1:])
+        if name == "HGETALL":
+            return [item for pair in self.hashes.get(args[0], {}).items() for item in pair]
+        if name == "SCAN":
+            pattern = args[args.index(b"MATCH") + 1].decode()
+            keys = [key for key in list(self.hashes) + list(self.strings) if fnmatch.fnmatch(key.decode(), pattern)]
+            return [b"0", keys]
+        if name == "DEL":
+            return sum(
+                (self.hashes.pop(key, None) is not None) or (self.strings.pop(key, None) is not None) for key in args
+            )
+        if name == "SET":
+            if b"NX" in args and args[0] in self.strings:
+                return None
+            self.strings[args[0]] = args[1]
+            return b"OK"
+        if name == "GET":
+            return self.strings.get(args[0])
+        return Exception(f"unknown command '{name}'")
+
+
+def running_redis_stand_in() -> Iterator[RedisStandIn]:
+    server = RedisStandIn()
+    thread = threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.01}, daemon=True)
+    thread.start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -1,3 +1,3 @@
-from tests.unit.github.fixtures import assert_github_issue_no_cache, requests_mock
+from tests.unit.github.fixtures import assert_github_issue_no_cache, backend, requests_mock
 
-__all__ = ["assert_github_issue_no_cache", "requests_mock"]
+__all__ = ["assert_github_issue_no_cache", "backend", "requests_mock"]
@@ -3,6 +3,7 @@ from unittest.mock import patch
 import pytest
 
 from issue_watcher import AssertGitHubIssue
+from issue_watcher.cache_backends import FileCacheBackend
 from tests.unit.github.constants import REPOSITORY_ID
 
 
@@ -14,9 +15,14 @@ def assert_github_issue_no_cache():
     return assert_github_issue
 
 
+@pytest.fixture()
+def backend(tmp_path) -> FileCacheBackend:
+    return FileCacheBackend(str(tmp_path / "cache.json"))
+
+
 @pytest.fixture()
 def requests_mock():
-    requests_patcher = patch("issue_watcher.github.requests")
+    requests_patcher = patch("issue_watcher.client.requests")
 
     try:
         yield requests_patcher.start()
@@ -1,5 +1,6 @@
+import json
 from time import time
-from typing import List
+from typing import Any, Dict, List, Optional, Tuple
 from unittest.mock import MagicMock
 
 
@@ -23,15 +24,59 @@ def set_limit_exceeded(req_mock: MagicMock):
     req_mock.get.return_value = mock_response
 
 
-def set_number_of_releases_to(req_mock: MagicMock, count: int, status_code: int = 200):
+def _set_tag_refs(req_mock: MagicMock, refs: List[Dict[str, Any]], status_code: int):
+    body = json.dumps(refs).encode("utf-8")
     mock_response = MagicMock()
-    mock_response.json.return_value = [{}] * count
+    mock_response.json.return_value = refs
+    mock_response.iter_content.side_effect = lambda chunk_size=1: (
+        body[start : start + chunk_size] for start in range(0, len(body), chunk_size)
+    )
     mock_response.status_code = status_code
     req_mock.get.return_value = mock_response
 
 
+def set_number_of_releases_to(req_mock: MagicMock, count: int, status_code: int = 200):
+    _set_tag_refs(req_mock, [{"ref": f"refs/tags/{number}"} for number in range(count)], status_code)
+
+
 def set_git_tags_to(req_mock: MagicMock, tags: List[str], status_code: int = 200):
-    mock_response = MagicMock()
-    mock_response.json.return_value = [{"ref": f"refs/tags/{tag}"} for tag in tags]
-    mock_response.status_code = status_code
-    req_mock.get.return_value = mock_response
+    _set_tag_refs(req_mock, [{"ref": f"refs/tags/{tag}"} for tag in tags], status_code)
+
+
+def set_issues_listing_pages(req_mock: MagicMock, pages: List[List[Tuple[int, str]]]):
+    responses = []
+    for page_number, page in enumerate(pages, start=1):
+        mock_response = MagicMock()
+        mock_response.json.return_value = [{"number": number, "state": state} for number, state in page]
+        mock_response.status_code = 200
+        mock_response.links = {"next": {"url": f"next-page-{page_number + 1}"}} if page_number < len(pages) else {}
+        responses.append(mock_response)
+    req_mock.get.side_effect = responses
+
+
+class EventsStandIn:
+    """Serves issues and a repository events feed with ETag support in place of ``requests.get``."""
+
+    ETAG = '"etag-1"'
+
+    def __init__(self, events: List[Dict[str, Any]], issue_state: str = "open"):
+        self.events = events
+        self.issue_state = issue_state
+        self.urls: List[str] = []
+
+    def __call__(self, url: str, headers: Optional[Dict[str, str]] = None, **_kwargs) -> MagicMock:
+        self.urls.append(url)
+        response = MagicMock()
+        response.headers = {"ETag": self.ETAG, "X-Poll-Interval": "60"}
+
+        if "/events" in url:
+            if (headers or {}).get("If-None-Match") == self.ETAG:
+                response.status_code = 304
+            else:
+                response.status_code = 200
+                response.json.return_value = self.events
+        else:
+            response.status_code = 200
+            response.json.return_value = {"state": self.issue_state}
+
+        return response
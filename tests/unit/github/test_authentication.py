@@ -10,6 +10,12 @@ from tests.unit.github.constants import ISSUE_NUMBER, REPOSITORY_ID
 from tests.unit.github.mocking import set_issue_state, set_limit_exceeded
 
 
+def _credentials_file(tmp_path) -> str:
+    path = tmp_path / "credentials"
+    path.write_text("first:token 1\nsecond:token 2\n", encoding="utf-8")
+    return str(path)
+
+
 def noop(_: AssertGitHubIssue):
     pass
 
@@ -81,3 +87,47 @@ class TestAuthentication:
                 assert_github_issue.is_open(ISSUE_NUMBER)
 
         self._init_with_user_name_token_and_assert(requests_mock, "", "", _assertion)
+
+
+class TestCredentialPool:
+    @staticmethod
+    def test_it_spreads_requests_over_credentials_from_file(requests_mock: MagicMock, tmp_path):
+        set_issue_state(requests_mock, "open")
+
+        with patch.dict(
+            "os.environ", {"GITHUB_CREDENTIALS_FILE": _credentials_file(tmp_path), "CACHE_INVALIDATION_IN_SECONDS": "0"}
+        ):
+            assert_github_issue = AssertGitHubIssue(REPOSITORY_ID)
+            assert_github_issue.is_open(ISSUE_NUMBER)
+            assert_github_issue.is_open(ISSUE_NUMBER)
+
+        assert [call[1]["auth"] for call in requests_mock.get.call_args_list] == [
+            ("first", "token 1"),
+            ("second", "token 2"),
+        ]
+
+    @staticmethod
+    def test_it_retries_with_another_credential_when_rate_limit_is_exceeded(requests_mock: MagicMock, tmp_path):
+        set_limit_exceeded(requests_mock)
+        exceeded = requests_mock.get.return_value
+        set_issue_state(requests_mock, "open")
+        requests_mock.get.side_effect = [exceeded, requests_mock.get.return_value]
+
+        with patch.dict(
+            "os.environ", {"GITHUB_CREDENTIALS_FILE": _credentials_file(tmp_path), "CACHE_INVALIDATION_IN_SECONDS": "0"}
+        ):
+            AssertGitHubIssue(REPOSITORY_ID).is_open(ISSUE_NUMBER)
+
+        assert requests_mock.get.call_count == 2
+
+    @staticmethod
+    def test_it_fails_when_all_credentials_are_exhausted(requests_mock: MagicMock, tmp_path):
+        set_limit_exceeded(requests_mock)
+
+        with patch.dict(
+            "os.environ", {"GITHUB_CREDENTIALS_FILE": _credentials_file(tmp_path), "CACHE_INVALIDATION_IN_SECONDS": "0"}
+        ):
+            with pytest.raises(HTTPError, match="Limit will reset"):
+                AssertGitHubIssue(REPOSITORY_ID).is_open(ISSUE_NUMBER)
+
+        assert requests_mock.get.call_count == 2
@@ -0,0 +1,85 @@
+from time import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from issue_watcher import AssertGitHubIssue
+from issue_watcher.cache_backends import FileCacheBackend
+from tests.unit.github.constants import REPOSITORY_ID
+from tests.unit.github.mocking import set_issue_state, set_issues_listing_pages
+
+# False positive caused by pytest fixtures
+# pylint: disable=redefined-outer-name
+
+_STALE_TIMESTAMP = int(time()) - 10 * 3600
+
+
+@pytest.fixture()
+def backend(backend: FileCacheBackend) -> FileCacheBackend:
+    backend.set_many(
+        REPOSITORY_ID,
+        {
+            "issues/1": ("open", _STALE_TIMESTAMP),
+            "issues/2": ("open", _STALE_TIMESTAMP),
+            "issues/3": ("closed", _STALE_TIMESTAMP + 60),
+        },
+    )
+    return backend
+
+
+class TestBulkRefresh:
+    @staticmethod
+    def test_it_lists_issues_changed_since_oldest_expired_entry(requests_mock: MagicMock, backend: FileCacheBackend):
+        set_issues_listing_pages(requests_mock, [[(2, "closed")]])
+
+        AssertGitHubIssue(REPOSITORY_ID, cache_backend=backend).is_open(1)
+
+        requests_mock.get.assert_called_once()
+        url = requests_mock.get.call_args[0][0]
+        assert url.startswith(f"https://api.github.com/repos/{REPOSITORY_ID}/issues?state=all&since=")
+
+    @staticmethod
+    def test_it_updates_changed_and_marks_unchanged_issues_as_fresh(
+        requests_mock: MagicMock, backend: FileCacheBackend
+    ):
+        set_issues_listing_pages(requests_mock, [[(2, "closed"), (99, "open")]])
+
+        assert AssertGitHubIssue(REPOSITORY_ID, cache_backend=backend).refresh_issues() == {
+            1: "open",
+            2: "closed",
+            3: "closed",
+        }
+
+        entries = backend.get_all(REPOSITORY_ID)
+        assert sorted(entries) == ["issues/1", "issues/2", "issues/3"]
+        assert all(entry[1] > _STALE_TIMESTAMP + 60 for entry in entries.values())
+        assert entries["issues/2"][0] == "closed"
+
+    @staticmethod
+    def test_it_follows_pagination(requests_mock: MagicMock, backend: FileCacheBackend):
+        set_issues_listing_pages(requests_mock, [[(5, "open")], [(2, "closed")]])
+
+        with pytest.raises(AssertionError, match="no longer open"):
+            AssertGitHubIssue(REPOSITORY_ID, cache_backend=backend).is_open(2)
+
+        assert requests_mock.get.call_args[0][0] == "next-page-2"
+
+    @staticmethod
+    def test_it_gives_up_when_too_many_issues_changed(requests_mock: MagicMock, backend: FileCacheBackend):
+        set_issues_listing_pages(requests_mock, [[(100 + page, "open")] for page in range(11)])
+
+        assert not AssertGitHubIssue(REPOSITORY_ID, cache_backend=backend).refresh_issues()
+        entry = backend.get(REPOSITORY_ID, "issues/1")
+        assert entry is not None
+        assert entry[1] == _STALE_TIMESTAMP
+
+    @staticmethod
+    def test_it_is_not_used_for_single_expired_issue(requests_mock: MagicMock, tmp_path):
+        backend = FileCacheBackend(str(tmp_path / "cache.json"))
+        backend.set(REPOSITORY_ID, "issues/1", ("open", _STALE_TIMESTAMP))
+        set_issue_state(requests_mock, "open")
+
+        AssertGitHubIssue(REPOSITORY_ID, cache_backend=backend).is_open(1)
+
+        requests_mock.get.assert_called_once()
+        assert requests_mock.get.call_args[0][0].endswith(f"/repos/{REPOSITORY_ID}/issues/1")
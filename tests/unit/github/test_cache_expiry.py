@@ -0,0 +1,66 @@
+from time import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from issue_watcher import AssertGitHubIssue
+from issue_watcher.cache_backends import FileCacheBackend
+from tests.unit.github.constants import ISSUE_NUMBER, REPOSITORY_ID
+from tests.unit.github.mocking import set_issue_state
+
+
+class TestAdaptiveCacheExpiry:
+    @staticmethod
+    def test_it_extends_expiry_of_issue_inactive_for_a_long_time(requests_mock: MagicMock, backend: FileCacheBackend):
+        set_issue_state(requests_mock, "closed")
+        requests_mock.get.return_value.json.return_value.update(
+            {"updated_at": "2020-01-01T00:00:00Z", "closed_at": "2020-01-01T00:00:00Z"}
+        )
+
+        with patch.dict("os.environ", {"CACHE_ADAPTIVE_INVALIDATION": "1"}):
+            AssertGitHubIssue(REPOSITORY_ID, cache_backend=backend).is_closed(ISSUE_NUMBER)
+
+        entry = backend.get(REPOSITORY_ID, f"issues/{ISSUE_NUMBER}")
+        assert entry is not None
+        _, _, expire_in_seconds = entry
+        assert expire_in_seconds == 7 * 24 * 3600
+
+
+class TestEarlyRefresh:
+    @staticmethod
+    def test_it_stores_how_long_fetching_took(requests_mock: MagicMock, backend: FileCacheBackend):
+        set_issue_state(requests_mock, "closed")
+
+        with patch.dict("os.environ", {"CACHE_EARLY_REFRESH": "1"}):
+            with patch("issue_watcher.github.monotonic", side_effect=[10.0, 10.25]):
+                AssertGitHubIssue(REPOSITORY_ID, cache_backend=backend).is_closed(ISSUE_NUMBER)
+
+        entry = backend.get(REPOSITORY_ID, f"issues/{ISSUE_NUMBER}")
+        assert entry is not None
+        _, _, _, fetch_duration = entry
+        assert fetch_duration == 0.25
+
+
+class TestMaxAge:
+    @staticmethod
+    @pytest.mark.parametrize(
+        "cached_ago,fetched",
+        [
+            pytest.param(30, False, id="younger"),
+            pytest.param(120, True, id="older"),
+        ],
+    )
+    def test_it_fetches_valid_values_older_than_max_age(
+        requests_mock: MagicMock, backend: FileCacheBackend, cached_ago, fetched
+    ):
+        cached_at = int(time()) - cached_ago
+        backend.set(REPOSITORY_ID, f"issues/{ISSUE_NUMBER}", ("closed", cached_at))
+        set_issue_state(requests_mock, "closed")
+
+        with patch.dict("os.environ", {"CACHE_INVALIDATION_IN_SECONDS": "3600"}):
+            AssertGitHubIssue(REPOSITORY_ID, cache_backend=backend, max_age=60).is_closed(ISSUE_NUMBER)
+
+        assert requests_mock.get.called is fetched
+        entry = backend.get(REPOSITORY_ID, f"issues/{ISSUE_NUMBER}")
+        assert entry is not None
+        assert (entry[1] > cached_at) is fetched
@@ -0,0 +1,65 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock, patch
+
+from issue_watcher import AssertGitHubIssue
+from tests.unit.github.constants import ISSUE_NUMBER, REPOSITORY_ID
+from tests.unit.github.mocking import set_issue_state
+
+_THREADS = 8
+
+
+class TestConcurrentRequests:
+    @staticmethod
+    def test_it_sends_one_request_for_concurrent_checks_of_the_same_issue(
+        assert_github_issue_no_cache: AssertGitHubIssue, requests_mock: MagicMock
+    ):
+        set_issue_state(requests_mock, "open")
+        response = requests_mock.get.return_value
+        all_started = threading.Barrier(_THREADS, timeout=5)
+
+        def _slow_get(*_args, **_kwargs):
+            time.sleep(0.2)
+            return response
+
+        def _check():
+            all_started.wait()
+            assert_github_issue_no_cache.is_open(ISSUE_NUMBER)
+
+        requests_mock.get.side_effect = _slow_get
+
+        with ThreadPoolExecutor(_THREADS) as executor:
+            for future in [executor.submit(_check) for _ in range(_THREADS)]:
+                future.result()
+
+        assert requests_mock.get.call_count == 1
+
+    @staticmethod
+    def test_it_sends_one_request_for_concurrent_checks_with_a_credential_pool(requests_mock: MagicMock, tmp_path):
+        credentials_file = tmp_path / "credentials"
+        credentials_file.write_text("".join(f"user {i}:token {i}\n" for i in range(4)), encoding="utf-8")
+        set_issue_state(requests_mock, "open")
+        response = requests_mock.get.return_value
+        all_started = threading.Barrier(_THREADS, timeout=5)
+
+        def _slow_get(*_args, **_kwargs):
+            time.sleep(0.2)
+            return response
+
+        requests_mock.get.side_effect = _slow_get
+
+        with patch.dict(
+            "os.environ", {"GITHUB_CREDENTIALS_FILE": str(credentials_file), "CACHE_INVALIDATION_IN_SECONDS": "0"}
+        ):
+            assert_github_issue = AssertGitHubIssue(REPOSITORY_ID)
+
+            def _check():
+                all_started.wait()
+                assert_github_issue.is_open(ISSUE_NUMBER)
+
+            with ThreadPoolExecutor(_THREADS) as executor:
+                for future in [executor.submit(_check) for _ in range(_THREADS)]:
+                    future.result()
+
+        assert requests_mock.get.call_count == 1
@@ -0,0 +1,138 @@
+from datetime import datetime, timezone
+from time import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+from requests import ConnectionError, HTTPError  # pylint: disable=redefined-builtin
+from ujson import dumps
+
+from issue_watcher import AssertGitHubIssue
+from issue_watcher.cache_backends import FileCacheBackend
+from tests.unit.github.constants import REPOSITORY_ID
+from tests.unit.github.mocking import EventsStandIn
+
+# False positive caused by pytest fixtures
+# pylint: disable=redefined-outer-name
+
+_NOW = int(time())
+
+
+def _issue_event(event_id: int, number: int, created_at: int = _NOW):
+    return {
+        "id": str(event_id),
+        "type": "IssuesEvent",
+        "created_at": datetime.fromtimestamp(created_at, timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "payload": {"issue": {"number": number}},
+    }
+
+
+@pytest.fixture()
+def backend(backend: FileCacheBackend) -> FileCacheBackend:
+    backend.set_many(REPOSITORY_ID, {"issues/1": ("open", _NOW - 100), "issues/2": ("open", _NOW - 100)})
+    return backend
+
+
+@pytest.fixture()
+def assert_github_issue(backend: FileCacheBackend):
+    with patch.dict("os.environ", {"CACHE_INVALIDATION_BY_EVENTS": "1"}):
+        return AssertGitHubIssue(REPOSITORY_ID, cache_backend=backend)
+
+
+def _set_events_state(
+    backend: FileCacheBackend, polled_at: int, last_event_id: str = "1", etag: str = EventsStandIn.ETAG
+):
+    state = {"etag": etag, "last_event_id": last_event_id, "poll_interval": 60}
+    backend.set(REPOSITORY_ID, "events", (dumps(state), polled_at))
+
+
+class TestEventsPolling:
+    @staticmethod
+    def test_it_refetches_issue_touched_by_new_event(
+        assert_github_issue: AssertGitHubIssue, backend: FileCacheBackend, requests_mock: MagicMock
+    ):
+        requests_mock.get.side_effect = stand_in = EventsStandIn([_issue_event(2, 1), _issue_event(1, 7)], "closed")
+        _set_events_state(backend, _NOW - 120, etag='"outdated"')
+
+        with pytest.raises(AssertionError, match="no longer open"):
+            assert_github_issue.is_open(1)
+
+        assert stand_in.urls[0].endswith("/events?per_page=100")
+        assert stand_in.urls[1].endswith("/issues/1")
+
+    @staticmethod
+    def test_it_keeps_issues_not_touched_by_events(
+        assert_github_issue: AssertGitHubIssue, backend: FileCacheBackend, requests_mock: MagicMock
+    ):
+        requests_mock.get.side_effect = stand_in = EventsStandIn([_issue_event(1, 1)], "closed")
+
+        assert_github_issue.is_open(2)
+
+        assert len(stand_in.urls) == 1
+        assert backend.get(REPOSITORY_ID, "issues/1") is None
+
+    @staticmethod
+    def test_it_sends_conditional_request(
+        assert_github_issue: AssertGitHubIssue, backend: FileCacheBackend, requests_mock: MagicMock
+    ):
+        requests_mock.get.side_effect = stand_in = EventsStandIn([_issue_event(2, 1)], "closed")
+        _set_events_state(backend, _NOW - 120)
+
+        assert_github_issue.is_open(1)
+
+        assert len(stand_in.urls) == 1
+        assert requests_mock.get.call_args[1]["headers"] == {"If-None-Match": EventsStandIn.ETAG}
+        entry = backend.get(REPOSITORY_ID, "events")
+        assert entry is not None
+        assert entry[1] >= _NOW
+
+    @staticmethod
+    def test_it_does_not_poll_within_poll_interval(
+        assert_github_issue: AssertGitHubIssue, backend: FileCacheBackend, requests_mock: MagicMock
+    ):
+        _set_events_state(backend, _NOW)
+
+        assert_github_issue.is_open(1)
+
+        requests_mock.get.assert_not_called()
+
+    @staticmethod
+    def test_it_invalidates_whole_repository_when_events_were_missed(
+        assert_github_issue: AssertGitHubIssue, backend: FileCacheBackend, requests_mock: MagicMock
+    ):
+        requests_mock.get.side_effect = EventsStandIn([_issue_event(10, 1)])
+        _set_events_state(backend, _NOW - 120, last_event_id="5", etag='"outdated"')
+
+        assert_github_issue.poll_events()
+
+        assert backend.get(REPOSITORY_ID, "issues/2") is None
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        "error",
+        [
+            pytest.param(ConnectionError("Connection refused"), id="connection error"),
+            pytest.param(HTTPError("404 Not Found"), id="HTTP error"),
+        ],
+    )
+    @pytest.mark.parametrize("polled_before", [True, False])
+    def test_it_keeps_cached_values_with_warning_when_polling_fails(
+        assert_github_issue: AssertGitHubIssue,
+        backend: FileCacheBackend,
+        requests_mock: MagicMock,
+        error: Exception,
+        polled_before: bool,
+    ):
+        requests_mock.get.side_effect = error
+        if polled_before:
+            _set_events_state(backend, _NOW - 120)
+
+        with pytest.warns(RuntimeWarning, match="could not poll events"):
+            assert_github_issue.is_open(1)
+        assert_github_issue.is_open(2)
+
+        requests_mock.get.assert_called_once()
+
+    @staticmethod
+    def test_it_is_not_used_by_default(backend: FileCacheBackend, requests_mock: MagicMock):
+        AssertGitHubIssue(REPOSITORY_ID, cache_backend=backend).is_open(1)
+        requests_mock.get.assert_not_called()
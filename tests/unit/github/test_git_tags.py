@@ -0,0 +1,48 @@
+import re
+from typing import Iterator
+from unittest.mock import patch
+
+import pytest
+
+from issue_watcher import AssertGitHubIssue
+from tests.helpers.git_stand_in import GitStandIn, ref_advertisement
+from tests.helpers.h2_stand_in import running
+from tests.unit.github.constants import REPOSITORY_ID
+
+_TAGS = 50_000
+
+
+@pytest.fixture(scope="module")
+def git_stand_in() -> Iterator[GitStandIn]:
+    server = GitStandIn(ref_advertisement([f"{number // 100}.{number % 100}.0" for number in range(_TAGS)], True))
+    with running(server):
+        yield server
+
+
+@pytest.fixture()
+def assert_github_issue(git_stand_in: GitStandIn) -> Iterator[AssertGitHubIssue]:
+    with patch.dict("os.environ", {"CACHE_INVALIDATION_IN_SECONDS": "0", "GITHUB_TAGS_FROM_GIT": "1"}), patch.object(
+        AssertGitHubIssue, "_URL_WEB", git_stand_in.url
+    ):
+        git_stand_in.paths.clear()
+        yield AssertGitHubIssue(REPOSITORY_ID)
+
+
+class TestTagsFromGit:
+    @staticmethod
+    def test_it_reads_tags_from_ref_advertisement(git_stand_in: GitStandIn, assert_github_issue: AssertGitHubIssue):
+        with patch.object(AssertGitHubIssue, "_URL_API", "http://127.0.0.1:1"):  # nothing listens there
+            assert_github_issue.current_release(_TAGS)
+
+        assert git_stand_in.paths == [f"/{REPOSITORY_ID}.git/info/refs?service=git-upload-pack"]
+
+    @staticmethod
+    def test_it_counts_all_tags_but_not_peeled_ones(assert_github_issue: AssertGitHubIssue):
+        with pytest.raises(AssertionError, match=f"Expected {_TAGS - 1} releases but {_TAGS} are now available"):
+            assert_github_issue.current_release(_TAGS - 1)
+
+    @staticmethod
+    def test_it_finds_latest_version(assert_github_issue: AssertGitHubIssue):
+        latest_version = f"{(_TAGS - 1) // 100}.{(_TAGS - 1) % 100}.0"
+        with pytest.raises(AssertionError, match=f"is '{re.escape(latest_version)}'"):
+            assert_github_issue.fixed_in(latest_version)
@@ -1,10 +1,10 @@
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 
 import pytest
 from requests import HTTPError
 
 from issue_watcher import AssertGitHubIssue
-from tests.unit.github.constants import CURRENT_NUMBER_OF_RELEASES, ISSUE_NUMBER
+from tests.unit.github.constants import CURRENT_NUMBER_OF_RELEASES, ISSUE_NUMBER, REPOSITORY_ID
 from tests.unit.github.mocking import set_issue_state, set_limit_exceeded, set_number_of_releases_to
 
 
@@ -35,3 +35,30 @@ class TestHttpErrorRaising:
 
         with pytest.raises(HTTPError, match=".*Current quota:.*"):
             assert_github_issue_no_cache.is_open(ISSUE_NUMBER)
+
+
+class TestHttp2:
+    @staticmethod
+    def test_it_sends_requests_through_shared_http2_transport(requests_mock: MagicMock):
+        transport = MagicMock()
+        set_issue_state(transport, "open")
+
+        with patch.dict("os.environ", {"GITHUB_HTTP2": "1", "CACHE_INVALIDATION_IN_SECONDS": "0"}):
+            with patch("issue_watcher.repository_state.shared_http2_transport", return_value=transport):
+                AssertGitHubIssue(REPOSITORY_ID).is_open(ISSUE_NUMBER)
+
+        transport.get.assert_called_once()
+        requests_mock.get.assert_not_called()
+
+    @staticmethod
+    def test_it_warns_and_uses_http1_when_httpx_is_not_installed(requests_mock: MagicMock):
+        set_issue_state(requests_mock, "open")
+
+        with patch.dict("os.environ", {"GITHUB_HTTP2": "1", "CACHE_INVALIDATION_IN_SECONDS": "0"}), patch(
+            "issue_watcher.transport.httpx", None
+        ), patch("issue_watcher.transport._SHARED_HTTP2_TRANSPORT", None):
+            with pytest.warns(RuntimeWarning, match="httpx"):
+                assert_github_issue = AssertGitHubIssue(REPOSITORY_ID)
+            assert_github_issue.is_open(ISSUE_NUMBER)
+
+        requests_mock.get.assert_called_once()
@@ -0,0 +1,76 @@
+from time import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+from requests import Timeout
+
+from issue_watcher import AssertGitHubIssue
+from issue_watcher.cache_backends import FileCacheBackend
+from tests.unit.github.constants import REPOSITORY_ID
+from tests.unit.github.mocking import set_issue_state
+
+# False positive caused by pytest fixtures
+# pylint: disable=redefined-outer-name
+
+
+@pytest.fixture()
+def backend(backend: FileCacheBackend):
+    backend.set(REPOSITORY_ID, "issues/1", ("open", int(time()) - 7200))
+    with patch.dict("issue_watcher.latency._SHARED_TRACKERS", clear=True):
+        yield backend
+
+
+class TestLatencyBudget:
+    @staticmethod
+    def test_it_uses_expired_value_with_warning_when_budget_ran_out(requests_mock: MagicMock, backend):
+        with patch.dict("os.environ", {"GITHUB_LATENCY_BUDGET_IN_SECONDS": "10"}):
+            assert_github_issue = AssertGitHubIssue(REPOSITORY_ID, backend)
+            assert_github_issue._latency.record(10)  # pylint: disable=protected-access
+
+            with pytest.warns(RuntimeWarning, match="budget of the session ran out"):
+                assert_github_issue.is_open(1)
+
+        requests_mock.get.assert_not_called()
+
+    @staticmethod
+    def test_it_fetches_values_missing_from_cache_when_budget_ran_out(requests_mock: MagicMock, backend):
+        set_issue_state(requests_mock, "open")
+
+        with patch.dict("os.environ", {"GITHUB_LATENCY_BUDGET_IN_SECONDS": "10"}):
+            assert_github_issue = AssertGitHubIssue(REPOSITORY_ID, backend)
+            assert_github_issue._latency.record(10)  # pylint: disable=protected-access
+            assert_github_issue.is_open(2)
+
+        requests_mock.get.assert_called_once()
+
+    @staticmethod
+    def test_it_limits_request_timeout_by_remaining_budget(requests_mock: MagicMock, backend):
+        set_issue_state(requests_mock, "open")
+
+        with patch.dict("os.environ", {"GITHUB_LATENCY_BUDGET_IN_SECONDS": "5"}):
+            AssertGitHubIssue(REPOSITORY_ID, backend).is_open(2)
+
+        assert requests_mock.get.call_args[1]["timeout"] == 5
+
+
+class TestTimeout:
+    @staticmethod
+    def test_it_uses_expired_value_with_warning(requests_mock: MagicMock, backend):
+        requests_mock.get.side_effect = Timeout()
+
+        with pytest.warns(RuntimeWarning, match="did not respond in time"):
+            AssertGitHubIssue(REPOSITORY_ID, backend).is_open(1)
+
+    @staticmethod
+    def test_it_raises_error_without_cached_value(requests_mock: MagicMock, backend):
+        requests_mock.get.side_effect = Timeout()
+
+        with pytest.raises(Timeout):
+            AssertGitHubIssue(REPOSITORY_ID, backend).is_open(2)
+
+
+def test_latency_budget_is_shared_by_all_repositories(backend):
+    with patch.dict("os.environ", {"GITHUB_LATENCY_BUDGET_IN_SECONDS": "10"}):
+        first, second = AssertGitHubIssue(REPOSITORY_ID, backend), AssertGitHubIssue("other/repository", backend)
+
+    assert first._latency is second._latency  # pylint: disable=protected-access
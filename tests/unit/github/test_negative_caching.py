@@ -0,0 +1,76 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+from requests import HTTPError
+
+from issue_watcher import AssertGitHubIssue
+from tests.unit.github.constants import ISSUE_NUMBER, REPOSITORY_ID
+from tests.unit.github.mocking import set_git_tags_to, set_issue_state, set_limit_exceeded
+
+
+class TestNegativeCaching:
+    @staticmethod
+    @pytest.mark.parametrize("status_code", [404, 410])
+    def test_it_reports_missing_issue_again_without_request(requests_mock: MagicMock, backend, status_code):
+        set_issue_state(requests_mock, "open", status_code)
+
+        for _ in range(2):
+            with pytest.raises(HTTPError, match=f"{status_code}"):
+                AssertGitHubIssue(REPOSITORY_ID, backend).is_open(ISSUE_NUMBER)
+
+        assert requests_mock.get.call_count == 1
+        assert backend.get(REPOSITORY_ID, f"errors/issues/{ISSUE_NUMBER}") is not None
+
+    @staticmethod
+    def test_it_reports_missing_version_tags_again_without_request(requests_mock: MagicMock, backend):
+        set_git_tags_to(requests_mock, [])
+
+        for _ in range(2):
+            with pytest.raises(AssertionError, match="No tags with a valid semantic versions"):
+                AssertGitHubIssue(REPOSITORY_ID, backend).fixed_in("1.0.0")
+
+        assert requests_mock.get.call_count == 1
+
+    @staticmethod
+    def test_it_does_not_remember_pattern_matching_no_tag(requests_mock: MagicMock, backend):
+        set_git_tags_to(requests_mock, ["v1.0.0"])
+
+        with pytest.raises(AssertionError, match="No tags with a valid semantic versions"):
+            AssertGitHubIssue(REPOSITORY_ID, backend).fixed_in("2.0.0", pattern="release-(?P<version>.*)")
+        AssertGitHubIssue(REPOSITORY_ID, backend).fixed_in("2.0.0", pattern="v(?P<version>.*)")
+
+        assert requests_mock.get.call_count == 2
+        assert backend.get(REPOSITORY_ID, "errors/latest_version") is None
+
+    @staticmethod
+    def test_it_remembers_exceeded_rate_limit_separately(requests_mock: MagicMock, backend):
+        set_limit_exceeded(requests_mock)
+
+        for _ in range(2):
+            with pytest.raises(HTTPError, match="Current quota"):
+                AssertGitHubIssue(REPOSITORY_ID, backend).is_open(ISSUE_NUMBER)
+
+        assert requests_mock.get.call_count == 1
+        assert backend.get(REPOSITORY_ID, f"rate_limit_errors/issues/{ISSUE_NUMBER}") is not None
+
+    @staticmethod
+    def test_it_does_not_remember_server_errors(requests_mock: MagicMock, backend):
+        set_issue_state(requests_mock, "open", 500)
+
+        for _ in range(2):
+            with pytest.raises(HTTPError):
+                AssertGitHubIssue(REPOSITORY_ID, backend).is_open(ISSUE_NUMBER)
+
+        assert requests_mock.get.call_count == 2
+
+    @staticmethod
+    def test_it_fetches_again_when_remembered_error_expires(requests_mock: MagicMock, backend):
+        set_issue_state(requests_mock, "open", 404)
+        with pytest.raises(HTTPError):
+            AssertGitHubIssue(REPOSITORY_ID, backend).is_open(ISSUE_NUMBER)
+
+        set_issue_state(requests_mock, "open")
+        with patch.dict("os.environ", {"CACHE_INVALIDATION_ERRORS_IN_SECONDS": "0"}):
+            AssertGitHubIssue(REPOSITORY_ID, backend).is_open(ISSUE_NUMBER)
+
+        assert requests_mock.get.call_count == 2
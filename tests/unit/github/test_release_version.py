@@ -97,3 +97,14 @@ class TestReleaseVersionCheck:
     ):
         with pytest.raises(ValueError, match=".*group.*"):
             assert_github_issue_no_cache.fixed_in("2.0.0", pattern="no_group")
+
+    @staticmethod
+    def test_it_streams_tags_without_parsing_whole_response(
+        assert_github_issue_no_cache: AssertGitHubIssue, requests_mock: MagicMock
+    ):
+        set_git_tags_to(requests_mock, ["1.0.0"])
+        assert_github_issue_no_cache.fixed_in("2.0.0")
+
+        assert requests_mock.get.call_args[1]["stream"] is True
+        requests_mock.get.return_value.json.assert_not_called()
+        requests_mock.get.return_value.close.assert_called_once()
@@ -0,0 +1,64 @@
+from time import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+from ujson import dumps, loads
+
+from issue_watcher import AssertGitHubIssue
+from issue_watcher.cache_backends import FileCacheBackend
+from issue_watcher.repository_state import reset_repository_states
+from tests.unit.github.constants import REPOSITORY_ID
+from tests.unit.github.mocking import set_git_tags_to, set_issue_state
+
+# False positive caused by pytest fixtures
+# pylint: disable=redefined-outer-name
+
+
+@pytest.fixture()
+def backend(backend: FileCacheBackend):
+    now = int(time())
+    # buckets with sampling fraction 0.25: latest_version -> 0, release_count -> 1, issues/2 -> 2
+    backend.set_many(
+        REPOSITORY_ID,
+        {"release_count": ("3", now - 9000), "issues/2": ("open", now - 7200), "latest_version": ("1.0.0", now - 7200)},
+    )
+    with patch.dict("os.environ", {"CACHE_SAMPLING_FRACTION": "0.25"}):
+        yield backend
+
+
+def _next_round(backend: FileCacheBackend):
+    """Moves the current sampling round to the past, as if the next run started later."""
+    entry = backend.get(REPOSITORY_ID, "sampling")
+    assert entry is not None
+    backend.set(REPOSITORY_ID, "sampling", (dumps([started_at - 600 for started_at in loads(entry[0])]), entry[1]))
+    reset_repository_states()
+
+
+class TestSampling:
+    @staticmethod
+    def test_it_refreshes_expired_value_of_first_bucket_right_away(requests_mock: MagicMock, backend):
+        set_git_tags_to(requests_mock, ["1.0.0"])
+
+        AssertGitHubIssue(REPOSITORY_ID, backend).fixed_in("2.0.0")
+
+        requests_mock.get.assert_called_once()
+
+    @staticmethod
+    def test_it_uses_expired_value_until_expired_for_as_many_rounds_as_its_bucket(requests_mock: MagicMock, backend):
+        set_issue_state(requests_mock, "closed")
+
+        for _ in range(2):
+            AssertGitHubIssue(REPOSITORY_ID, backend).is_open(2)  # release_count, expired longer, is never requested
+            _next_round(backend)
+        requests_mock.get.assert_not_called()
+
+        with pytest.raises(AssertionError, match="no longer open"):
+            AssertGitHubIssue(REPOSITORY_ID, backend).is_open(2)
+
+    @staticmethod
+    def test_it_fetches_values_missing_from_cache(requests_mock: MagicMock, backend):
+        set_issue_state(requests_mock, "open")
+
+        AssertGitHubIssue(REPOSITORY_ID, backend).is_open(3)
+
+        requests_mock.get.assert_called_once()
@@ -0,0 +1,28 @@
+from contextlib import contextmanager
+from unittest.mock import MagicMock, patch
+
+from issue_watcher import AssertGitHubIssue
+from issue_watcher.temporary_cache import TemporaryCache
+from tests.unit.github.constants import ISSUE_NUMBER, REPOSITORY_ID
+from tests.unit.github.mocking import set_issue_state
+
+
+class TestSharedCache:
+    @staticmethod
+    def test_it_does_not_fetch_value_stored_by_another_process_while_waiting_for_lock(
+        requests_mock: MagicMock, tmp_path
+    ):
+        set_issue_state(requests_mock, "closed")
+
+        with patch.dict("os.environ", {TemporaryCache._ENV_VAR_FILE: str(tmp_path / "cache.json")}):
+            assert_github_issue = AssertGitHubIssue(REPOSITORY_ID)
+
+            @contextmanager
+            def _lock_filled_by_other_process(_key):
+                TemporaryCache(REPOSITORY_ID)[f"issues/{ISSUE_NUMBER}"] = "open"
+                yield
+
+            with patch.object(assert_github_issue._cache, "lock", _lock_filled_by_other_process):
+                assert_github_issue.is_open(ISSUE_NUMBER)
+
+        requests_mock.get.assert_not_called()
@@ -5,6 +5,19 @@ import issue_watcher
 
 class TestLibraryTopLevelExports:  # pylint: disable=too-few-public-methods
     @staticmethod
-    @pytest.mark.parametrize("name", ["AssertGitHubIssue", "GitHubIssueState"])
+    @pytest.mark.parametrize(
+        "name",
+        [
+            "AssertGitHubIssue",
+            "GitHubIssueState",
+            "CacheBackend",
+            "FileCacheBackend",
+            "SharedDirectoryCacheBackend",
+            "RedisCacheBackend",
+            "MappedFileCacheBackend",
+            "DeferredAssertions",
+            "DeferredAssertionError",
+        ],
+    )
     def test_it_contains(name):
         assert hasattr(issue_watcher, name), f"'{name}' is not exported on top level."
@@ -0,0 +1,244 @@
+import os
+import subprocess
+import sys
+import threading
+from time import time
+
+import pytest
+
+from issue_watcher.cache_backends import (
+    CacheBackend,
+    FileCacheBackend,
+    RedisCacheBackend,
+    RedisError,
+    SharedDirectoryCacheBackend,
+)
+from issue_watcher.mapped_cache_backend import MappedFileCacheBackend
+from tests.helpers.redis_stand_in import RedisStandIn, running_redis_stand_in
+
+# False positive caused by pytest fixtures
+# pylint: disable=redefined-outer-name
+
+_NAMESPACE = "radeklat/issue-watcher"
+_OTHER_NAMESPACE = "radeklat/other"
+
+
+@pytest.fixture()
+def redis_stand_in():
+    yield from running_redis_stand_in()
+
+
+@pytest.fixture(params=["file", "directory", "mapped", "redis"])
+def backend(request, tmp_path) -> CacheBackend:
+    if request.param == "file":
+        return FileCacheBackend(str(tmp_path / "cache.json"))
+    if request.param == "directory":
+        return SharedDirectoryCacheBackend(str(tmp_path / "shared"))
+    if request.param == "mapped":
+        return MappedFileCacheBackend(str(tmp_path / "cache.bin"))
+    return RedisCacheBackend(request.getfixturevalue("redis_stand_in").url)
+
+
+class TestCacheBackend:
+    @staticmethod
+    def test_it_returns_stored_entry(backend: CacheBackend):
+        backend.set(_NAMESPACE, "key", ("value", 10))
+        entry = backend.get(_NAMESPACE, "key")
+        assert entry is not None
+        assert tuple(entry) == ("value", 10)
+
+    @staticmethod
+    def test_it_returns_none_for_missing_entry(backend: CacheBackend):
+        assert backend.get(_NAMESPACE, "key") is None
+
+    @staticmethod
+    def test_it_returns_only_existing_entries_from_bulk_lookup(backend: CacheBackend):
+        backend.set_many(_NAMESPACE, {"a": ("1", 10), "b": ("2", 10)})
+        entries = backend.get_many(_NAMESPACE, ["a", "b", "c"])
+        assert {key: tuple(entry) for key, entry in entries.items()} == {"a": ("1", 10), "b": ("2", 10)}
+
+    @staticmethod
+    def test_it_returns_all_entries_of_namespace(backend: CacheBackend):
+        backend.set_many(_NAMESPACE, {"a": ("1", 10), "b": ("2", 10)})
+        backend.set(_OTHER_NAMESPACE, "c", ("3", 10))
+        entries = backend.get_all(_NAMESPACE)
+        assert {key: tuple(entry) for key, entry in entries.items()} == {"a": ("1", 10), "b": ("2", 10)}
+
+    @staticmethod
+    def test_it_separates_namespaces(backend: CacheBackend):
+        backend.set(_NAMESPACE, "key", ("value", 10))
+        assert backend.get(_OTHER_NAMESPACE, "key") is None
+
+    @staticmethod
+    def test_it_deletes_entry(backend: CacheBackend):
+        backend.set_many(_NAMESPACE, {"a": ("1", 10), "b": ("2", 10)})
+        backend.delete(_NAMESPACE, "a")
+        assert list(backend.get_many(_NAMESPACE, ["a", "b"])) == ["b"]
+
+    @staticmethod
+    def test_it_expires_old_entries(backend: CacheBackend):
+        backend.set_many(_NAMESPACE, {"old": ("1", 10), "new": ("2", 20)})
+        backend.expire(_NAMESPACE, 15)
+        assert list(backend.get_many(_NAMESPACE, ["old", "new"])) == ["new"]
+
+    @staticmethod
+    def test_it_lists_namespaces(backend: CacheBackend):
+        backend.set(_NAMESPACE, "key", ("value", 10))
+        backend.set(_OTHER_NAMESPACE, "key", ("value", 10))
+        with backend.lock(_NAMESPACE, "key"):
+            assert sorted(backend.namespaces()) == [_NAMESPACE, _OTHER_NAMESPACE]
+
+    @staticmethod
+    def test_it_clears_all_namespaces(backend: CacheBackend):
+        backend.set(_NAMESPACE, "key", ("value", 10))
+        backend.set(_OTHER_NAMESPACE, "key", ("value", 10))
+        backend.clear()
+        assert backend.get(_NAMESPACE, "key") is None
+        assert backend.get(_OTHER_NAMESPACE, "key") is None
+
+    @staticmethod
+    def test_it_locks_key_for_other_users(backend: CacheBackend):
+        acquired = threading.Event()
+
+        def _acquire():
+            with backend.lock(_NAMESPACE, "key"):
+                acquired.set()
+
+        with backend.lock(_NAMESPACE, "key"):
+            thread = threading.Thread(target=_acquire)
+            thread.start()
+            assert not acquired.wait(0.2)
+
+        thread.join(5)
+        assert acquired.is_set()
+
+
+class TestFileCacheBackendLock:
+    @staticmethod
+    def test_it_keeps_a_single_lock_file_for_all_keys(tmp_path):
+        backend = FileCacheBackend(str(tmp_path / "cache.json"))
+        for key in range(100):
+            with backend.lock(_NAMESPACE, str(key)):
+                pass
+
+        assert [path.name for path in tmp_path.iterdir()] == ["cache.json.key-locks"]
+
+    @staticmethod
+    def test_it_locks_key_for_other_processes(tmp_path):
+        cache_file = str(tmp_path / "cache.json")
+        script = (
+            "from issue_watcher.cache_backends import FileCacheBackend\n"
+            f"with FileCacheBackend({cache_file!r}).lock({_NAMESPACE!r}, 'key'):\n"
+            "    pass\n"
+        )
+
+        with FileCacheBackend(cache_file).lock(_NAMESPACE, "key"):
+            process = subprocess.Popen(  # pylint: disable=consider-using-with
+                [sys.executable, "-c", script], env={**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)}
+            )
+            with pytest.raises(subprocess.TimeoutExpired):
+                process.wait(0.5)
+
+        assert process.wait(10) == 0
+
+
+class TestSharedDirectoryCacheBackend:
+    @staticmethod
+    def test_it_stores_each_namespace_in_own_file(tmp_path):
+        backend = SharedDirectoryCacheBackend(str(tmp_path))
+        backend.set(_NAMESPACE, "key", ("value", int(time())))
+        backend.set(_OTHER_NAMESPACE, "key", ("value", int(time())))
+
+        assert sorted(path.name for path in tmp_path.glob("*.json")) == [
+            "radeklat%2Fissue-watcher.json",
+            "radeklat%2Fother.json",
+        ]
+        assert sorted(backend.namespaces()) == [_NAMESPACE, _OTHER_NAMESPACE]
+
+
+class TestMappedFileCacheBackend:
+    @staticmethod
+    def test_it_grows_and_keeps_all_entries(tmp_path):
+        backend = MappedFileCacheBackend(str(tmp_path / "cache.bin"))
+        for batch in range(10):
+            backend.set_many(_NAMESPACE, {f"{batch}/{number}": (str(number), batch) for number in range(50)})
+
+        assert len(backend.get_all(_NAMESPACE)) == 500
+        assert tuple(backend.get(_NAMESPACE, "9/49")) == ("49", 9)
+
+    @staticmethod
+    def test_it_replaces_entries_in_place(tmp_path):
+        backend = MappedFileCacheBackend(str(tmp_path / "cache.bin"))
+        backend.set(_NAMESPACE, "key", ("first", 10))
+        size = (tmp_path / "cache.bin").stat().st_size
+
+        backend.set(_NAMESPACE, "key", ("second", 20))
+
+        assert tuple(backend.get(_NAMESPACE, "key")) == ("second", 20)
+        assert (tmp_path / "cache.bin").stat().st_size < size * 2
+
+    @staticmethod
+    def test_it_stores_each_namespace_once(tmp_path):
+        long_namespace = "owner/" + "r" * 1000
+        backend = MappedFileCacheBackend(str(tmp_path / "cache.bin"))
+        backend.set_many(long_namespace, {str(number): ("value", 10) for number in range(100)})
+        backend.set(_NAMESPACE, "key", ("other", 20))
+
+        assert (tmp_path / "cache.bin").stat().st_size < 2 * len(long_namespace) + 100 * 50
+        assert backend.namespaces() == [long_namespace, _NAMESPACE]
+        assert backend.get_all(_NAMESPACE) == {"key": ("other", 20)}
+        assert len(backend.get_all(long_namespace)) == 100
+
+    @staticmethod
+    def test_it_reuses_slots_of_deleted_entries(tmp_path):
+        backend = MappedFileCacheBackend(str(tmp_path / "cache.bin"))
+        backend.set_many(_NAMESPACE, {"a": ("1", 10), "b": ("2", 10)})
+        backend.delete(_NAMESPACE, "a")
+        backend.set(_NAMESPACE, "a", ("3", 20))
+
+        assert {key: tuple(entry) for key, entry in backend.get_all(_NAMESPACE).items()} == {
+            "a": ("3", 20),
+            "b": ("2", 10),
+        }
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        "content",
+        [
+            pytest.param(b"", id="empty"),
+            pytest.param(b'{"radeklat/issue-watcher": {}}', id="JSON"),
+            pytest.param(b"IWC\x02" + b"\xff" * 100, id="truncated"),
+        ],
+    )
+    def test_it_treats_invalid_file_as_empty(tmp_path, content: bytes):
+        path = tmp_path / "cache.bin"
+        path.write_bytes(content)
+        backend = MappedFileCacheBackend(str(path))
+
+        assert backend.get(_NAMESPACE, "key") is None
+        backend.set(_NAMESPACE, "key", ("value", 10))
+        entry = backend.get(_NAMESPACE, "key")
+        assert entry is not None
+        assert tuple(entry) == ("value", 10)
+
+
+class TestRedisCacheBackend:
+    @staticmethod
+    def test_it_looks_up_many_keys_with_one_command(redis_stand_in: RedisStandIn):
+        backend = RedisCacheBackend(redis_stand_in.url)
+        backend.set_many(_NAMESPACE, {str(key): ("value", 10) for key in range(100)})
+        redis_stand_in.commands.clear()
+
+        assert len(backend.get_many(_NAMESPACE, [str(key) for key in range(100)])) == 100
+        assert redis_stand_in.commands == ["HMGET"]
+
+    @staticmethod
+    def test_it_raises_error_replies(redis_stand_in: RedisStandIn):
+        backend = RedisCacheBackend(redis_stand_in.url)
+        with pytest.raises(RedisError, match="unknown command"):
+            backend._execute("FLUSHALL")
+
+    @staticmethod
+    def test_it_refuses_non_redis_url():
+        with pytest.raises(ValueError, match="redis://"):
+            RedisCacheBackend("http://localhost:6379")
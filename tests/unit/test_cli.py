@@ -0,0 +1,90 @@
+from unittest.mock import patch
+
+import pytest
+
+from issue_watcher.cli import main
+from issue_watcher.scan import ScanResult, WatcherCall
+from issue_watcher.temporary_cache import TemporaryCache
+
+
+class TestWebhookCommand:
+    @staticmethod
+    def test_it_serves_webhooks_until_interrupted():
+        with patch("issue_watcher.cli.WebhookServer") as server_class:
+            server_class.return_value.server_address = ("127.0.0.1", 8000)
+            server_class.return_value.serve_forever.side_effect = KeyboardInterrupt
+
+            assert main(["webhook", "--port", "8000", "--secret", "secret"]) == 0
+
+        server_class.assert_called_once_with(("127.0.0.1", 8000), "secret")
+        server_class.return_value.server_close.assert_called_once()
+
+    @staticmethod
+    def test_it_fails_without_secret():
+        with patch.dict("os.environ", {"GITHUB_WEBHOOK_SECRET": ""}):
+            assert main(["webhook", "--port", "0"]) == 2
+
+
+class TestScanCommand:
+    @staticmethod
+    @pytest.mark.parametrize("outcome,exit_code", [pytest.param("passed", 0), pytest.param("failed", 1)])
+    def test_it_exits_with(outcome, exit_code, tmp_path):
+        call = WatcherCall("owner/repo", "is_open", (1,), ())
+
+        with patch("issue_watcher.scan.discover", return_value={call: ["a.py:1"]}) as discover:
+            with patch("issue_watcher.scan.check", return_value=[ScanResult(call, ["a.py:1"], outcome)]):
+                assert main(["scan", "src", "--output", str(tmp_path / "report.json")]) == exit_code
+
+        discover.assert_called_once_with(["src"], None)
+        assert '"outcome":' in (tmp_path / "report.json").read_text(encoding="utf-8")
+
+    @staticmethod
+    def test_it_writes_junit_report_to_standard_output(capsys):
+        with patch("issue_watcher.scan.discover", return_value={}), patch("issue_watcher.scan.check", return_value=[]):
+            main(["scan", "src", "--format", "junit"])
+
+        assert capsys.readouterr().out.startswith("<testsuite")
+
+
+class TestWatchCommand:
+    @staticmethod
+    def test_it_watches_until_interrupted(tmp_path):
+        (tmp_path / "watchlist.json").write_text('[{"repository": "owner/repo", "is_open": 1}]', encoding="utf-8")
+
+        with patch("issue_watcher.watch.Watcher") as watcher_class:
+            watcher_class.return_value.run.side_effect = KeyboardInterrupt
+
+            assert main(["watch", str(tmp_path / "watchlist.json"), "--workers", "4", "--rate", "2"]) == 0
+
+        assert watcher_class.call_args[0][2:] == (4, 2.0)
+        watcher_class.return_value.stop.assert_called_once()
+
+    @staticmethod
+    def test_it_fails_on_invalid_watchlist(tmp_path):
+        (tmp_path / "watchlist.json").write_text("{}", encoding="utf-8")
+        assert main(["watch", str(tmp_path / "watchlist.json")]) == 2
+
+
+class TestCacheCommand:
+    @staticmethod
+    def test_it_exports_and_imports_snapshots(tmp_path):
+        env = {"CACHE_FILE_PATH": str(tmp_path / "cache.json")}
+        with patch.dict("os.environ", env):
+            TemporaryCache("owner/repo")["issues/1"] = "open"
+
+            assert main(["cache", "export", str(tmp_path / "snapshot.json.gz")]) == 0
+            TemporaryCache("owner/repo").clear()
+            assert main(["cache", "import", str(tmp_path / "snapshot.json.gz")]) == 0
+
+            assert TemporaryCache("owner/repo")["issues/1"] == "open"
+
+    @staticmethod
+    def test_it_fails_on_missing_snapshot(tmp_path):
+        assert main(["cache", "import", str(tmp_path / "missing.json")]) == 2
+
+
+class TestMain:
+    @staticmethod
+    def test_it_requires_command():
+        with pytest.raises(SystemExit):
+            main([])
@@ -0,0 +1,73 @@
+from time import time
+
+import pytest
+
+from issue_watcher.credentials import CredentialPool
+
+_FIRST = ("first", "token 1")
+_SECOND = ("second", "token 2")
+
+
+def _rate_limit(remaining: int, reset_in: float = 3600):
+    return {"X-RateLimit-Remaining": str(remaining), "X-RateLimit-Reset": str(int(time() + reset_in))}
+
+
+class TestCredentialPool:
+    @staticmethod
+    def test_it_uses_credentials_round_robin_when_budgets_are_unknown():
+        pool = CredentialPool([_FIRST, _SECOND])
+        assert [pool.acquire() for _ in range(4)] == [_FIRST, _SECOND, _FIRST, _SECOND]
+
+    @staticmethod
+    def test_it_uses_credential_with_most_remaining_requests():
+        pool = CredentialPool([_FIRST, _SECOND])
+        pool.update(_FIRST, _rate_limit(4000))
+        pool.update(_SECOND, _rate_limit(10))
+
+        assert [pool.acquire() for _ in range(3)] == [_FIRST] * 3
+
+    @staticmethod
+    def test_it_parks_exhausted_credential_until_reset():
+        pool = CredentialPool([_FIRST, _SECOND])
+        pool.update(_FIRST, _rate_limit(0))
+        pool.update(_SECOND, _rate_limit(1))
+
+        assert pool.acquire() == _SECOND
+
+        pool.update(_FIRST, _rate_limit(0, reset_in=-1))
+
+        assert pool.acquire() == _FIRST
+
+    @staticmethod
+    def test_it_returns_credential_resetting_first_when_all_are_exhausted():
+        pool = CredentialPool([_FIRST, _SECOND])
+        pool.update(_FIRST, _rate_limit(0, reset_in=600))
+        pool.update(_SECOND, _rate_limit(0, reset_in=60))
+
+        assert not pool.has_available()
+        assert pool.acquire() == _SECOND
+
+    @staticmethod
+    def test_it_ignores_responses_without_rate_limit_headers():
+        pool = CredentialPool([_FIRST])
+        pool.update(_FIRST, {})
+        assert pool.has_available()
+
+    @staticmethod
+    def test_it_reads_credentials_from_file(tmp_path):
+        (tmp_path / "credentials").write_text("# CI tokens\nfirst:token 1\n\nsecond:token 2\n", encoding="utf-8")
+        assert len(CredentialPool.from_file(str(tmp_path / "credentials"))) == 2
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        "content",
+        [
+            pytest.param("token-only\n", id="no user name"),
+            pytest.param("# nothing\n", id="no credentials"),
+        ],
+    )
+    def test_it_refuses_invalid_file(tmp_path, content):
+        (tmp_path / "credentials").write_text(content, encoding="utf-8")
+
+        with pytest.raises(ValueError):
+            CredentialPool.from_file(str(tmp_path / "credentials"))
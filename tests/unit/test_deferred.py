@@ -0,0 +1,82 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from issue_watcher import AssertGitHubIssue
+from issue_watcher.deferred import DeferredAssertionError, DeferredAssertions
+from tests.unit.github.constants import ISSUE_NUMBER, REPOSITORY_ID
+from tests.unit.github.mocking import set_issue_state
+
+
+@pytest.fixture(autouse=True)
+def no_cache():
+    with patch.dict("os.environ", {"CACHE_INVALIDATION_IN_SECONDS": "0"}):
+        yield
+
+
+class TestDeferredAssertions:
+    @staticmethod
+    def test_it_only_registers_assertions_while_started(requests_mock: MagicMock):
+        with DeferredAssertions():
+            AssertGitHubIssue(REPOSITORY_ID).is_open(ISSUE_NUMBER)
+            AssertGitHubIssue(REPOSITORY_ID).current_release(1)
+            AssertGitHubIssue(REPOSITORY_ID).fixed_in("1.0.0")
+
+        requests_mock.get.assert_not_called()
+
+    @staticmethod
+    def test_it_checks_each_unique_assertion_once(requests_mock: MagicMock):
+        set_issue_state(requests_mock, "open")
+
+        with DeferredAssertions() as deferred:
+            for _ in range(3):
+                AssertGitHubIssue(REPOSITORY_ID).is_open(ISSUE_NUMBER)
+
+        deferred.verify()
+
+        assert requests_mock.get.call_count == 1
+
+    @staticmethod
+    def test_it_reports_all_failures_in_one_error_with_their_origin(requests_mock: MagicMock):
+        set_issue_state(requests_mock, "closed")
+
+        with DeferredAssertions() as deferred:
+            with patch.dict("os.environ", {"PYTEST_CURRENT_TEST": "tests/test_a.py::test_one (call)"}):
+                AssertGitHubIssue(REPOSITORY_ID).is_open(ISSUE_NUMBER)
+            with patch.dict("os.environ", {"PYTEST_CURRENT_TEST": "tests/test_b.py::test_two (call)"}):
+                AssertGitHubIssue(REPOSITORY_ID).is_open(ISSUE_NUMBER)
+                AssertGitHubIssue(REPOSITORY_ID).is_open(ISSUE_NUMBER + 1)
+
+        with pytest.raises(DeferredAssertionError) as error:
+            deferred.verify()
+
+        assert len(error.value.failures) == 2
+        assert "is no longer open" in str(error.value)
+        assert error.value.failures[0].locations == ["tests/test_a.py::test_one", "tests/test_b.py::test_two"]
+
+    @staticmethod
+    def test_it_attributes_assertions_outside_of_tests_to_the_caller(requests_mock: MagicMock):
+        set_issue_state(requests_mock, "closed")
+
+        with patch.dict(
+            "os.environ", {"CACHE_INVALIDATION_IN_SECONDS": "0"}, clear=True
+        ), DeferredAssertions() as deferred:
+            AssertGitHubIssue(REPOSITORY_ID).is_open(ISSUE_NUMBER)
+
+        (result,) = deferred.resolve()
+        assert result.locations[0].startswith(__file__)
+
+    @staticmethod
+    def test_it_validates_arguments_right_away():
+        with DeferredAssertions(), pytest.raises(ValueError):
+            AssertGitHubIssue(REPOSITORY_ID).fixed_in("1.0.0", pattern="no group")
+
+    @staticmethod
+    def test_it_checks_assertions_right_away_after_stopping(requests_mock: MagicMock):
+        set_issue_state(requests_mock, "closed")
+
+        with DeferredAssertions():
+            pass
+
+        with pytest.raises(AssertionError):
+            AssertGitHubIssue(REPOSITORY_ID).is_open(ISSUE_NUMBER)
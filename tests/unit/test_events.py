@@ -0,0 +1,53 @@
+import pytest
+
+from issue_watcher.events import digest_events
+
+
+def _event(event_id: int, event_type: str, created_at: str = "2022-01-01T00:00:00Z", **payload):
+    return {"id": str(event_id), "type": event_type, "created_at": created_at, "payload": payload}
+
+
+class TestDigestEvents:
+    @staticmethod
+    @pytest.mark.parametrize(
+        "event,keys",
+        [
+            pytest.param(_event(1, "IssuesEvent", issue={"number": 5}), ["issues/5"], id="issue event"),
+            pytest.param(
+                _event(1, "CreateEvent", ref_type="tag"), ["release_count", "latest_version"], id="tag created"
+            ),
+            pytest.param(
+                _event(1, "DeleteEvent", ref_type="tag"), ["release_count", "latest_version"], id="tag deleted"
+            ),
+            pytest.param(_event(1, "ReleaseEvent"), ["release_count", "latest_version"], id="release"),
+            pytest.param(_event(1, "CreateEvent", ref_type="branch"), [], id="branch created"),
+            pytest.param(_event(1, "WatchEvent"), [], id="unrelated event"),
+        ],
+    )
+    def test_it_finds_keys_touched_by(event, keys):
+        assert sorted(digest_events([event], None).touched_keys) == sorted(keys)
+
+    @staticmethod
+    def test_it_ignores_events_already_seen():
+        events = [_event(3, "IssuesEvent", issue={"number": 3}), _event(2, "IssuesEvent", issue={"number": 2})]
+        digest = digest_events(events, "2")
+
+        assert list(digest.touched_keys) == ["issues/3"]
+        assert digest.newest_event_id == "3"
+        assert not digest.has_gap
+
+    @staticmethod
+    def test_it_reports_gap_when_last_seen_event_is_not_listed():
+        assert digest_events([_event(3, "WatchEvent")], "1").has_gap
+
+    @staticmethod
+    def test_it_keeps_time_of_latest_event_touching_key():
+        events = [
+            _event(2, "IssuesEvent", "2022-01-02T00:00:00Z", issue={"number": 1}),
+            _event(1, "IssuesEvent", "2022-01-01T00:00:00Z", issue={"number": 1}),
+        ]
+        assert digest_events(events, None).touched_keys == {"issues/1": 1641081600.0}
+
+    @staticmethod
+    def test_it_keeps_last_seen_event_when_no_events_are_listed():
+        assert digest_events([], "1").newest_event_id == "1"
@@ -0,0 +1,91 @@
+import threading
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from issue_watcher.constants import DEFAULT_REQUESTS_TIMEOUT_SEC
+from issue_watcher.latency import LatencyTracker
+
+
+def _observed(tracker: LatencyTracker, latency: float, count: int = 20) -> LatencyTracker:
+    for _ in range(count):
+        tracker.record(latency)
+    return tracker
+
+
+class TestLatencyBudget:
+    @staticmethod
+    def test_it_runs_out_when_spent():
+        tracker = _observed(LatencyTracker(budget=10), 0.4, count=24)
+        assert not tracker.exhausted
+
+        tracker.record(0.4)
+
+        assert tracker.exhausted
+
+    @staticmethod
+    def test_it_is_unlimited_by_default():
+        assert not _observed(LatencyTracker(), 100).exhausted
+
+
+class TestAdaptiveTimeout:
+    @staticmethod
+    @pytest.mark.parametrize(
+        "budget,latency,count,expected",
+        [
+            pytest.param(0, 1.0, 20, DEFAULT_REQUESTS_TIMEOUT_SEC, id="default without budget"),
+            pytest.param(1000, 1.0, 19, DEFAULT_REQUESTS_TIMEOUT_SEC, id="default until enough requests observed"),
+            pytest.param(1000, 2.0, 20, 8.0, id="multiple of p99 latency"),
+            pytest.param(1000, 0.01, 20, 2.0, id="at least minimal timeout"),
+            pytest.param(45, 2.0, 20, 5.0, id="limited by remaining budget"),
+        ],
+    )
+    def test_it_is(budget: float, latency: float, count: int, expected: float):
+        assert _observed(LatencyTracker(budget=budget), latency, count).timeout() == pytest.approx(expected)
+
+
+class TestHedging:
+    @staticmethod
+    def test_it_uses_duplicate_request_answering_first():
+        tracker = _observed(LatencyTracker(hedge=True), 0.01)
+        slow_response, fast_response = MagicMock(), MagicMock()
+        calls = []
+        lock = threading.Lock()
+
+        def _request(_timeout: float):
+            with lock:
+                calls.append(None)
+                first = len(calls) == 1
+            if first:
+                time.sleep(0.5)
+                return slow_response
+            return fast_response
+
+        started_at = time.monotonic()
+        assert tracker.call(_request) is fast_response
+        assert time.monotonic() - started_at < 0.4
+        assert len(calls) == 2
+
+        time.sleep(0.6)
+        slow_response.close.assert_called_once()
+
+    @staticmethod
+    def test_it_does_not_hedge_until_enough_requests_observed():
+        tracker = LatencyTracker(hedge=True)
+        request = MagicMock()
+
+        tracker.call(request)
+
+        request.assert_called_once()
+
+    @staticmethod
+    def test_it_raises_error_when_all_requests_fail():
+        tracker = _observed(LatencyTracker(hedge=True), 0.01)
+
+        def _request(_timeout: float):
+            time.sleep(0.05)
+            raise ConnectionError("failed")
+
+        with pytest.raises(ConnectionError):
+            tracker.call(_request)
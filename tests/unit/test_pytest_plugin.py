@@ -0,0 +1,111 @@
+import time
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from issue_watcher import AssertGitHubIssue, pytest_plugin
+from issue_watcher.temporary_cache import TemporaryCache
+from tests.unit.github.mocking import set_issue_state
+
+_REPOSITORY_ID = "owner/repo"
+
+
+@pytest.fixture()
+def cache_file(tmp_path):
+    with patch.dict("os.environ", {TemporaryCache._ENV_VAR_FILE: str(tmp_path / "cache.json")}):
+        yield tmp_path / "cache.json"
+
+
+class TestPrefetch:
+    @staticmethod
+    @pytest.mark.usefixtures("cache_file")
+    def test_it_fetches_each_unique_assertion_once(requests_mock: MagicMock, tmp_path):
+        for name in ("test_a.py", "test_b.py"):
+            (tmp_path / name).write_text(f"AssertGitHubIssue({_REPOSITORY_ID!r}).is_open(1)\n", encoding="utf-8")
+        set_issue_state(requests_mock, "open")
+
+        entries = pytest_plugin.prefetch([str(tmp_path)], threads=4)
+
+        assert requests_mock.get.call_count == 1
+        assert entries[_REPOSITORY_ID]["issues/1"][0] == "open"
+
+
+class TestXdist:
+    @staticmethod
+    def test_controller_sends_prefetched_entries_to_workers():
+        entries = {_REPOSITORY_ID: {"issues/1": ("open", 10)}}
+        plugin = pytest_plugin._Prefetch()
+        node = SimpleNamespace(workerinput={})
+
+        with patch.object(pytest_plugin, "prefetch", return_value=entries) as prefetch:
+            plugin.pytest_sessionstart(
+                SimpleNamespace(config=SimpleNamespace(args=["tests/test_a.py::test_it", "src"]))
+            )
+        plugin.pytest_configure_node(node)
+
+        prefetch.assert_called_once_with(["tests/test_a.py", "src"])
+        assert node.workerinput == {pytest_plugin._WORKER_INPUT_KEY: entries}
+
+    @staticmethod
+    @pytest.mark.usefixtures("cache_file")
+    def test_worker_merges_entries_into_its_cache():
+        entries = {_REPOSITORY_ID: {"issues/1": ["open", int(time.time())]}}
+
+        config = MagicMock(spec=["getoption", "getini", "pluginmanager", "workerinput"])
+        config.getoption.return_value = config.getini.return_value = False
+        config.workerinput = {pytest_plugin._WORKER_INPUT_KEY: entries}
+
+        pytest_plugin.pytest_configure(config)
+
+        assert TemporaryCache(_REPOSITORY_ID)["issues/1"] == "open"
+
+    @staticmethod
+    @pytest.mark.parametrize("enabled", [pytest.param(True, id="enabled"), pytest.param(False, id="disabled")])
+    def test_controller_prefetches_only_when_enabled(enabled):
+        config = MagicMock(spec=["getoption", "getini", "pluginmanager"])
+        config.getoption.return_value = enabled
+        config.getini.return_value = False
+
+        pytest_plugin.pytest_configure(config)
+
+        assert config.pluginmanager.register.called == enabled
+
+
+class TestDeferred:
+    @staticmethod
+    def test_it_fails_session_and_reports_failed_assertions(requests_mock: MagicMock):
+        set_issue_state(requests_mock, "closed")
+        session = SimpleNamespace(config=SimpleNamespace(), exitstatus=pytest.ExitCode.OK)
+        reporter = MagicMock()
+        plugin = pytest_plugin._Deferred()
+
+        plugin.pytest_sessionstart()
+        with patch.dict("os.environ", {"CACHE_INVALIDATION_IN_SECONDS": "0"}):
+            AssertGitHubIssue(_REPOSITORY_ID).is_open(1)
+            plugin.pytest_sessionfinish(session)
+        plugin.pytest_terminal_summary(reporter)
+
+        assert session.exitstatus == pytest.ExitCode.TESTS_FAILED
+        assert "is no longer open" in reporter.line.call_args_list[1][0][0]
+
+    @staticmethod
+    def test_worker_sends_failures_to_controller(requests_mock: MagicMock):
+        set_issue_state(requests_mock, "closed")
+        worker_session = SimpleNamespace(
+            config=SimpleNamespace(workerinput={}, workeroutput={}), exitstatus=pytest.ExitCode.OK
+        )
+        controller_session = SimpleNamespace(config=SimpleNamespace(), exitstatus=pytest.ExitCode.OK)
+        worker, controller = pytest_plugin._Deferred(), pytest_plugin._Deferred()
+
+        worker.pytest_sessionstart()
+        with patch.dict("os.environ", {"CACHE_INVALIDATION_IN_SECONDS": "0"}):
+            AssertGitHubIssue(_REPOSITORY_ID).is_open(1)
+            worker.pytest_sessionfinish(worker_session)
+
+        controller.pytest_sessionstart()
+        controller.pytest_testnodedown(SimpleNamespace(workeroutput=worker_session.config.workeroutput), None)
+        controller.pytest_sessionfinish(controller_session)
+
+        assert len(worker_session.config.workeroutput[pytest_plugin._WORKER_OUTPUT_KEY]) == 1
+        assert controller_session.exitstatus == pytest.ExitCode.TESTS_FAILED
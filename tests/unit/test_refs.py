@@ -0,0 +1,94 @@
+import json
+from typing import Iterator, List
+
+import pytest
+
+from issue_watcher.refs import iter_advertised_tags, iter_refs
+from tests.helpers.git_stand_in import pkt_line, ref_advertisement
+
+
+def _github_refs(tags: List[str]) -> bytes:
+    return json.dumps(
+        [
+            {
+                "ref": f"refs/tags/{tag}",
+                "node_id": "MDM6UmVmcmVmcy90YWdzLzEuMC4w",
+                "url": f"https://api.github.com/repos/owner/repo/git/refs/tags/{tag}",
+                "object": {"sha": "a" * 40, "type": "commit", "url": "https://api.github.com/..."},
+            }
+            for tag in tags
+        ],
+        indent=2,
+    ).encode("utf-8")
+
+
+def _chunks(body: bytes, chunk_size: int) -> Iterator[bytes]:
+    return (body[start : start + chunk_size] for start in range(0, len(body), chunk_size))
+
+
+class TestIterRefs:
+    @staticmethod
+    @pytest.mark.parametrize("chunk_size", [1, 2, 3, 5, 7, 64, 1 << 16])
+    def test_it_yields_all_refs_regardless_of_chunk_boundaries(chunk_size: int):
+        tags = ["1.0.0", "v2.0.0", "release/3.0.0rc1", "ünïcode-4"]
+        assert list(iter_refs(_chunks(_github_refs(tags), chunk_size))) == [f"refs/tags/{tag}" for tag in tags]
+
+    @staticmethod
+    def test_it_decodes_escaped_characters():
+        body = _github_refs(['quoted"tag', "back\\slash"])
+        assert list(iter_refs(_chunks(body, 4))) == ['refs/tags/quoted"tag', "refs/tags/back\\slash"]
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        "body",
+        [
+            pytest.param(b"[]", id="empty list"),
+            pytest.param(b'{"message": "Not Found"}', id="error message"),
+            pytest.param(b'[{"url": "https://api.github.com/repos/owner/repo/git/refs"}]', id="refs only in URLs"),
+        ],
+    )
+    def test_it_yields_nothing_for(body: bytes):
+        assert not list(iter_refs(_chunks(body, 3)))
+
+
+class TestIterAdvertisedTags:
+    @staticmethod
+    @pytest.mark.parametrize("chunk_size", [1, 2, 3, 5, 7, 64, 1 << 16])
+    def test_it_yields_all_tags_regardless_of_chunk_boundaries(chunk_size: int):
+        tags = ["1.0.0", "v2.0.0", "release/3.0.0rc1", "ünïcode-4"]
+        body = ref_advertisement(tags)
+        assert list(iter_advertised_tags(_chunks(body, chunk_size))) == [f"refs/tags/{tag}" for tag in tags]
+
+    @staticmethod
+    def test_it_skips_peeled_tags():
+        body = ref_advertisement(["1.0.0", "2.0.0"], annotated=True)
+        assert list(iter_advertised_tags(_chunks(body, 5))) == ["refs/tags/1.0.0", "refs/tags/2.0.0"]
+
+    @staticmethod
+    def test_it_reads_tag_advertised_first_with_capabilities():
+        body = b"0000" + pkt_line(b"%s refs/tags/1.0.0\0multi_ack side-band-64k\n" % (b"1" * 40)) + b"0000"
+        assert list(iter_advertised_tags(_chunks(body, 3))) == ["refs/tags/1.0.0"]
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        "body",
+        [
+            pytest.param(ref_advertisement([]), id="no tags"),
+            pytest.param(pkt_line(b"# service=git-upload-pack\n") + b"0000" + b"0000", id="empty repository"),
+            pytest.param(b"", id="empty body"),
+        ],
+    )
+    def test_it_yields_nothing_for(body: bytes):
+        assert not list(iter_advertised_tags(_chunks(body, 3)))
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        "body,message",
+        [
+            pytest.param(pkt_line(b"ERR access denied\n"), "access denied", id="server error"),
+            pytest.param(b'[{"ref": "refs/tags/1.0.0"}]', "Invalid pkt-line length", id="not pkt-lines"),
+        ],
+    )
+    def test_it_fails_on(body: bytes, message: str):
+        with pytest.raises(ValueError, match=message):
+            list(iter_advertised_tags(_chunks(body, 3)))
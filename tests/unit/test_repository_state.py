@@ -0,0 +1,65 @@
+import warnings
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from issue_watcher import AssertGitHubIssue
+from issue_watcher.repository_state import reset_repository_states, shared_repository_state
+from tests.unit.github.constants import REPOSITORY_ID
+
+
+class TestSharedRepositoryState:
+    @staticmethod
+    def test_it_is_created_once_per_repository():
+        with patch.dict("os.environ", {"CACHE_INVALIDATION_IN_SECONDS": "0"}), patch(
+            "issue_watcher.repository_state.TemporaryCache"
+        ) as temporary_cache:
+            states = [shared_repository_state(REPOSITORY_ID) for _ in range(3)]
+            AssertGitHubIssue(REPOSITORY_ID)
+
+        assert states[0] is states[1] is states[2]
+        temporary_cache.assert_called_once()
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        "other_repository_id,other_environment,other_backend",
+        [
+            pytest.param("other/repository", {}, None, id="repository"),
+            pytest.param(REPOSITORY_ID, {"CACHE_INVALIDATION_IN_SECONDS": "10"}, None, id="cache configuration"),
+            pytest.param(
+                REPOSITORY_ID, {"GITHUB_USER_NAME": "u", "GITHUB_PERSONAL_ACCESS_TOKEN": "t"}, None, id="auth"
+            ),
+            pytest.param(REPOSITORY_ID, {}, MagicMock(), id="cache backend"),
+        ],
+    )
+    def test_it_is_not_shared_with_different(other_repository_id, other_environment, other_backend):
+        with patch.dict("os.environ", {"CACHE_INVALIDATION_IN_SECONDS": "0"}):
+            state = shared_repository_state(REPOSITORY_ID)
+            with patch.dict("os.environ", other_environment):
+                other_state = shared_repository_state(other_repository_id, other_backend)
+
+        assert other_state is not state
+
+    @staticmethod
+    def test_it_is_shared_when_unrelated_environment_variables_change():
+        with patch.dict("os.environ", {"CACHE_INVALIDATION_IN_SECONDS": "0", "PYTEST_CURRENT_TEST": "first"}):
+            state = shared_repository_state(REPOSITORY_ID)
+            with patch.dict("os.environ", {"PYTEST_CURRENT_TEST": "second", "HOME": "/somewhere/else"}):
+                assert shared_repository_state(REPOSITORY_ID) is state
+
+    @staticmethod
+    def test_it_is_created_again_after_reset():
+        with patch.dict("os.environ", {"CACHE_INVALIDATION_IN_SECONDS": "0"}):
+            state = shared_repository_state(REPOSITORY_ID)
+            reset_repository_states()
+            assert shared_repository_state(REPOSITORY_ID) is not state
+
+    @staticmethod
+    def test_it_warns_about_improper_configuration_once():
+        with patch.dict("os.environ", {"GITHUB_USER_NAME": "some user", "CACHE_INVALIDATION_IN_SECONDS": "0"}):
+            with warnings.catch_warnings(record=True) as caught:
+                warnings.simplefilter("always")
+                for _ in range(3):
+                    AssertGitHubIssue(REPOSITORY_ID)
+
+        assert len(caught) == 1
@@ -0,0 +1,110 @@
+import textwrap
+from unittest.mock import MagicMock, patch
+from xml.etree import ElementTree
+
+import pytest
+from ujson import loads
+
+from issue_watcher import scan
+from issue_watcher.scan import ScanResult, WatcherCall
+
+_SOURCE = textwrap.dedent("""
+    import issue_watcher
+    from issue_watcher import AssertGitHubIssue
+
+    REPOSITORY = "pyupio/safety"
+
+    def test_open():
+        AssertGitHubIssue("pyupio/safety").is_open(119, "Check if safety can be enabled on Windows.")
+
+    def test_fixed_in():
+        issue_watcher.AssertGitHubIssue("pyupio/safety").fixed_in("2.0.0", pattern="releases/(?P<version>.*)")
+
+    def test_not_literal():
+        AssertGitHubIssue(REPOSITORY).is_closed(1)
+        AssertGitHubIssue("pyupio/safety").current_release(len([]))
+
+    def test_unrelated():
+        AssertGitHubIssue("pyupio/safety").is_state(1, None)
+    """)
+
+_OPEN = WatcherCall("pyupio/safety", "is_open", (119, "Check if safety can be enabled on Windows."), ())
+_FIXED_IN = WatcherCall("pyupio/safety", "fixed_in", ("2.0.0",), (("pattern", "releases/(?P<version>.*)"),))
+
+
+@pytest.fixture()
+def source_tree(tmp_path):
+    (tmp_path / "tests").mkdir()
+    (tmp_path / "tests" / "test_a.py").write_text(_SOURCE, encoding="utf-8")
+    (tmp_path / "tests" / "test_b.py").write_text(_SOURCE, encoding="utf-8")
+    (tmp_path / "tests" / "test_broken.py").write_text("AssertGitHubIssue(", encoding="utf-8")
+    (tmp_path / ".venv").mkdir()
+    (tmp_path / ".venv" / "test_hidden.py").write_text(_SOURCE, encoding="utf-8")
+    return tmp_path
+
+
+class TestDiscover:
+    @staticmethod
+    def test_it_finds_calls_with_literal_arguments_only(source_tree):
+        path = str(source_tree / "tests" / "test_a.py")
+        assert scan.discover_file(path) == [(_OPEN, f"{path}:8"), (_FIXED_IN, f"{path}:11")]
+
+    @staticmethod
+    def test_it_ignores_files_that_cannot_be_parsed(source_tree):
+        assert not scan.discover_file(str(source_tree / "tests" / "test_broken.py"))
+
+    @staticmethod
+    def test_it_deduplicates_calls_from_all_files_and_skips_hidden_directories(source_tree):
+        calls = scan.discover([str(source_tree)], workers=2)
+
+        assert set(calls) == {_OPEN, _FIXED_IN}
+        assert sorted(location.rsplit("/", 1)[1] for location in calls[_OPEN]) == ["test_a.py:8", "test_b.py:8"]
+
+
+class TestCheck:
+    @staticmethod
+    def test_it_reports_outcome_of_each_call():
+        with patch("issue_watcher.scan.AssertGitHubIssue") as assert_class:
+            assert_class.return_value.is_open.side_effect = AssertionError("no longer open")
+            assert_class.return_value.fixed_in.side_effect = ValueError("bad pattern")
+            assert_class.return_value.is_closed = MagicMock()
+
+            results = scan.check(
+                {
+                    _OPEN: ["a.py:1"],
+                    _FIXED_IN: ["b.py:2"],
+                    WatcherCall("owner/repo", "is_closed", (1,), ()): ["c.py:3"],
+                },
+                workers=2,
+            )
+
+        assert [(result.outcome, result.message) for result in results] == [
+            ("failed", "no longer open"),
+            ("error", "ValueError: bad pattern"),
+            ("passed", ""),
+        ]
+        assert_class.return_value.fixed_in.assert_called_once_with("2.0.0", pattern="releases/(?P<version>.*)")
+
+
+_RESULTS = [
+    ScanResult(_OPEN, ["a.py:1"], "failed", "no longer open"),
+    ScanResult(_FIXED_IN, ["b.py:2", "c.py:3"], "passed"),
+]
+
+
+class TestReports:
+    @staticmethod
+    def test_it_renders_json():
+        report = loads(scan.to_json(_RESULTS))
+        assert (
+            report[0]["call"]
+            == "AssertGitHubIssue('pyupio/safety').is_open(119, 'Check if safety can be enabled on Windows.')"
+        )
+        assert report[1]["kwargs"] == {"pattern": "releases/(?P<version>.*)"}
+        assert [item["outcome"] for item in report] == ["failed", "passed"]
+
+    @staticmethod
+    def test_it_renders_junit():
+        suite = ElementTree.fromstring(scan.to_junit(_RESULTS))
+        assert (suite.get("tests"), suite.get("failures"), suite.get("errors")) == ("2", "1", "0")
+        assert suite.find("testcase/failure").get("message") == "no longer open"
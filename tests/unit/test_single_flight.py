@@ -0,0 +1,70 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+
+import pytest
+
+from issue_watcher.single_flight import SingleFlight
+
+_THREADS = 8
+
+
+def _run_concurrently(single_flight: SingleFlight, keys: List[str], release: threading.Event, calls: List[str]):
+    def _func(key: str):
+        def _call():
+            calls.append(key)
+            release.wait(5)
+            return key.upper()
+
+        return _call
+
+    with ThreadPoolExecutor(len(keys)) as executor:
+        futures = [executor.submit(single_flight.do, key, _func(key)) for key in keys]
+        # give all threads time to join the in-flight call before it finishes
+        threading.Timer(0.2, release.set).start()
+        return [future.result() for future in futures]
+
+
+class TestSingleFlight:
+    @staticmethod
+    def test_it_shares_result_of_concurrent_calls_for_the_same_key():
+        calls: List[str] = []
+        results = _run_concurrently(SingleFlight(), ["a"] * _THREADS, threading.Event(), calls)
+
+        assert calls == ["a"]
+        assert results == ["A"] * _THREADS
+
+    @staticmethod
+    def test_it_does_not_share_calls_between_keys():
+        calls: List[str] = []
+        results = _run_concurrently(SingleFlight(), ["a", "b"], threading.Event(), calls)
+
+        assert sorted(calls) == ["a", "b"]
+        assert results == ["A", "B"]
+
+    @staticmethod
+    def test_it_does_not_remember_finished_calls():
+        single_flight: SingleFlight[int] = SingleFlight()
+        calls: List[int] = []
+
+        for _ in range(2):
+            single_flight.do("a", lambda: calls.append(1) or len(calls))
+
+        assert calls == [1, 1]
+
+    @staticmethod
+    def test_it_raises_exception_in_all_waiting_callers():
+        single_flight: SingleFlight[None] = SingleFlight()
+        release = threading.Event()
+
+        def _fail():
+            release.wait(5)
+            raise RuntimeError("boom")
+
+        with ThreadPoolExecutor(_THREADS) as executor:
+            futures = [executor.submit(single_flight.do, "a", _fail) for _ in range(_THREADS)]
+            threading.Timer(0.2, release.set).start()
+
+            for future in futures:
+                with pytest.raises(RuntimeError, match="boom"):
+                    future.result()
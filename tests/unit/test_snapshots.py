@@ -0,0 +1,72 @@
+import pytest
+from ujson import dumps
+
+from issue_watcher.cache_backends import FileCacheBackend, SharedDirectoryCacheBackend
+from issue_watcher.temporary_cache import TemporaryCache
+
+_PROJECT = "radeklat/issue-watcher"
+
+
+def _snapshot(entries) -> str:
+    return dumps({"format": "issue-watcher-cache-snapshot", "version": 1, "entries": entries})
+
+
+class TestSnapshots:
+    @staticmethod
+    @pytest.mark.parametrize(
+        "file_name,compress,compressed",
+        [
+            pytest.param("snapshot.json", None, False, id="plain"),
+            pytest.param("snapshot.json.gz", None, True, id="compressed by extension"),
+            pytest.param("snapshot.json", True, True, id="compressed explicitly"),
+        ],
+    )
+    def test_it_exports_and_imports_all_projects(tmp_path, file_name, compress, compressed):
+        source = FileCacheBackend(str(tmp_path / "source.json"))
+        source.set_many(_PROJECT, {"1": ("a", 10), "2": ("b", 20, 100)})
+        source.set(_PROJECT + "x", "1", ("c", 30))
+        target = SharedDirectoryCacheBackend(str(tmp_path / "target"))
+        snapshot = str(tmp_path / file_name)
+
+        assert TemporaryCache.export_snapshot(snapshot, compress, source) == 3
+        assert TemporaryCache.import_snapshot(snapshot, target) == 3
+
+        assert (tmp_path / file_name).read_bytes().startswith(b"\x1f\x8b") == compressed
+        assert tuple(target.get(_PROJECT, "2")) == ("b", 20, 100)
+        assert tuple(target.get(_PROJECT + "x", "1")) == ("c", 30)
+
+    @staticmethod
+    def test_it_keeps_newer_entries_when_importing(tmp_path):
+        older = FileCacheBackend(str(tmp_path / "older.json"))
+        older.set_many(_PROJECT, {"1": ("old", 10), "2": ("old", 10)})
+        target = FileCacheBackend(str(tmp_path / "target.json"))
+        target.set_many(_PROJECT, {"1": ("new", 20)})
+        snapshot = str(tmp_path / "snapshot.json")
+        TemporaryCache.export_snapshot(snapshot, backend=older)
+
+        assert TemporaryCache.import_snapshot(snapshot, target) == 1
+
+        assert {key: tuple(entry) for key, entry in target.get_all(_PROJECT).items()} == {
+            "1": ("new", 20),
+            "2": ("old", 10),
+        }
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        "content",
+        [
+            pytest.param("not json", id="not json"),
+            pytest.param(dumps({_PROJECT: {}}), id="plain cache file"),
+            pytest.param(dumps({"format": "issue-watcher-cache-snapshot", "version": 99, "entries": {}}), id="version"),
+            pytest.param(_snapshot([]), id="entries not an object"),
+            pytest.param(_snapshot({_PROJECT: []}), id="project entries not an object"),
+            pytest.param(_snapshot({_PROJECT: {"issues/1": "open"}}), id="entry not a list"),
+            pytest.param(_snapshot({_PROJECT: {"issues/1": ["open"]}}), id="entry without timestamp"),
+            pytest.param(_snapshot({_PROJECT: {"issues/1": ["open", "now"]}}), id="timestamp not a number"),
+        ],
+    )
+    def test_it_refuses_to_import_unsupported_file(tmp_path, content):
+        (tmp_path / "snapshot.json").write_text(content, encoding="utf-8")
+
+        with pytest.raises(ValueError, match="not a cache snapshot"):
+            TemporaryCache.import_snapshot(str(tmp_path / "snapshot.json"), FileCacheBackend(str(tmp_path / "c.json")))
@@ -1,4 +1,5 @@
 import os
+import threading
 from time import time
 from typing import Dict, List, Union
 from unittest.mock import patch
@@ -6,6 +7,8 @@ from unittest.mock import patch
 import pytest
 from ujson import dumps, loads
 
+from issue_watcher.cache_backends import FileCacheBackend, RedisCacheBackend, SharedDirectoryCacheBackend
+from issue_watcher.mapped_cache_backend import MappedFileCacheBackend
 from issue_watcher.temporary_cache import TemporaryCache
 
 _PROJECT = "radeklat/issue-watcher"
@@ -98,6 +101,286 @@ class TestTempCache:
         }
 
 
+class TestTempCacheFilePath:
+    @staticmethod
+    def test_it_can_be_overridden_with_environment_variable(tmp_path):
+        cache_file = tmp_path / "shared-cache.json"
+
+        with patch.dict("os.environ", {TemporaryCache._ENV_VAR_FILE: str(cache_file)}):
+            with patch("time.time", return_value=10):
+                _get_instance()[_KEY_IN] = _VALUE
+
+        assert loads(cache_file.read_text(encoding="utf-8")) == {_PROJECT: {_KEY_OUT: [_VALUE, 10]}}
+
+    @staticmethod
+    def test_it_uses_temporary_directory_when_environment_variable_is_empty():
+        with patch.dict("os.environ", {TemporaryCache._ENV_VAR_FILE: ""}):
+            assert _get_instance().backend.path == TemporaryCache._TEMP_FILE_NAME
+
+
+class TestTempCacheLock:
+    @staticmethod
+    def test_it_blocks_other_holders_of_the_same_key(tmp_path):
+        acquired = threading.Event()
+
+        with patch.dict("os.environ", {TemporaryCache._ENV_VAR_FILE: str(tmp_path / "cache.json")}):
+            cache = _get_instance()
+
+            def _acquire():
+                with _get_instance().lock(_KEY_IN):
+                    acquired.set()
+
+            with cache.lock(_KEY_IN):
+                thread = threading.Thread(target=_acquire)
+                thread.start()
+                assert not acquired.wait(0.2)
+
+            thread.join(5)
+
+        assert acquired.is_set()
+
+    @staticmethod
+    def test_it_does_not_block_other_keys(tmp_path):
+        with patch.dict("os.environ", {TemporaryCache._ENV_VAR_FILE: str(tmp_path / "cache.json")}):
+            cache = _get_instance()
+
+            with cache.lock(_KEY_IN):
+                with cache.lock("2"):
+                    pass
+
+    @staticmethod
+    def test_it_does_nothing_when_cache_is_disabled(tmp_path):
+        cache_file = tmp_path / "cache.json"
+        env = {TemporaryCache._ENV_VAR_FILE: str(cache_file), TemporaryCache._ENV_VAR_EXPIRY: "0"}
+
+        with patch.dict("os.environ", env):
+            with _get_instance().lock(_KEY_IN):
+                pass
+
+        assert not os.path.exists(f"{cache_file}.key-locks")
+
+
+class TestExpiryOfKind:
+    @staticmethod
+    def test_it_falls_back_to_global_expiry():
+        with patch.dict("os.environ", {TemporaryCache._ENV_VAR_EXPIRY: "10"}):
+            assert _get_instance().expiry_of("issues/1") == 10
+
+    @staticmethod
+    def test_it_can_be_overridden_with_environment_variable():
+        env = {TemporaryCache._ENV_VAR_EXPIRY: "10", "CACHE_INVALIDATION_ISSUES_IN_SECONDS": "20"}
+        with patch.dict("os.environ", env):
+            cache = _get_instance()
+            assert cache.expiry_of("issues/1") == 20
+            assert cache.expiry_of("release_count") == 10
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        "global_expiry,kind,expected",
+        [
+            pytest.param("3600", "errors", 300, id="errors"),
+            pytest.param("3600", "rate_limit_errors", 60, id="rate limit errors"),
+            pytest.param("30", "errors", 30, id="errors within global expiry"),
+        ],
+    )
+    def test_it_is_shorter_for_errors_by_default(global_expiry, kind, expected):
+        with patch.dict("os.environ", {TemporaryCache._ENV_VAR_EXPIRY: global_expiry}):
+            assert _get_instance().expiry_of(f"{kind}/issues/1") == expected
+
+    @staticmethod
+    def test_it_is_disabled_with_global_expiry():
+        env = {TemporaryCache._ENV_VAR_EXPIRY: "0", "CACHE_INVALIDATION_ISSUES_IN_SECONDS": "20"}
+        with patch.dict("os.environ", env):
+            assert _get_instance().expiry_of("issues/1") == 0
+
+    @staticmethod
+    def test_it_is_used_when_reading_entry():
+        _create_temp_file({_PROJECT: {"issues/1": [_VALUE, int(time()) - 100]}})
+        with patch.dict("os.environ", {"CACHE_INVALIDATION_ISSUES_IN_SECONDS": "50"}):
+            assert _get_instance().get("issues/1") is None
+
+    @staticmethod
+    def test_it_does_not_store_kind_with_zero_expiry():
+        _remove_temp_file()
+        with patch.dict("os.environ", {"CACHE_INVALIDATION_ISSUES_IN_SECONDS": "0"}):
+            _get_instance()["issues/1"] = _VALUE
+        assert not os.path.isfile(TemporaryCache._TEMP_FILE_NAME)
+
+    @staticmethod
+    def test_it_keeps_entries_within_longest_expiry_when_expiring():
+        _create_temp_file({_PROJECT: {"issues/1": [_VALUE, int(time()) - 100], "2": [_VALUE, int(time()) - 100]}})
+        env = {TemporaryCache._ENV_VAR_EXPIRY: "50", "CACHE_INVALIDATION_ISSUES_IN_SECONDS": "200"}
+        with patch.dict("os.environ", env):
+            _get_instance().expire()
+        assert sorted(loads(_read_temp_file())[_PROJECT]) == ["2", "issues/1"]
+
+
+class TestAdaptiveExpiry:
+    @staticmethod
+    @pytest.fixture(autouse=True)
+    def set_up():
+        _remove_temp_file()
+        with patch.dict("os.environ", {TemporaryCache._ENV_VAR_ADAPTIVE: "1", TemporaryCache._ENV_VAR_EXPIRY: "10"}):
+            yield
+
+    @staticmethod
+    def test_it_stores_longer_expiry_for_inactive_resource():
+        with patch("time.time", return_value=10000):
+            _get_instance().set(_KEY_IN, _VALUE, last_activity=0)
+        assert loads(_read_temp_file()) == {_PROJECT: {_KEY_OUT: [_VALUE, 10000, 1000]}}
+
+    @staticmethod
+    def test_it_limits_expiry_to_a_week():
+        with patch("time.time", return_value=10**9):
+            _get_instance().set(_KEY_IN, _VALUE, last_activity=0)
+        assert loads(_read_temp_file())[_PROJECT][_KEY_OUT][2] == 7 * 24 * 3600
+
+    @staticmethod
+    def test_it_stores_configured_expiry_for_active_resource():
+        with patch("time.time", return_value=10000):
+            _get_instance().set(_KEY_IN, _VALUE, last_activity=9990)
+        assert loads(_read_temp_file()) == {_PROJECT: {_KEY_OUT: [_VALUE, 10000]}}
+
+    @staticmethod
+    def test_it_returns_entry_within_own_expiry():
+        _create_temp_file({_PROJECT: {_KEY_OUT: [_VALUE, int(time()) - 100, 1000]}})
+        assert _get_instance().get(_KEY_IN) == _VALUE
+
+    @staticmethod
+    def test_it_does_not_return_entry_after_own_expiry():
+        _create_temp_file({_PROJECT: {_KEY_OUT: [_VALUE, int(time()) - 100, 50]}})
+        assert _get_instance().get(_KEY_IN) is None
+
+
+class TestJitter:
+    @staticmethod
+    @pytest.fixture(autouse=True)
+    def set_up():
+        _remove_temp_file()
+        with patch.dict("os.environ", {TemporaryCache._ENV_VAR_JITTER: "0.2", TemporaryCache._ENV_VAR_EXPIRY: "1000"}):
+            yield
+
+    @staticmethod
+    def test_it_stores_shortened_expiry():
+        with patch("time.time", return_value=10000), patch("random.uniform", return_value=0.15):
+            _get_instance().set(_KEY_IN, _VALUE)
+        assert loads(_read_temp_file()) == {_PROJECT: {_KEY_OUT: [_VALUE, 10000, 850]}}
+
+    @staticmethod
+    def test_it_shortens_adaptive_expiry():
+        with patch.dict("os.environ", {TemporaryCache._ENV_VAR_ADAPTIVE: "1"}):
+            with patch("time.time", return_value=100000), patch("random.uniform", return_value=0.1):
+                _get_instance().set(_KEY_IN, _VALUE, last_activity=0)
+        assert loads(_read_temp_file())[_PROJECT][_KEY_OUT][2] == 9000
+
+    @staticmethod
+    def test_it_spreads_expiry_of_values_stored_at_once():
+        _get_instance().set_many({f"issues/{number}": _VALUE for number in range(20)})
+        expiries = {entry[2] for entry in loads(_read_temp_file())[_PROJECT].values()}
+        assert len(expiries) > 1
+        assert all(800 <= expiry <= 1000 for expiry in expiries)
+
+    @staticmethod
+    @pytest.mark.parametrize("value", ["1", "-0.1", "nan", "a"])
+    def test_it_warns_about_invalid_value_and_turns_jitter_off(value):
+        with patch.dict("os.environ", {TemporaryCache._ENV_VAR_JITTER: value}):
+            with pytest.warns(RuntimeWarning, match="improperly configured"):
+                _get_instance().set(_KEY_IN, _VALUE)
+        assert len(loads(_read_temp_file())[_PROJECT][_KEY_OUT]) == 2
+
+
+class TestEarlyRefresh:
+    @staticmethod
+    @pytest.fixture(autouse=True)
+    def set_up():
+        _remove_temp_file()
+        with patch.dict(
+            "os.environ", {TemporaryCache._ENV_VAR_EARLY_REFRESH: "1", TemporaryCache._ENV_VAR_EXPIRY: "100"}
+        ):
+            yield
+
+    @staticmethod
+    def test_it_stores_fetch_duration():
+        with patch("time.time", return_value=10000):
+            _get_instance().set(_KEY_IN, _VALUE, fetch_duration=0.5)
+        assert loads(_read_temp_file()) == {_PROJECT: {_KEY_OUT: [_VALUE, 10000, None, 0.5]}}
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        "random_value,expected",
+        [
+            pytest.param(0.0, _VALUE, id="kept when lucky"),
+            pytest.param(0.99999, None, id="refreshed early when unlucky"),
+        ],
+    )
+    def test_it_expires_entry_early_with_probability_growing_with_fetch_duration(random_value, expected):
+        _create_temp_file({_PROJECT: {_KEY_OUT: [_VALUE, int(time()) - 95, None, 2.0]}})
+        with patch("random.random", return_value=random_value):
+            assert _get_instance().get(_KEY_IN) == expected
+
+    @staticmethod
+    def test_it_does_not_expire_entry_without_fetch_duration_early():
+        _create_temp_file({_PROJECT: {_KEY_OUT: [_VALUE, int(time()) - 95]}})
+        with patch("random.random", return_value=0.99999):
+            assert _get_instance().get(_KEY_IN) == _VALUE
+
+
+class TestTempCacheBackend:
+    @staticmethod
+    def test_it_can_be_given_explicitly(tmp_path):
+        backend = SharedDirectoryCacheBackend(str(tmp_path))
+        TemporaryCache(_PROJECT, backend)[_KEY_IN] = _VALUE
+        assert backend.get(_PROJECT, _KEY_OUT)[0] == _VALUE
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        "env,backend_class",
+        [
+            pytest.param({}, FileCacheBackend, id="file by default"),
+            pytest.param(
+                {TemporaryCache._ENV_VAR_DIRECTORY: "/tmp/shared"}, SharedDirectoryCacheBackend, id="directory"
+            ),
+            pytest.param({TemporaryCache._ENV_VAR_REDIS_URL: "redis://localhost"}, RedisCacheBackend, id="redis"),
+            pytest.param({TemporaryCache._ENV_VAR_FILE_FORMAT: "binary"}, MappedFileCacheBackend, id="binary file"),
+        ],
+    )
+    def test_it_is_configured_with_environment_variables(env, backend_class):
+        with patch.dict("os.environ", env):
+            assert isinstance(_get_instance().backend, backend_class)
+
+    @staticmethod
+    def test_it_returns_many_valid_values_at_once():
+        _create_temp_file({_PROJECT: {"1": ["a", int(time())], "2": ["b", 0], "3": ["c", int(time())]}})
+        assert _get_instance().get_many(["1", "2", "3", "4"]) == {"1": "a", "3": "c"}
+
+    @staticmethod
+    def test_it_sets_many_values_at_once():
+        _remove_temp_file()
+        with patch("time.time", return_value=10):
+            _get_instance().set_many({"1": "a", "2": "b"})
+        assert loads(_read_temp_file()) == {_PROJECT: {"1": ["a", 10], "2": ["b", 10]}}
+
+    @staticmethod
+    def test_it_returns_stale_entries_of_given_kind():
+        _create_temp_file(
+            {
+                _PROJECT: {
+                    "issues/1": ["a", 10],
+                    "issues/2": ["b", int(time())],
+                    "release_count": ["3", 10],
+                    "issues/3": "broken",
+                }
+            }
+        )
+        assert _get_instance().stale("issues") == {"issues/1": ("a", 10)}
+
+    @staticmethod
+    def test_it_removes_expired_entries():
+        _create_temp_file({_PROJECT: {"1": ["a", int(time())], "2": ["b", 0]}})
+        _get_instance().expire()
+        assert list(loads(_read_temp_file())[_PROJECT]) == ["1"]
+
+
 class TestTempCacheGet:
     @staticmethod
     @pytest.fixture(autouse=True)
@@ -149,6 +432,13 @@ class TestCacheInvalidation:
             with pytest.warns(RuntimeWarning, match=".*Using default value of.*"):
                 _get_instance()
 
+    @staticmethod
+    @pytest.mark.parametrize("value", _WRONG_EXPIRY_VALUES)
+    def test_it_uses_default_value_when_environment_variable_is(value):
+        with patch.dict("os.environ", {TemporaryCache._ENV_VAR_EXPIRY: value}):
+            with pytest.warns(RuntimeWarning):
+                assert _get_instance()._expire_in_seconds == 3600
+
     @staticmethod
     def test_it_will_not_return_expired_entry():
         _create_temp_file({_PROJECT: {_KEY_OUT: [_VALUE, 0]}})
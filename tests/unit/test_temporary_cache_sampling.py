@@ -0,0 +1,99 @@
+from unittest.mock import patch
+
+import pytest
+
+from issue_watcher.cache_backends import FileCacheBackend
+from issue_watcher.temporary_cache import TemporaryCache
+
+# False positive caused by pytest fixtures
+# pylint: disable=redefined-outer-name
+
+_PROJECT = "radeklat/issue-watcher"
+_NOW = 10_000_000
+_KEY = "issues/2"  # bucket 2 of 4
+
+
+@pytest.fixture()
+def cache(backend: FileCacheBackend):
+    backend.set(_PROJECT, _KEY, ("open", _NOW - 7200))
+    with patch.dict("os.environ", {"CACHE_SAMPLING_FRACTION": "0.25"}):
+        yield TemporaryCache(_PROJECT, backend)
+
+
+class TestSampled:
+    @staticmethod
+    def test_it_starts_new_rounds_in_long_running_process(cache: TemporaryCache):
+        with patch("time.time", return_value=_NOW):
+            assert not cache.sampled(_KEY)
+        with patch("time.time", return_value=_NOW + 300):
+            assert not cache.sampled(_KEY)  # still the same round
+        with patch("time.time", return_value=_NOW + 600):
+            assert not cache.sampled(_KEY)
+        with patch("time.time", return_value=_NOW + 1200):
+            assert cache.sampled(_KEY)
+
+    @staticmethod
+    def test_it_shares_rounds_between_processes(cache: TemporaryCache):
+        with patch("time.time", return_value=_NOW):
+            cache.sampled(_KEY)
+        other_process_cache = TemporaryCache(_PROJECT, cache.backend)
+
+        with patch("time.time", return_value=_NOW + 300):
+            other_process_cache.sampled(_KEY)
+
+        entry = cache.backend.get(_PROJECT, "sampling")
+        assert entry is not None
+        assert entry[0] == f"[{_NOW}]"
+
+    @staticmethod
+    def test_it_does_not_share_rounds_between_backends(cache: TemporaryCache, tmp_path):
+        other_backend = FileCacheBackend(str(tmp_path / "other.json"))
+        other_backend.set(_PROJECT, _KEY, ("open", _NOW - 7200))
+        with patch("time.time", return_value=_NOW):
+            cache.sampled(_KEY)
+        with patch("time.time", return_value=_NOW + 300):
+            TemporaryCache(_PROJECT, other_backend).sampled(_KEY)
+
+        entry = other_backend.get(_PROJECT, "sampling")
+        assert entry is not None
+        assert entry[0] == f"[{_NOW + 300}]"
+
+    @staticmethod
+    def test_it_counts_only_rounds_started_after_entry_expired(cache: TemporaryCache):
+        for round_number in range(3):
+            with patch("time.time", return_value=_NOW + round_number * 600):
+                cache.sampled(_KEY)
+        cache.backend.set(_PROJECT, _KEY, ("open", _NOW + 1200 - 3600))  # expired when the last round started
+
+        for round_number in range(3, 5):
+            with patch("time.time", return_value=_NOW + round_number * 600):
+                assert not cache.sampled(_KEY)
+        with patch("time.time", return_value=_NOW + 5 * 600):
+            assert cache.sampled(_KEY)
+
+    @staticmethod
+    def test_it_refreshes_every_requested_entry_within_one_round_per_bucket(cache: TemporaryCache):
+        cache.backend.set(_PROJECT, "issues/0", ("open", _NOW - 90_000))  # orphaned, never requested
+        keys = {f"issues/{number}" for number in range(1, 41)}
+        cache.backend.set_many(_PROJECT, {key: ("open", _NOW - 7200) for key in keys})
+        refreshed_in_rounds = []
+
+        for round_number in range(4):
+            with patch("time.time", return_value=_NOW + round_number * 600):
+                refreshed = {key for key in sorted(keys) if cache.sampled(key)}
+            refreshed_in_rounds.append(len(refreshed))
+            keys -= refreshed
+
+        assert not keys
+        assert max(refreshed_in_rounds) < 20
+
+    @staticmethod
+    def test_it_removes_orphaned_entries_when_round_starts(cache: TemporaryCache):
+        orphaned_at = _NOW - 3600 - TemporaryCache._ORPHANED_AFTER_SECONDS - 1
+        cache.backend.set(_PROJECT, "issues/4", ("open", orphaned_at))
+
+        with patch("time.time", return_value=_NOW):
+            cache.sampled(_KEY)
+
+        assert cache.backend.get(_PROJECT, "issues/4") is None
+        assert cache.backend.get(_PROJECT, _KEY) is not None
@@ -0,0 +1,53 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from requests import ConnectionError as RequestsConnectionError
+from requests import Timeout
+
+from issue_watcher.transport import Http2Transport
+from tests.helpers.h2_stand_in import H2StandIn, running
+
+pytest.importorskip("httpx")
+pytest.importorskip("h2")
+
+
+class TestHttp2Transport:
+    @staticmethod
+    def test_it_returns_requests_response():
+        server = H2StandIn(b'{"state": "open"}')
+
+        with running(server):
+            response = Http2Transport(http1_fallback=False).get(f"{server.url}/issues/1", auth=("user", "token"))
+
+        assert response.status_code == 200
+        assert response.headers["Content-Type"] == "application/json"
+        assert response.json() == {"state": "open"}
+        assert b"".join(response.iter_content(4)) == b'{"state": "open"}'
+
+    @staticmethod
+    def test_it_multiplexes_concurrent_requests_over_one_connection():
+        server = H2StandIn(b"{}", latency=0.2)
+        transport = Http2Transport(http1_fallback=False)
+
+        with running(server), ThreadPoolExecutor(20) as executor:
+            responses = list(executor.map(lambda number: transport.get(f"{server.url}/issues/{number}"), range(20)))
+
+        assert all(response.status_code == 200 for response in responses)
+        assert server.connections == 1
+        assert server.max_open_streams > 1
+
+    @staticmethod
+    def test_it_raises_requests_timeout():
+        server = H2StandIn(b"{}", latency=1)
+
+        with running(server), pytest.raises(Timeout):
+            Http2Transport(http1_fallback=False).get(f"{server.url}/issues/1", timeout=0.1)
+
+    @staticmethod
+    def test_it_raises_requests_connection_error():
+        server = H2StandIn(b"{}")
+        url = server.url
+        server.server_close()
+
+        with pytest.raises(RequestsConnectionError):
+            Http2Transport(http1_fallback=False).get(f"{url}/issues/1")
@@ -0,0 +1,175 @@
+import threading
+import time
+from typing import List
+from unittest.mock import patch
+
+import pytest
+import requests
+from ujson import dumps
+
+from issue_watcher import watch
+from issue_watcher.scan import ScanResult, WatcherCall
+from issue_watcher.watch import Transition, Watcher, WatchItem
+
+_OPEN = WatcherCall("owner/repo", "is_open", (1,), ())
+_FIXED_IN = WatcherCall("owner/repo", "fixed_in", ("2.0.0",), (("pattern", "v(?P<version>.*)"),))
+
+
+def _item(call: WatcherCall = _OPEN, interval: float = 0.01) -> WatchItem:
+    return WatchItem(call, "message", interval)
+
+
+def _run(watcher: Watcher, until: threading.Event) -> None:
+    thread = threading.Thread(target=watcher.run)
+    thread.start()
+    try:
+        assert until.wait(5)
+    finally:
+        watcher.stop()
+        thread.join(5)
+    assert not thread.is_alive()
+
+
+class TestLoadWatchlist:
+    @staticmethod
+    def test_it_reads_watched_assertions(tmp_path):
+        (tmp_path / "watchlist.json").write_text(
+            dumps(
+                [
+                    {"repository": "owner/repo", "is_open": 1, "message": "Remove workaround.", "interval": 60},
+                    {"repository": "owner/repo", "fixed_in": "2.0.0", "pattern": "v(?P<version>.*)"},
+                ]
+            ),
+            encoding="utf-8",
+        )
+
+        assert watch.load_watchlist(str(tmp_path / "watchlist.json"), default_interval=600) == [
+            WatchItem(_OPEN, "Remove workaround.", 60),
+            WatchItem(_FIXED_IN, "", 600),
+        ]
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        "content",
+        [
+            pytest.param("not json", id="not json"),
+            pytest.param(dumps({"repository": "owner/repo"}), id="not a list"),
+            pytest.param(dumps(["owner/repo"]), id="not objects"),
+            pytest.param(dumps([{"repository": "owner/repo"}]), id="no assertion"),
+            pytest.param(dumps([{"repository": "owner/repo", "is_open": 1, "is_closed": 2}]), id="two assertions"),
+        ],
+    )
+    def test_it_refuses_invalid_watchlist(tmp_path, content):
+        (tmp_path / "watchlist.json").write_text(content, encoding="utf-8")
+
+        with pytest.raises(ValueError):
+            watch.load_watchlist(str(tmp_path / "watchlist.json"))
+
+
+class TestWatcher:
+    @staticmethod
+    def test_it_notifies_about_changes_of_outcome_only():
+        outcomes = iter(["passed", "passed", "failed", "failed", "passed"])
+        transitions: List[Transition] = []
+        done = threading.Event()
+
+        def _check(call):
+            return ScanResult(call, [], next(outcomes, "passed"), "detail")
+
+        def _notify(transition):
+            transitions.append(transition)
+            if len(transitions) == 2:
+                done.set()
+
+        _run(Watcher([_item()], _notify, rate=1000, check=_check), done)
+
+        assert [(transition.previous, transition.outcome) for transition in transitions] == [
+            ("passed", "failed"),
+            ("failed", "passed"),
+        ]
+
+    @staticmethod
+    def test_it_notifies_about_failing_first_check():
+        transitions: List[Transition] = []
+        done = threading.Event()
+
+        def _notify(transition):
+            transitions.append(transition)
+            done.set()
+
+        _run(Watcher([_item()], _notify, check=lambda call: ScanResult(call, [], "failed", "closed")), done)
+
+        assert transitions[0].previous is None
+        assert transitions[0].to_dict()["detail"] == "closed"
+
+    @staticmethod
+    def test_it_starts_checks_at_steady_pace_with_bounded_concurrency():
+        started: List[float] = []
+        running, max_running = [0], [0]
+        lock = threading.Lock()
+        done = threading.Event()
+
+        def _check(call):
+            with lock:
+                started.append(time.monotonic())
+                running[0] += 1
+                max_running[0] = max(max_running[0], running[0])
+                if len(started) == 10:
+                    done.set()
+            time.sleep(0.05)
+            with lock:
+                running[0] -= 1
+            return ScanResult(call, [], "passed")
+
+        items = [_item(WatcherCall("owner/repo", "is_open", (number,), ()), interval=60) for number in range(10)]
+        _run(Watcher(items, lambda _: None, workers=2, rate=100, check=_check), done)
+
+        assert max_running[0] <= 2
+        assert all(later - earlier >= 0.009 for earlier, later in zip(started, started[1:]))
+
+    @staticmethod
+    def test_it_fetches_values_cached_longer_ago_than_the_interval():
+        done = threading.Event()
+
+        def _check_call(call, **_):
+            done.set()
+            return ScanResult(call, [], "passed")
+
+        with patch("issue_watcher.watch.scan.check_call", side_effect=_check_call) as check_call:
+            _run(Watcher([_item(interval=60)], lambda _: None), done)
+
+        check_call.assert_called_with(_OPEN, max_age=60)
+
+    @staticmethod
+    def test_it_keeps_watching_when_check_raises():
+        calls = []
+        done = threading.Event()
+
+        def _check(call):
+            calls.append(call)
+            if len(calls) == 2:
+                done.set()
+            raise RuntimeError("unexpected")
+
+        _run(Watcher([_item()], lambda _: None, rate=1000, check=_check), done)
+
+    @staticmethod
+    def test_it_refuses_empty_watchlist():
+        with pytest.raises(ValueError):
+            Watcher([], lambda _: None)
+
+
+class TestPostTransition:
+    @staticmethod
+    def test_it_sends_transition_as_json():
+        with patch("issue_watcher.watch.requests.post") as post:
+            watch.post_transition("https://example.com/hook")(Transition(_item(), "passed", "failed", "closed"))
+
+        assert post.call_args[1]["json"]["outcome"] == "failed"
+
+    @staticmethod
+    def test_it_logs_failed_notification(caplog):
+        with patch("issue_watcher.watch.requests.post", side_effect=requests.ConnectionError("refused")):
+            watch.post_transition("https://example.com/hook")(Transition(_item(), "passed", "failed", "closed"))
+
+        assert "refused" in caplog.text
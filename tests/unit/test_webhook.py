@@ -0,0 +1,190 @@
+import hashlib
+import hmac
+import threading
+from time import time
+from typing import Dict, Iterator
+from unittest.mock import MagicMock
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
+
+import pytest
+from ujson import dumps
+
+from issue_watcher import AssertGitHubIssue
+from issue_watcher.cache_backends import FileCacheBackend
+from issue_watcher.webhook import WebhookServer, apply_webhook, verify_signature
+from tests.unit.github.mocking import set_issue_state
+
+# False positive caused by pytest fixtures
+# pylint: disable=redefined-outer-name
+
+_REPOSITORY_ID = "radeklat/issue-watcher"
+_SECRET = "It's a Secret to Everybody"
+_REPOSITORY = {"full_name": _REPOSITORY_ID}
+
+
+def _sign(body: bytes, secret: str = _SECRET) -> str:
+    return "sha256=" + hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+
+
+def _cached_state(backend: FileCacheBackend, key: str = "issues/1") -> str:
+    entry = backend.get(_REPOSITORY_ID, key)
+    assert entry is not None
+    return str(entry[0])
+
+
+@pytest.fixture()
+def backend(backend: FileCacheBackend) -> FileCacheBackend:
+    backend.set_many(
+        _REPOSITORY_ID,
+        {"issues/1": ("open", int(time())), "release_count": ("3", int(time())), "latest_version": ("1.0", 0)},
+    )
+    return backend
+
+
+@pytest.fixture()
+def server(backend: FileCacheBackend) -> Iterator[WebhookServer]:
+    server = WebhookServer(("127.0.0.1", 0), _SECRET, backend)
+    thread = threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.01}, daemon=True)
+    thread.start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def _post(server: WebhookServer, event: str, body: bytes, headers: Dict[str, str]) -> int:
+    request = Request(
+        f"http://127.0.0.1:{server.server_address[1]}/",
+        data=body,
+        headers={"X-GitHub-Event": event, **headers},
+        method="POST",
+    )
+    try:
+        with urlopen(request, timeout=5) as response:
+            return response.status
+    except HTTPError as exc:
+        return exc.code
+
+
+class TestVerifySignature:
+    @staticmethod
+    def test_it_accepts_valid_signature():
+        # Example from https://docs.github.com/en/webhooks/using-webhooks/validating-webhook-deliveries
+        signature = "sha256=757107ea0eb2509fc211221cce984b8a37570b6d7586c22c46f4379c8b043e17"
+        assert verify_signature(_SECRET, b"Hello, World!", signature)
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        "signature",
+        [
+            pytest.param(None, id="missing"),
+            pytest.param("", id="empty"),
+            pytest.param(_sign(b"Hello, World!", "other secret"), id="other secret"),
+            pytest.param(_sign(b"Hello, World!")[len("sha256=") :], id="no algorithm prefix"),
+        ],
+    )
+    def test_it_refuses_signature_which_is(signature):
+        assert not verify_signature(_SECRET, b"Hello, World!", signature)
+
+
+class TestApplyWebhook:
+    @staticmethod
+    def test_it_updates_issue_state(backend: FileCacheBackend):
+        payload = {"action": "closed", "issue": {"number": 1, "state": "closed"}, "repository": _REPOSITORY}
+        assert apply_webhook("issues", payload, backend) == ["issues/1"]
+        assert _cached_state(backend) == "closed"
+
+    @staticmethod
+    def test_it_matches_repository_regardless_of_case(backend: FileCacheBackend, requests_mock: MagicMock):
+        set_issue_state(requests_mock, "open")
+        assert_github_issue = AssertGitHubIssue(_REPOSITORY_ID.upper(), backend)
+        assert_github_issue.is_open(2)
+
+        payload = {"action": "closed", "issue": {"number": 2, "state": "closed"}, "repository": _REPOSITORY}
+        apply_webhook("issues", payload, backend)
+
+        assert_github_issue.is_closed(2)
+        assert requests_mock.get.call_count == 1
+
+    @staticmethod
+    @pytest.mark.parametrize("action", ["deleted", "transferred"])
+    def test_it_removes_issue_which_was(backend: FileCacheBackend, action: str):
+        payload = {"action": action, "issue": {"number": 1, "state": "open"}, "repository": _REPOSITORY}
+        assert apply_webhook("issues", payload, backend) == ["issues/1"]
+        assert backend.get(_REPOSITORY_ID, "issues/1") is None
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        "payload",
+        [
+            pytest.param([], id="not an object"),
+            pytest.param({"action": "closed", "repository": _REPOSITORY}, id="missing issue"),
+            pytest.param({"issue": {"state": "closed"}, "repository": _REPOSITORY}, id="missing number"),
+            pytest.param({"issue": {"number": 1}, "repository": _REPOSITORY}, id="missing state"),
+        ],
+    )
+    def test_it_refuses_malformed_issues_event(backend: FileCacheBackend, payload):
+        with pytest.raises(ValueError):
+            apply_webhook("issues", payload, backend)
+        assert _cached_state(backend) == "open"
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        "event,payload",
+        [
+            pytest.param("create", {"ref_type": "tag", "ref": "2.0.0"}, id="tag created"),
+            pytest.param("delete", {"ref_type": "tag", "ref": "2.0.0"}, id="tag deleted"),
+            pytest.param("release", {"action": "published"}, id="release"),
+        ],
+    )
+    def test_it_invalidates_releases_on(backend: FileCacheBackend, event, payload):
+        apply_webhook(event, {**payload, "repository": _REPOSITORY}, backend)
+        assert not backend.get_many(_REPOSITORY_ID, ["release_count", "latest_version"])
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        "event,payload",
+        [
+            pytest.param("create", {"ref_type": "branch", "repository": _REPOSITORY}, id="branch created"),
+            pytest.param("ping", {"zen": "Keep it logically awesome.", "repository": _REPOSITORY}, id="ping"),
+            pytest.param("issues", {"issue": {"number": 1, "state": "closed"}}, id="missing repository"),
+            pytest.param("issues", {"action": "closed", "repository": {}}, id="missing repository name"),
+        ],
+    )
+    def test_it_ignores(backend: FileCacheBackend, event, payload):
+        assert not apply_webhook(event, payload, backend)
+        assert len(backend.get_all(_REPOSITORY_ID)) == 3
+
+
+class TestWebhookServer:
+    @staticmethod
+    def test_it_applies_signed_delivery(server: WebhookServer, backend: FileCacheBackend):
+        body = dumps({"issue": {"number": 1, "state": "closed"}, "repository": _REPOSITORY}).encode()
+
+        assert _post(server, "issues", body, {"X-Hub-Signature-256": _sign(body)}) == 204
+        assert _cached_state(backend) == "closed"
+
+    @staticmethod
+    def test_it_refuses_delivery_with_invalid_signature(server: WebhookServer, backend: FileCacheBackend):
+        body = dumps({"issue": {"number": 1, "state": "closed"}, "repository": _REPOSITORY}).encode()
+
+        assert _post(server, "issues", body, {"X-Hub-Signature-256": _sign(b"other body")}) == 401
+        assert _cached_state(backend) == "open"
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        "body",
+        [
+            pytest.param(b"{", id="invalid JSON"),
+            pytest.param(dumps({"issue": {"state": "closed"}, "repository": _REPOSITORY}).encode(), id="no number"),
+        ],
+    )
+    def test_it_refuses_malformed_delivery(server: WebhookServer, body: bytes):
+        assert _post(server, "issues", body, {"X-Hub-Signature-256": _sign(body)}) == 400
+
+    @staticmethod
+    def test_it_requires_secret():
+        with pytest.raises(ValueError, match="secret"):
+            WebhookServer(("127.0.0.1", 0), "")